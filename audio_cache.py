@@ -0,0 +1,162 @@
+# audio_cache.py
+import hashlib
+import os
+
+CACHE_DIR = "data/audio_cache"
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+AUDIO_EXT = ".wav"
+
+class AudioCache:
+    """On-disk cache of rendered speech with a size cap and LRU eviction
+
+    Files are named by a hash of everything that affects the audio (text,
+    reference, translation, voice and rate). A file's mtime is bumped on
+    every hit and the least recently used files are evicted first.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def key(self, text, reference, translation="default", voice=None, rate=150):
+        data = "\x1f".join([translation, reference, voice or "", str(rate), text])
+        return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+    def path_for(self, key):
+        return os.path.join(self.cache_dir, key + AUDIO_EXT)
+
+    def lookup(self, key):
+        """Return the cached file for key, or None"""
+        path = self.path_for(key)
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            return None
+        return path
+
+    def store(self, key, rendered_path):
+        """Move a rendered file into the cache"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        os.replace(rendered_path, self.path_for(key))
+
+    def size(self):
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def _entries(self):
+        if not os.path.isdir(self.cache_dir):
+            return []
+        return [entry for entry in os.scandir(self.cache_dir)
+                if entry.is_file() and entry.name.endswith(AUDIO_EXT)]
+
+    def evict(self):
+        """Delete least recently used files until the cache fits max_bytes"""
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        total = sum(entry.stat().st_size for entry in entries)
+        removed = 0
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            total -= entry.stat().st_size
+            os.remove(entry.path)
+            removed += 1
+        return removed
+
+def verse_reference(book, chapter, verse):
+    return f"{book} {chapter}:{verse}"
+
+def chapter_reference(book, chapter):
+    return f"{book} {chapter}"
+
+# Each worker process owns one engine, created by the pool initializer
+_engine = None
+
+def _init_engine(voice, rate):
+    global _engine
+    import pyttsx3
+
+    _engine = pyttsx3.init()
+    _engine.setProperty('rate', rate)
+    if voice:
+        _engine.setProperty('voice', voice)
+
+def _render(key, text, work_dir):
+    path = os.path.join(work_dir, key + AUDIO_EXT)
+    _engine.save_to_file(text, path)
+    _engine.runAndWait()
+    return key, path
+
+def render_batch(cache, items, translation="default", voice=None, rate=150,
+                 max_workers=None, progress=None):
+    """Render (reference, text) items into the cache using worker processes
+
+    Items that are already cached are skipped. progress(done, total) is
+    called as files finish. Returns the number of files rendered.
+    """
+    # Imported here so the app, which only looks files up, starts faster
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    jobs = {}
+    for reference, text in items:
+        key = cache.key(text, reference, translation, voice, rate)
+        if key not in jobs and cache.lookup(key) is None:
+            jobs[key] = text
+    if not jobs:
+        return 0
+
+    os.makedirs(cache.cache_dir, exist_ok=True)
+    rendered = 0
+    # Render next to the cache so the final move is a rename
+    with tempfile.TemporaryDirectory(dir=cache.cache_dir) as work_dir:
+        with ProcessPoolExecutor(max_workers, initializer=_init_engine, initargs=(voice, rate)) as pool:
+            futures = [pool.submit(_render, key, text, work_dir) for key, text in jobs.items()]
+            for future in as_completed(futures):
+                try:
+                    key, path = future.result()
+                    if os.path.exists(path):
+                        cache.store(key, path)
+                        rendered += 1
+                except Exception as e:
+                    print(f"TTS Error: {e}")
+                if progress:
+                    progress(rendered, len(jobs))
+    cache.evict()
+    return rendered
+
+def chapter_items(store, book, chapter):
+    """Yield (reference, text) for each verse of a chapter and for the whole chapter"""
+    verses = store.get_verses_for_chapter(book, chapter)
+    for verse, text in verses:
+        yield verse_reference(book, chapter, verse), text
+    if verses:
+        yield chapter_reference(book, chapter), " ".join(text for _, text in verses)
+
+def main():
+    import argparse
+    from database import get_store
+
+    parser = argparse.ArgumentParser(description="Pre-render verse and chapter audio")
+    parser.add_argument("book", nargs="?", help="Book to render (default: all memorized verses)")
+    parser.add_argument("chapter", nargs="?", type=int, help="Only this chapter of the book")
+    parser.add_argument("--rate", type=int, default=150)
+    parser.add_argument("--voice")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--max-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024))
+    args = parser.parse_args()
+
+    store = get_store()
+    store.init_db()
+    cache = AudioCache(max_bytes=args.max_mb * 1024 * 1024)
+    if args.book is None:
+        items = [(verse_reference(book, chapter, verse), text)
+                 for book, chapter, verse, text in store.get_memorized_verses()]
+    else:
+        chapters = [args.chapter] if args.chapter else store.get_chapters_for_book(args.book)
+        items = [item for chapter in chapters for item in chapter_items(store, args.book, chapter)]
+
+    rendered = render_batch(cache, items, voice=args.voice, rate=args.rate, max_workers=args.workers,
+                            progress=lambda done, total: print(f"\r{done}/{total}", end=""))
+    print(f"\nRendered {rendered} files; cache is {cache.size() / 1e6:.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# benchmarks/bench_connection.py
+"""Compare connect-per-call lookups with the persistent VerseStore connection.
+
+Usage: python benchmarks/bench_connection.py [iterations]
+"""
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import VerseStore
+
+BOOKS = ["Genesis", "Exodus", "Psalms", "Matthew", "John", "Romans"]
+
+def build_db(db_path):
+    store = VerseStore(db_path)
+    store.init_db()
+    conn = store.connection()
+    rows = []
+    verse_id = 1
+    for book in BOOKS:
+        for chapter in range(1, 31):
+            for verse in range(1, 31):
+                rows.append((verse_id, book, chapter, verse, f"{book} {chapter}:{verse} text"))
+                verse_id += 1
+    conn.executemany("INSERT INTO verses (id, book, chapter, verse, text) VALUES (?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    store.close_all()
+
+def legacy_get_verse_by_reference(db_path, book, chapter, verse):
+    # Mirrors the old connect-per-call implementation
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute("SELECT book, chapter, verse, text FROM verses WHERE book=? AND chapter=? AND verse=?",
+                  (book, chapter, verse))
+    result = cursor.fetchone()
+    conn.close()
+    return result
+
+def timed(fn, refs):
+    start = time.perf_counter()
+    for ref in refs:
+        fn(*ref)
+    return (time.perf_counter() - start) / len(refs)
+
+def main(iterations=5000):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        build_db(db_path)
+        refs = [(random.choice(BOOKS), random.randint(1, 30), random.randint(1, 30))
+                for _ in range(iterations)]
+
+        before = timed(lambda b, c, v: legacy_get_verse_by_reference(db_path, b, c, v), refs)
+        store = VerseStore(db_path)
+        after = timed(store.get_verse_by_reference, refs)
+        store.close_all()
+
+    print(f"connect-per-call: {before * 1e6:8.1f} us/lookup")
+    print(f"VerseStore:       {after * 1e6:8.1f} us/lookup")
+    print(f"speedup:          {before / after:8.1f}x")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,59 @@
+# benchmarks/bench_import.py
+"""Time a full-Bible import: per-line INSERTs versus the bulk import path.
+
+Both sides run the same import (full-text index, outline, word counts,
+compiled corpus) into a fresh database; only the way the verses are
+written differs.
+
+Usage: python benchmarks/bench_import.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import VerseStore, verse_ref
+from verse_parser import parse_file
+from synthetic import write_corpus
+
+def legacy_import(store, file_path):
+    # Mirrors the old import: one execute per verse, fed by the same parser
+    def insert(conn, first_id, book_number):
+        imported = 0
+        for book, chapter, verse, text in parse_file(file_path):
+            conn.execute(
+                "INSERT OR REPLACE INTO verses (id, book, chapter, verse, text) VALUES (?, ?, ?, ?, ?)",
+                (first_id + verse_ref(book_number(book), chapter, verse), book, chapter, verse, text))
+            imported += 1
+        return imported
+    return store._import(insert)
+
+def bulk_import(store, file_path):
+    return store.bulk_import(parse_file(file_path))
+
+def run(import_fn, db_path, file_path):
+    """(verses, seconds) for one import into a fresh database"""
+    store = VerseStore(db_path)
+    store.init_db()
+    try:
+        start = time.perf_counter()
+        imported = import_fn(store, file_path)
+        return imported, time.perf_counter() - start
+    finally:
+        store.close_all()
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = os.path.join(tmp, "bible.txt")
+        verses = write_corpus(corpus)
+        legacy = run(legacy_import, os.path.join(tmp, "legacy.db"), corpus)
+        bulk = run(bulk_import, os.path.join(tmp, "bulk.db"), corpus)
+
+    print(f"corpus:    {verses} verses")
+    for name, (imported, seconds) in (("per-line:", legacy), ("bulk:", bulk)):
+        print(f"{name:10} {seconds:6.2f} s  {imported / seconds:10.0f} verses/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# benchmarks/bench_parser.py
+"""Measure parser throughput on synthetic corpora of increasing size.
+
+Usage: python benchmarks/bench_parser.py [max_scale]
+"""
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic import write_corpus
+from verse_parser import parse_file, ParseStats
+
+def legacy_parse(file_path):
+    # Mirrors the old parse_bible loop: re.match with an inline pattern per line
+    count = 0
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            match = re.match(r"^(\w+(?:\s+\w+)*)\s+(\d+):(\d+)\s+(.+)$", line)
+            if match:
+                book, chapter, verse, text = match.groups()
+                int(chapter), int(verse)
+                count += 1
+    return count
+
+def shared_parse(file_path):
+    stats = ParseStats()
+    for _ in parse_file(file_path, stats):
+        pass
+    return stats.processed
+
+def main(max_scale=4):
+    with tempfile.TemporaryDirectory() as tmp:
+        scale = 1
+        while scale <= max_scale:
+            corpus = os.path.join(tmp, f"bible_x{scale}.txt")
+            verses = write_corpus(corpus, scale=scale)
+            size_mb = os.path.getsize(corpus) / 1e6
+            for name, parse in (("legacy", legacy_parse), ("shared", shared_parse)):
+                start = time.perf_counter()
+                parsed = parse(corpus)
+                elapsed = time.perf_counter() - start
+                print(f"x{scale:<3} {name:7} {parsed:8} verses  {size_mb:6.1f} MB  "
+                      f"{parsed / elapsed:10.0f} verses/s  {size_mb / elapsed:6.1f} MB/s")
+            scale *= 2
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 4)
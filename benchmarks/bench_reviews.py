@@ -0,0 +1,64 @@
+# benchmarks/bench_reviews.py
+"""Reviews per second: direct update_spaced_repetition versus the write-behind journal.
+
+Usage: python benchmarks/bench_reviews.py [reviews]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import VerseStore
+from review_journal import ReviewJournal
+from synthetic import write_corpus
+
+def setup(db_path, corpus, refs=None, wal=True):
+    store = VerseStore(db_path, wal=wal)
+    store.init_db()
+    store.import_bible_from_text(corpus)
+    if refs is None:
+        refs = [row[:3] for row in store.get_random_verses(1000)]
+    for ref in refs:
+        store.save_memorized_verse(*ref)
+    return store, refs
+
+def direct_rate(store, grades):
+    start = time.perf_counter()
+    for ref, quality in grades:
+        store.update_spaced_repetition(*ref, quality)
+    return len(grades) / (time.perf_counter() - start)
+
+def main(reviews=2000):
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = os.path.join(tmp, "bible.txt")
+        write_corpus(corpus)
+        store, refs = setup(os.path.join(tmp, "bench.db"), corpus)
+        grades = [(random.choice(refs), random.randint(0, 5)) for _ in range(reviews)]
+
+        # The original configuration: rollback journal with a full fsync per commit
+        legacy_store, _ = setup(os.path.join(tmp, "legacy.db"), corpus, refs, wal=False)
+        legacy = direct_rate(legacy_store, grades)
+        legacy_store.close_all()
+
+        direct = direct_rate(store, grades)
+
+        journal = ReviewJournal(store, os.path.join(tmp, "journal.log"), flush_interval=0)
+        start = time.perf_counter()
+        for ref, quality in grades:
+            journal.record_review(*ref, quality)
+        recorded = time.perf_counter() - start
+        journal.close()
+        batched = time.perf_counter() - start
+        store.close_all()
+
+    print(f"{reviews} reviews over {len(refs)} memorized verses")
+    print(f"direct, rollback journal: {legacy:10.0f} reviews/s")
+    print(f"direct, WAL:              {direct:10.0f} reviews/s")
+    print(f"journal (recording):      {reviews / recorded:10.0f} reviews/s")
+    print(f"journal (with flush):     {reviews / batched:10.0f} reviews/s")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,49 @@
+# benchmarks/bench_search.py
+"""Compare the FTS5 search path with the old LIKE scan on a full synthetic Bible.
+
+Usage: python benchmarks/bench_search.py [repeats]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import VerseStore
+from synthetic import write_corpus
+
+QUERIES = ["love", "grace", "israel", "lov*", '"the lord"', "faith grace", "glove"]
+
+def like_search(store, word):
+    # Mirrors the old search_word: substring LIKE over every verse, all rows fetched
+    term = word.strip('"*')
+    rows = store.connection().execute(
+        "SELECT book, chapter, verse, text FROM verses WHERE text LIKE ? ORDER BY id",
+        (f"%{term}%",)).fetchall()
+    return len(rows), rows
+
+def timed(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = fn()
+    return (time.perf_counter() - start) / repeats * 1000, result
+
+def main(repeats=20):
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = os.path.join(tmp, "bible.txt")
+        write_corpus(corpus)
+        store = VerseStore(os.path.join(tmp, "bench.db"))
+        store.init_db()
+        store.import_bible_from_text(corpus)
+
+        print(f"{'query':14} {'LIKE ms':>9} {'verses':>7} {'FTS ms':>8} {'verses':>7} {'occurrences':>12}")
+        for query in QUERIES:
+            like_ms, (like_count, _) = timed(lambda: like_search(store, query), repeats)
+            fts_ms, result = timed(lambda: store.search(query, limit=20), repeats)
+            print(f"{query:14} {like_ms:9.2f} {like_count:7} {fts_ms:8.2f} "
+                  f"{result.verse_count:7} {result.occurrences:12}")
+        store.close_all()
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
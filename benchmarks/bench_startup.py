@@ -0,0 +1,73 @@
+# benchmarks/bench_startup.py
+"""Measure cold start: module import time and time to first paint.
+
+Import time comes from `python -X importtime -c "import main"`. The app is
+then launched with --startup-benchmark, which reports when imports finished,
+the window was created, it first painted and the first verse appeared,
+counted from the moment this script started the process.
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--offscreen] [--output startup.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def import_times(top=15):
+    """Total import time of main.py and its slowest top-level imports, in ms"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Top-level imports are the ones not indented under another
+        if not name.startswith("  "):
+            modules.append((name.strip(), int(cumulative) / 1000))
+    modules.sort(key=lambda item: -item[1])
+    return {"total_ms": round(sum(ms for _, ms in modules), 2),
+            "slowest": [{"module": name, "ms": round(ms, 2)} for name, ms in modules[:top]]}
+
+def launch(offscreen, timeout=60):
+    """Start the app once and return its startup marks in seconds"""
+    env = dict(os.environ)
+    if offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+    env["BMA_STARTUP_T0"] = repr(time.time())
+    result = subprocess.run([sys.executable, "main.py", "--startup-benchmark"], cwd=ROOT, env=env,
+                            capture_output=True, text=True, timeout=timeout)
+    for line in reversed(result.stdout.splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    raise RuntimeError(f"no startup timings reported: {result.stderr.strip()[-500:]}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark application start-up")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--offscreen", action="store_true", help="Use Qt's offscreen platform (no display)")
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    runs = [launch(args.offscreen) for _ in range(args.runs)]
+    marks = {name: round(statistics.median(run[name] for run in runs if name in run) * 1000, 1)
+             for name in runs[0]}
+    report = {"python": sys.version.split()[0], "runs": args.runs,
+              "imports": import_times(), "median_ms": marks, "samples": runs}
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
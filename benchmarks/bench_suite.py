@@ -0,0 +1,143 @@
+# benchmarks/bench_suite.py
+"""Time the main database operations at several corpus sizes and emit JSON.
+
+Each size is a synthetic corpus of the full canon (66 books, 1,189 chapters,
+about 31,000 verses) repeated once per scale step, the extra copies standing
+in for further translations. Save the output of two commits and diff it to
+see what got slower.
+
+Usage: python benchmarks/bench_suite.py [--scales 1,2,4] [--repeats 50] [--output results.json]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import VerseStore
+from synthetic import BOOKS, write_corpus
+
+SEARCH_QUERIES = ["love", "lov*", '"the lord"', "faith grace"]
+MEMORIZED = 2000
+
+def summarize(samples):
+    """Summary statistics, in milliseconds, of a list of durations in seconds"""
+    ms = sorted(sample * 1000 for sample in samples)
+    return {
+        "runs": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 4),
+        "median_ms": round(statistics.median(ms), 4),
+        "p95_ms": round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 4),
+        "min_ms": round(ms[0], 4),
+        "max_ms": round(ms[-1], 4),
+    }
+
+def timed(fn, args_list):
+    """Call fn once per argument tuple and return the durations"""
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+def bench_size(tmp, scale, repeats, seed):
+    rng = random.Random(seed)
+    corpus = os.path.join(tmp, f"bible_{scale}.txt")
+    verses = write_corpus(corpus, seed=seed, scale=scale)
+    store = VerseStore(os.path.join(tmp, f"bench_{scale}.db"))
+    store.init_db()
+    results = {"scale": scale, "verses": verses}
+
+    start = time.perf_counter()
+    store.import_bible_from_text(corpus)
+    seconds = time.perf_counter() - start
+    results["import"] = {"seconds": round(seconds, 4), "verses_per_second": round(verses / seconds)}
+
+    refs = [row[:3] for row in store.get_random_verses(min(MEMORIZED, verses))]
+    books = [row[0] for row in store.connection().execute("SELECT DISTINCT book FROM verses")]
+    lookups = [rng.choice(refs) for _ in range(repeats)]
+    chapters = [(book, chapter) for book, chapter, _ in lookups]
+
+    ops = {}
+    # The first call builds the random pool, so it is timed on its own
+    ops["random_verse_first"] = timed(store.get_random_verse, [()])
+    ops["random_verse"] = timed(store.get_random_verse, [()] * repeats)
+    ops["random_verses_10"] = timed(store.get_random_verses, [(10,)] * repeats)
+    ops["random_verse_book"] = timed(lambda book: store.get_random_verse(book=book),
+                                     [(rng.choice(books),) for _ in range(repeats)])
+    ops["reference_lookup"] = timed(store.get_verse_by_reference, lookups)
+    ops["chapter_verses"] = timed(store.get_verses_for_chapter, chapters)
+
+    store._outline = None
+    ops["outline_load"] = timed(store.get_outline, [()])
+    ops["outline_books"] = timed(store.get_books, [()] * repeats)
+    ops["outline_chapters"] = timed(store.get_chapters_for_book, [(rng.choice(books),) for _ in range(repeats)])
+
+    for query in SEARCH_QUERIES:
+        ops[f"search {query}"] = timed(store.search, [(query,)] * repeats)
+
+    for ref in refs:
+        store.save_memorized_verse(*ref)
+    # Make half of the memorized verses due now
+    conn = store.connection()
+    conn.execute("UPDATE memorized_verses SET next_due=datetime('now', '-1 days') WHERE id % 2 = 0")
+    conn.commit()
+    ops["due_queue"] = timed(store.get_due_queue, [()] * repeats)
+    ops["due_for_review_10"] = timed(store.get_verses_due_for_review, [(10,)] * repeats)
+    ops["sm2_update"] = timed(store.update_spaced_repetition,
+                              [(*rng.choice(refs), rng.randint(0, 5)) for _ in range(repeats)])
+
+    store.close_all()
+    results["operations"] = {name: summarize(samples) for name, samples in ops.items()}
+    results["memorized"] = len(refs)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the database at several corpus sizes")
+    parser.add_argument("--scales", default="1,2,4", help="Comma-separated corpus copies (default: 1,2,4)")
+    parser.add_argument("--repeats", type=int, default=50, help="Calls per timed operation")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "books": len(BOOKS),
+        "chapters": sum(chapters for _, chapters in BOOKS),
+        "repeats": args.repeats,
+        "sizes": [],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in (int(s) for s in args.scales.split(",")):
+            print(f"Benchmarking scale {scale}...", file=sys.stderr)
+            report["sizes"].append(bench_size(tmp, scale, args.repeats, args.seed))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
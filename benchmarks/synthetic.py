@@ -0,0 +1,57 @@
+# benchmarks/synthetic.py
+"""Generate a synthetic Bible text file in "Book Chapter:Verse Text" format."""
+import random
+
+# The 66 books of the Protestant canon with their chapter counts (1,189 total)
+BOOKS = [
+    ("Genesis", 50), ("Exodus", 40), ("Leviticus", 27), ("Numbers", 36),
+    ("Deuteronomy", 34), ("Joshua", 24), ("Judges", 21), ("Ruth", 4),
+    ("1 Samuel", 31), ("2 Samuel", 24), ("1 Kings", 22), ("2 Kings", 25),
+    ("1 Chronicles", 29), ("2 Chronicles", 36), ("Ezra", 10), ("Nehemiah", 13),
+    ("Esther", 10), ("Job", 42), ("Psalms", 150), ("Proverbs", 31),
+    ("Ecclesiastes", 12), ("Song of Solomon", 8), ("Isaiah", 66), ("Jeremiah", 52),
+    ("Lamentations", 5), ("Ezekiel", 48), ("Daniel", 12), ("Hosea", 14),
+    ("Joel", 3), ("Amos", 9), ("Obadiah", 1), ("Jonah", 4),
+    ("Micah", 7), ("Nahum", 3), ("Habakkuk", 3), ("Zephaniah", 3),
+    ("Haggai", 2), ("Zechariah", 14), ("Malachi", 4), ("Matthew", 28),
+    ("Mark", 16), ("Luke", 24), ("John", 21), ("Acts", 28),
+    ("Romans", 16), ("1 Corinthians", 16), ("2 Corinthians", 13), ("Galatians", 6),
+    ("Ephesians", 6), ("Philippians", 4), ("Colossians", 4), ("1 Thessalonians", 5),
+    ("2 Thessalonians", 3), ("1 Timothy", 6), ("2 Timothy", 4), ("Titus", 3),
+    ("Philemon", 1), ("Hebrews", 13), ("James", 5), ("1 Peter", 5),
+    ("2 Peter", 3), ("1 John", 5), ("2 John", 1), ("3 John", 1),
+    ("Jude", 1), ("Revelation", 22),
+]
+
+WORDS = (
+    "and the of to that in he shall unto for i his a lord they be is him not "
+    "them it with all thou thy was god which my me said but ye their have "
+    "will thee from as are when this out were upon man by you israel king "
+    "son up there hath then people came had house into on her come one we "
+    "children before your also day land men shalt let go against us made "
+    "hand over even saying things did no so father gave behold heaven earth "
+    "love faith grace light life world spirit word truth peace glory mercy"
+).split()
+
+def generate_verses(seed=0, scale=1):
+    """Yield (book, chapter, verse, text) for roughly 31,000 * scale verses"""
+    rng = random.Random(seed)
+    for copy in range(scale):
+        # Scaled corpora repeat the canon under distinct book names, each copy
+        # with its own text, like further translations of the same verses
+        suffix = f" {chr(ord('A') + copy)}" if scale > 1 else ""
+        for book, chapters in BOOKS:
+            for chapter in range(1, chapters + 1):
+                for verse in range(1, rng.randint(12, 40) + 1):
+                    text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 40)))
+                    yield book + suffix, chapter, verse, text.capitalize() + "."
+
+def write_corpus(path, seed=0, scale=1):
+    """Write a synthetic corpus to path and return the number of verses"""
+    count = 0
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("# Synthetic Bible corpus\n")
+        for book, chapter, verse, text in generate_verses(seed, scale):
+            file.write(f"{book} {chapter}:{verse} {text}\n")
+            count += 1
+    return count
@@ -0,0 +1,86 @@
+# concordance.py
+"""Concordance lookups and word-frequency tables, read from the full-text index
+
+The index's fts5vocab 'instance' table (verses_instance) lists every
+occurrence of every word as (term, doc, col, offset): doc is the verse id
+and offset the word's position among the verse's words. A word's verses
+and positions are a range of its entries. word_counts holds occurrence
+and verse counts summed from them on import, per chapter, per book
+(chapter 0) and for the whole translation (book '', chapter 0), so exact
+totals and the top words of a book are index lookups. Words are the
+index's tokens: lowercased, with accents removed.
+"""
+import itertools
+import re
+from collections import Counter
+from operator import itemgetter
+
+# The tokenizer's words: runs of letters and digits ("_" separates words)
+WORD_PATTERN = re.compile(r"[^\W_]+")
+
+def parse_positions(positions):
+    """Word positions aggregated as "7,0" -> (0, 7)"""
+    return tuple(sorted(int(position) for position in positions.split(",")))
+
+def create_tables(conn):
+    conn.execute('''CREATE TABLE IF NOT EXISTS word_counts (
+                    translation_id INTEGER,
+                    book TEXT,
+                    chapter INTEGER,
+                    word TEXT,
+                    occurrences INTEGER,
+                    verses INTEGER,
+                    PRIMARY KEY (translation_id, book, chapter, word)) WITHOUT ROWID''')
+
+def words(text):
+    """A verse's words as the index stores them: lowercased, accents removed"""
+    from database import remove_diacritics
+    return WORD_PATTERN.findall(remove_diacritics(text.lower()))
+
+def _count(found):
+    """(occurrences, verses) Counters of the word lists of some verses"""
+    return (Counter(itertools.chain.from_iterable(found)),
+            Counter(itertools.chain.from_iterable(map(set, found))))
+
+def build_word_counts(conn, translation_id, id_range):
+    """Replace the word counts of the verses with ids in id_range
+
+    Runs inside the caller's transaction. Returns the number of rows.
+    """
+    conn.execute("DELETE FROM word_counts WHERE translation_id=?", (translation_id,))
+    # (book, chapter) -> (occurrences, verses), with books under chapter 0
+    # and the whole translation under ("", 0)
+    counts = {}
+    translation_words = []
+    rows = conn.execute("SELECT book, chapter, text FROM verses WHERE id BETWEEN ? AND ? ORDER BY id", id_range)
+    for book, book_rows in itertools.groupby(rows, key=itemgetter(0)):
+        book_words = []
+        for chapter, verses in itertools.groupby(book_rows, key=itemgetter(1)):
+            found = [words(text) for _, _, text in verses]
+            counts[book, chapter] = _count(found)
+            book_words.extend(found)
+        counts[book, 0] = _count(book_words)
+        translation_words.extend(book_words)
+    counts["", 0] = _count(translation_words)
+    # Rows in primary key order are appended to the table rather than scattered through it
+    rows = sorted((translation_id, book, chapter, word, count, verses[word])
+                  for (book, chapter), (occurrences, verses) in counts.items()
+                  for word, count in occurrences.items())
+    conn.executemany(
+        "INSERT INTO word_counts (translation_id, book, chapter, word, occurrences, verses) VALUES (?, ?, ?, ?, ?, ?)",
+        rows)
+    return len(rows)
+
+def verses_with(conn, term, id_range, limit):
+    """Get (verse_id, book, chapter, verse, text, positions) for the first verses in id_range containing term"""
+    rows = conn.execute("""
+        SELECT v.id, v.book, v.chapter, v.verse, v.text, found.positions
+        FROM (SELECT doc, group_concat(offset) AS positions
+              FROM verses_instance
+              WHERE term=? AND doc BETWEEN ? AND ?
+              GROUP BY doc
+              ORDER BY doc
+              LIMIT ?) AS found
+        JOIN verses v ON v.id = found.doc
+        ORDER BY v.id""", (term, *id_range, limit))
+    return [row[:5] + (parse_positions(row[5]),) for row in rows]
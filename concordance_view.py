@@ -0,0 +1,167 @@
+# concordance_view.py
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt, pyqtSignal
+from PyQt6.QtWidgets import (QDialog, QHBoxLayout, QLabel, QLineEdit, QListView, QListWidget,
+                             QVBoxLayout)
+from concordance import WORD_PATTERN
+
+CONTEXT_WORDS = 6
+
+def in_context(text, positions, context=CONTEXT_WORDS):
+    """The words around the word's first position, with the word itself in capitals"""
+    spans = [match.span() for match in WORD_PATTERN.finditer(text)]
+    position = positions[0]
+    if position >= len(spans):
+        return text
+    first = max(position - context, 0)
+    last = min(position + context, len(spans) - 1)
+    word_start, word_end = spans[position]
+    return "".join(["... " if first > 0 else "",
+                    text[spans[first][0]:word_start], text[word_start:word_end].upper(),
+                    text[word_end:spans[last][1]],
+                    " ..." if last < len(spans) - 1 else ""])
+
+class ConcordanceModel(QAbstractListModel):
+    """The verses containing a word, fetched a page at a time as the view scrolls
+
+    The view calls fetchMore when it reaches the end of the rows; that emits
+    page_needed(word, after) for the owner to load and hand back with
+    add_page. Only one page is requested at a time.
+    """
+
+    ReferenceRole = Qt.ItemDataRole.UserRole + 1
+
+    page_needed = pyqtSignal(str, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.word = None
+        self.total = 0
+        self._rows = []
+        self._waiting = False
+
+    def set_word(self, word, total):
+        """Start listing the total verses that contain word"""
+        self.beginResetModel()
+        self.word = word
+        self.total = total
+        self._rows = []
+        self._waiting = False
+        self.endResetModel()
+
+    def add_page(self, word, after, rows):
+        """Append [(verse_id, book, chapter, verse, text, positions)] loaded after a verse id"""
+        if word != self.word or after != self._last_id():
+            return
+        self._waiting = False
+        if not rows:
+            # Fewer verses than counted, e.g. after an import; stop asking
+            self.total = len(self._rows)
+            return
+        self.beginInsertRows(QModelIndex(), len(self._rows), len(self._rows) + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def _last_id(self):
+        return self._rows[-1][0] if self._rows else 0
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.word is not None and len(self._rows) < self.total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self._waiting:
+            self._waiting = True
+            self.page_needed.emit(self.word, self._last_id())
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        verse_id, book, chapter, verse, text, positions = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{book} {chapter}:{verse}  {in_context(text, positions)}"
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return text
+        if role == self.ReferenceRole:
+            return book, chapter, verse, text
+        return None
+
+class ConcordanceDialog(QDialog):
+    """Browse the concordance: the top words of a book and every verse with a word
+
+    The dialog does no database work itself. It emits word_requested(word)
+    and top_words_requested(book), and the model's page_needed, for the
+    owner to answer with show_word, show_top_words and model.add_page.
+    verse_chosen(book, chapter, verse, text) reports a double-clicked verse.
+    """
+
+    word_requested = pyqtSignal(str)
+    top_words_requested = pyqtSignal(str)
+    verse_chosen = pyqtSignal(str, int, int, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Concordance")
+        self.book = None
+        self.model = ConcordanceModel(self)
+
+        self.word_input = QLineEdit()
+        self.word_input.setPlaceholderText("Word...")
+        self.word_input.returnPressed.connect(lambda: self.lookup(self.word_input.text()))
+        self.count_label = QLabel("")
+
+        self.top_words_label = QLabel("Top words")
+        self.top_words = QListWidget()
+        self.top_words.itemClicked.connect(lambda item: self.lookup(item.data(Qt.ItemDataRole.UserRole)))
+
+        self.verse_list = QListView()
+        self.verse_list.setModel(self.model)
+        self.verse_list.setUniformItemSizes(True)
+        self.verse_list.doubleClicked.connect(self.choose_verse)
+
+        word_layout = QHBoxLayout()
+        word_layout.addWidget(self.word_input)
+        word_layout.addWidget(self.count_label, 1)
+        top_layout = QVBoxLayout()
+        top_layout.addWidget(self.top_words_label)
+        top_layout.addWidget(self.top_words)
+        lists_layout = QHBoxLayout()
+        lists_layout.addLayout(top_layout, 1)
+        lists_layout.addWidget(self.verse_list, 3)
+        layout = QVBoxLayout()
+        layout.addLayout(word_layout)
+        layout.addLayout(lists_layout)
+        self.setLayout(layout)
+        self.resize(900, 500)
+
+    def show_book(self, book):
+        """List the top words of a book (or of the whole Bible for None)"""
+        self.book = book
+        self.top_words_label.setText(f"Top words in {book}" if book else "Top words")
+        self.top_words_requested.emit(book or "")
+
+    def show_top_words(self, book, rows):
+        """Fill the top words list with [(word, occurrences, verses)]"""
+        if (book or None) != self.book:
+            return
+        self.top_words.clear()
+        for word, occurrences, verses in rows:
+            self.top_words.addItem(f"{word} ({occurrences})")
+            self.top_words.item(self.top_words.count() - 1).setData(Qt.ItemDataRole.UserRole, word)
+
+    def lookup(self, word):
+        words = WORD_PATTERN.findall(word.lower())
+        if words:
+            self.word_input.setText(words[0])
+            self.word_requested.emit(words[0])
+
+    def show_word(self, word, counts, first_page):
+        """Show a word's counts and first page of verses"""
+        occurrences, verses = counts
+        self.count_label.setText(f"{occurrences} occurrences in {verses} verses")
+        self.model.set_word(word, verses)
+        self.model.add_page(word, 0, first_page)
+
+    def choose_verse(self, index):
+        self.verse_chosen.emit(*index.data(ConcordanceModel.ReferenceRole))
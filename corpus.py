@@ -0,0 +1,261 @@
+# corpus.py
+"""Compiled, memory-mapped copy of the verse text
+
+Verse text never changes between imports, so each import also writes the
+imported translation to a compact file next to the database: the UTF-8 text of every verse in one
+blob, plus arrays of verse numbers, verse ids and byte offsets, and a small
+chapter table. The file is opened with mmap and the arrays are read in
+place, so lookups need no SQLite row decoding. Arrays use the machine's
+byte order; the file is a local cache rebuilt by every import.
+
+A file may still be mapped by readers when it is rebuilt, and Windows
+cannot replace or delete a mapped file, so each build writes a new
+version ("bible.1-v2.corpus") and readers open the newest. Older versions
+are removed once nothing maps them.
+"""
+import bisect
+import glob
+import json
+import mmap
+import os
+import struct
+from array import array
+
+MAGIC = b"BMCP"
+VERSION = 1
+CORPUS_EXT = ".corpus"
+
+# magic, version, verses, chapters, books, names length, blob length
+HEADER = struct.Struct("<4sIIIIIQ")
+ALL_IDS = (0, 2 ** 63 - 1)
+ROWS_SQL = "SELECT id, book, chapter, verse, text FROM verses WHERE id BETWEEN ? AND ? ORDER BY id"
+
+def corpus_path(db_path, translation_id=None, version=0):
+    """Corpus file for a database, one per translation if translation_id is given"""
+    root = os.path.splitext(db_path)[0]
+    return (root + ("" if translation_id is None else f".{translation_id}")
+            + (f"-v{version}" if version else "") + CORPUS_EXT)
+
+def corpus_versions(db_path, translation_id=None):
+    """[(version, path)] of the corpus files on disk for a database, oldest first"""
+    stem = corpus_path(db_path, translation_id)[:-len(CORPUS_EXT)]
+    found = []
+    for path in glob.glob(glob.escape(stem) + "*" + CORPUS_EXT):
+        suffix = path[len(stem):-len(CORPUS_EXT)]
+        if suffix == "":
+            found.append((0, path))
+        elif suffix.startswith("-v") and suffix[2:].isdigit():
+            found.append((int(suffix[2:]), path))
+    return sorted(found)
+
+def newest_corpus(db_path, translation_id=None):
+    """Path of the newest corpus file for a database, or None"""
+    versions = corpus_versions(db_path, translation_id)
+    return versions[-1][1] if versions else None
+
+def next_corpus_path(db_path, translation_id=None):
+    """Path for a new corpus file, never one that exists"""
+    versions = corpus_versions(db_path, translation_id)
+    return corpus_path(db_path, translation_id, versions[-1][0] + 1 if versions else 1)
+
+def remove_corpora(db_path, translation_id=None, keep=None):
+    """Delete the corpus files for a database other than keep
+
+    Files still mapped by a reader cannot be deleted on Windows; they are
+    left for the next call.
+    """
+    for _, path in corpus_versions(db_path, translation_id):
+        if path != keep:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+class Corpus:
+    """Read-only view of a compiled corpus file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path} is empty")
+        try:
+            self._load()
+        except Exception:
+            self.close()
+            raise
+
+    def _load(self):
+        if len(self._mm) < HEADER.size:
+            raise ValueError(f"{self.path} is truncated")
+        magic, version, verses, chapters, books, names_len, blob_len = HEADER.unpack_from(self._mm)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a version {VERSION} corpus")
+        pos = HEADER.size
+        names_at = _align(pos + blob_len)
+        chapters_at = _align(names_at + names_len)
+        numbers_at = chapters_at + chapters * 16
+        ids_at = _align(numbers_at + verses * 4)
+        offsets_at = ids_at + verses * 8
+        if len(self._mm) < offsets_at + (verses + 1) * 8:
+            raise ValueError(f"{self.path} is truncated")
+
+        view = memoryview(self._mm)
+        self._views = [view]
+        self._blob = self._view(view, pos, blob_len, "B")
+        names = json.loads(bytes(view[names_at:names_at + names_len]).decode("utf-8"))
+        table = self._view(view, chapters_at, chapters * 16, "I")
+        self._numbers = self._view(view, numbers_at, verses * 4, "I")
+        self._ids = self._view(view, ids_at, verses * 8, "q")
+        self._offsets = self._view(view, offsets_at, (verses + 1) * 8, "Q")
+
+        # The chapter table is small (1,189 rows for one translation), so it
+        # is unpacked into a dict for O(1) reference lookups
+        self._chapters = {}
+        self._chapter_starts = []
+        self._chapter_keys = []
+        for i in range(chapters):
+            book, chapter, start, count = table[i * 4:i * 4 + 4]
+            key = (names[book], chapter)
+            self._chapters[key] = (start, count)
+            self._chapter_starts.append(start)
+            self._chapter_keys.append(key)
+
+    def _view(self, view, offset, length, fmt):
+        part = view[offset:offset + length].cast(fmt)
+        self._views.append(part)
+        return part
+
+    def __len__(self):
+        return len(self._ids)
+
+    def close(self):
+        # Views must be released before the map can be closed
+        for part in reversed(getattr(self, "_views", [])):
+            part.release()
+        self._views = []
+        self._mm.close()
+        self._file.close()
+
+    def text(self, index):
+        """Text of the verse at an array index"""
+        return str(self._blob[self._offsets[index]:self._offsets[index + 1]], "utf-8")
+
+    def _index(self, book, chapter, verse):
+        entry = self._chapters.get((book, chapter))
+        if entry is None:
+            return None
+        start, count = entry
+        # Verses are usually numbered 1..n, so try the direct position first
+        index = start + verse - 1
+        if start <= index < start + count and self._numbers[index] == verse:
+            return index
+        index = bisect.bisect_left(self._numbers, verse, start, start + count)
+        if index < start + count and self._numbers[index] == verse:
+            return index
+        return None
+
+    def verse(self, book, chapter, verse):
+        """Text of a verse, or None"""
+        index = self._index(book, chapter, verse)
+        return None if index is None else self.text(index)
+
+    def chapter(self, book, chapter):
+        """[(verse, text)] for a chapter in verse order"""
+        start, count = self._chapters.get((book, chapter), (0, 0))
+        return [(self._numbers[i], self.text(i)) for i in range(start, start + count)]
+
+    def verse_at(self, index):
+        """(verse_id, book, chapter, verse, text) for an array index"""
+        book, chapter = self._chapter_keys[bisect.bisect_right(self._chapter_starts, index) - 1]
+        return self._ids[index], book, chapter, self._numbers[index], self.text(index)
+
+    def index_of_id(self, verse_id):
+        """Array index of a verse id, or None"""
+        # Ids are sorted but sparse (they encode the reference), so bisect
+        index = bisect.bisect_left(self._ids, verse_id)
+        if index == len(self._ids) or self._ids[index] != verse_id:
+            return None
+        return index
+
+    def validate(self, conn, id_range=ALL_IDS):
+        """True if every row of the verses table with an id in id_range matches the corpus"""
+        index = -1
+        for index, row in enumerate(conn.execute(ROWS_SQL, id_range)):
+            if index >= len(self) or self.verse_at(index) != row:
+                return False
+        return index + 1 == len(self)
+
+def _write(conn, path, id_range):
+    """Write the verses with ids in id_range to path in corpus format; returns the verse count"""
+    names = []
+    book_index = {}
+    table = array("I")      # (book index, chapter, first verse index, verse count)
+    numbers = array("I")
+    ids = array("q")
+    offsets = array("Q", [0])
+    seen = set()
+    current = None
+
+    with open(path, "wb") as file:
+        file.write(bytes(HEADER.size))
+        # The text is streamed to the file; only the small arrays stay in memory
+        for verse_id, book, chapter, verse, text in conn.execute(ROWS_SQL, id_range):
+            if (book, chapter) != current:
+                if (book, chapter) in seen:
+                    raise ValueError(f"{book} {chapter} is split across the verse list")
+                current = (book, chapter)
+                seen.add(current)
+                if book not in book_index:
+                    book_index[book] = len(names)
+                    names.append(book)
+                table.extend((book_index[book], chapter, len(numbers), 0))
+            elif verse <= numbers[-1]:
+                raise ValueError(f"{book} {chapter}:{verse} is out of order")
+            table[-1] += 1
+            numbers.append(verse)
+            ids.append(verse_id)
+            data = text.encode("utf-8")
+            file.write(data)
+            offsets.append(offsets[-1] + len(data))
+
+        names_data = json.dumps(names).encode("utf-8")
+        for section in (names_data, table.tobytes(), numbers.tobytes(), ids.tobytes(), offsets.tobytes()):
+            file.write(bytes(_align(file.tell()) - file.tell()))
+            file.write(section)
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, VERSION, len(ids), len(table) // 4, len(names),
+                               len(names_data), offsets[-1]))
+    return len(ids)
+
+def build_corpus(conn, path, id_range=ALL_IDS):
+    """Compile the verses with ids in id_range into a corpus file at path and check it
+
+    Verses of a chapter must be contiguous and in order, as every import
+    produces them; otherwise ValueError is raised. The file is written
+    next to path and only moved into place once it validates.
+    """
+    tmp_path = path + ".tmp"
+    try:
+        count = _write(conn, tmp_path, id_range)
+        corpus = Corpus(tmp_path)
+        try:
+            valid = corpus.validate(conn, id_range)
+        finally:
+            corpus.close()
+        if not valid:
+            raise ValueError("compiled corpus does not match the database")
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    os.replace(tmp_path, path)
+    return count
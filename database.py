@@ -1,240 +1,1452 @@
 # database.py
 import sqlite3
 import os
+import pathlib
 import random
+import threading
+import itertools
+import re
+import unicodedata
+from array import array
+from collections import namedtuple
+from outline import BibleOutline
+from corpus import Corpus, build_corpus, newest_corpus, next_corpus_path, remove_corpora
+from concordance import build_word_counts, create_tables as create_concordance_tables, verses_with
+from profiler import profiler
 
-def ensure_data_dir():
-    if not os.path.exists("data"):
-        os.makedirs("data")
+DB_PATH = "data/bible_memory.db"
+# Profiles live in a "profiles" directory beside the Bible database
+PROFILES_DIR = "data/profiles"
+PROGRESS_FILE = "progress.db"
+DEFAULT_PROFILE = "default"
+IMPORT_CHUNK_SIZE = 5000
+IMPORT_CACHE_SIZE = -65536  # negative means KiB, i.e. 64 MiB
+CONCORDANCE_PAGE = 50
+TOP_WORDS = 50
+DEFAULT_TRANSLATION = "Default"
+# A verse id is its translation's id shifted left by this, plus verse_ref()
+TRANSLATION_SHIFT = 32
+REF_MASK = (1 << TRANSLATION_SHIFT) - 1
+EXTRA_BOOK_START = 101
 
-def init_db():
-    ensure_data_dir()
-    conn = sqlite3.connect("data/bible_memory.db")
-    cursor = conn.cursor()
-    
+SearchResults = namedtuple("SearchResults", ["occurrences", "verse_count", "rows"])
+
+TOKEN_PATTERN = re.compile(r"\w+")
+PROFILE_NAME = re.compile(r"^\w[\w .-]*$")
+
+def ensure_data_dir(db_path=DB_PATH):
+    data_dir = os.path.dirname(db_path)
+    if data_dir and not os.path.exists(data_dir):
+        os.makedirs(data_dir)
+
+def profiles_dir(db_path=DB_PATH):
+    """Directory of the user profiles sharing a Bible database"""
+    return os.path.join(os.path.dirname(db_path), os.path.basename(PROFILES_DIR))
+
+def profile_path(name, db_path=DB_PATH):
+    """Path of the progress database for a user profile of a Bible database"""
+    if not PROFILE_NAME.match(name) or name.endswith("."):
+        raise ValueError(f"Invalid profile name: {name!r}")
+    return os.path.join(profiles_dir(db_path), name, PROGRESS_FILE)
+
+def list_profiles(db_path=DB_PATH):
+    """Names of the profiles that have a progress database, default first"""
+    names = set()
+    directory = profiles_dir(db_path)
+    if os.path.isdir(directory):
+        names = {entry.name for entry in os.scandir(directory)
+                 if os.path.exists(os.path.join(entry.path, PROGRESS_FILE))}
+    names.discard(DEFAULT_PROFILE)
+    return [DEFAULT_PROFILE] + sorted(names)
+
+def verse_ref(book_number, chapter, verse):
+    """Reference number shared by a verse in every translation: BBBCCCVVV"""
+    if not (0 < chapter < 1000 and 0 < verse < 1000):
+        raise ValueError(f"Chapter {chapter}, verse {verse} is outside 1-999")
+    return book_number * 1000000 + chapter * 1000 + verse
+
+def translation_name(file_path):
+    """Default name of a translation imported from a file: "kjv.txt" -> "KJV" """
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    return name.upper() if len(name) <= 5 else name
+
+def translation_range(translation_id):
+    """(first, last) verse id a translation can use"""
+    first = translation_id << TRANSLATION_SHIFT
+    return first, first + REF_MASK
+
+def _book_numberer(conn, allocate=True):
+    """Return number(book) giving a book name's canonical number
+
+    The 66 books are numbered in canon order under any of their usual
+    names, so "Psalm" and "Psalms" are the same book. Other books are
+    numbered from EXTRA_BOOK_START in the order they are first imported;
+    without allocate, a book not imported yet gives None.
+    """
+    from references import BOOK_ALIASES, CANONICAL_KEYS, book_key
+    canon = {name: number for number, name in enumerate(BOOK_ALIASES, 1)}
+    extra = dict(conn.execute("SELECT name, number FROM extra_books"))
+    numbers = {}
+
+    def number(book):
+        found = numbers.get(book)
+        if found is None:
+            canonical = CANONICAL_KEYS.get(book_key(book))
+            found = canon[canonical] if canonical else extra.get(book)
+            if found is None:
+                if not allocate:
+                    return None
+                found = extra[book] = max(extra.values(), default=EXTRA_BOOK_START - 1) + 1
+                conn.execute("INSERT INTO extra_books (name, number) VALUES (?, ?)", (book, found))
+            numbers[book] = found
+        return found
+    return number
+
+def _register_verse_ref(conn):
+    """Make verse_ref(book, chapter, verse) callable from SQL on conn"""
+    number = _book_numberer(conn)
+    conn.create_function("verse_ref", 3, lambda book, chapter, verse:
+                         verse_ref(number(book), chapter, verse), deterministic=True)
+    return number
+
+def count_lines(file_path):
+    """Count lines in a file quickly; used as the progress total for imports"""
+    count = 0
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            count += block.count(b'\n')
+    return count
+
+def remove_diacritics(text):
+    """Strip accents the way the full-text tokenizer does: "Naïve" -> "Naive" """
+    if text.isascii():
+        return text
+    return "".join(char for char in unicodedata.normalize("NFD", text) if not unicodedata.combining(char))
+
+def _fts_query(query):
+    """Turn user input into an FTS5 MATCH expression
+
+    Returns (expression, terms, kind) where kind is "word", "prefix",
+    "phrase" or "all". Quoted input is a phrase, a trailing '*' makes a
+    prefix search, and several bare words must all appear in the verse.
+    terms are lowercased and stripped of accents, as the index stores them.
+    Returns None if the input contains no searchable words.
+    """
+    query = query.strip()
+    terms = [remove_diacritics(term.lower()) for term in TOKEN_PATTERN.findall(query)]
+    if not terms:
+        return None
+    if len(query) > 1 and query[0] == query[-1] == '"':
+        return '"' + " ".join(terms) + '"', terms, "phrase" if len(terms) > 1 else "word"
+    if len(terms) == 1:
+        if query.endswith('*'):
+            return f'"{terms[0]}"*', terms, "prefix"
+        return f'"{terms[0]}"', terms, "word"
+    return " ".join(f'"{term}"' for term in terms), terms, "all"
+
+def _count_occurrences(texts, terms, kind):
+    """Count whole-word (or phrase) occurrences of terms in texts
+
+    Accents are ignored, as they are by the full-text index that picked the
+    verses, so every verse it counts has an occurrence here.
+    """
+    if kind == "phrase":
+        pattern = re.compile(r"\b" + r"\W+".join(map(re.escape, terms)) + r"\b", re.IGNORECASE)
+    else:
+        words = "|".join(map(re.escape, terms))
+        suffix = r"\w*" if kind == "prefix" else r"\b"
+        pattern = re.compile(rf"\b(?:{words}){suffix}", re.IGNORECASE)
+    return sum(len(pattern.findall(remove_diacritics(text))) for text in texts)
+
+def sm2(ease_factor, interval, quality):
+    """Return the new (ease_factor, interval) after a review graded 0-5 (SM-2)"""
+    ease_factor = max(1.3, ease_factor + (0.1 - (5-quality) * (0.08 + (5-quality) * 0.02)))
+
+    if quality < 3:
+        interval = 1  # Reset interval if quality is poor
+    elif interval == 1:
+        interval = 6  # First successful recall
+    else:
+        interval = int(interval * ease_factor)  # Increase interval based on ease factor
+    return ease_factor, interval
+
+def _migrate_base_tables(conn):
     # Create verses table
-    cursor.execute('''CREATE TABLE IF NOT EXISTS verses (
-                      id INTEGER PRIMARY KEY, 
-                      book TEXT, 
-                      chapter INTEGER, 
-                      verse INTEGER, 
-                      text TEXT, 
-                      progress INTEGER DEFAULT 0)''')
-    
+    conn.execute('''CREATE TABLE IF NOT EXISTS verses (
+                    id INTEGER PRIMARY KEY,
+                    book TEXT,
+                    chapter INTEGER,
+                    verse INTEGER,
+                    text TEXT,
+                    progress INTEGER DEFAULT 0)''')
+
     # Create memorized verses table
-    cursor.execute('''CREATE TABLE IF NOT EXISTS memorized_verses (
-                      id INTEGER PRIMARY KEY AUTOINCREMENT, 
-                      book TEXT, 
-                      chapter INTEGER, 
-                      verse INTEGER, 
-                      last_reviewed TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                      ease_factor REAL DEFAULT 2.5,
-                      interval INTEGER DEFAULT 1)''')
-    
-    conn.commit()
-    conn.close()
-
-def import_bible_from_text(file_path):
-    """Import Bible verses from a text file into the database"""
-    ensure_data_dir()
-    conn = sqlite3.connect("data/bible_memory.db")
-    cursor = conn.cursor()
-    
-    # Clear existing verses if any
-    cursor.execute("DELETE FROM verses")
-    
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            verse_id = 1
-            for line in file:
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    # Parse line format: "Book Chapter:Verse Text"
-                    parts = line.split(' ', 1)
-                    if len(parts) < 2:
-                        continue
-                    
-                    reference, text = parts
-                    
-                    # Parse reference
-                    book_chapter_verse = reference.split(':')
-                    if len(book_chapter_verse) < 2:
-                        continue
-                    
-                    book_chapter = book_chapter_verse[0].rsplit(' ', 1)
-                    if len(book_chapter) < 2:
-                        continue
-                    
-                    book = book_chapter[0]
-                    chapter = int(book_chapter[1])
-                    verse = int(book_chapter_verse[1])
-                    
-                    cursor.execute(
-                        "INSERT INTO verses (id, book, chapter, verse, text) VALUES (?, ?, ?, ?, ?)",
-                        (verse_id, book, chapter, verse, text)
-                    )
-                    verse_id += 1
-                    
+    conn.execute('''CREATE TABLE IF NOT EXISTS memorized_verses (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    book TEXT,
+                    chapter INTEGER,
+                    verse INTEGER,
+                    last_reviewed TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    ease_factor REAL DEFAULT 2.5,
+                    interval INTEGER DEFAULT 1)''')
+
+def _migrate_review_queue(conn):
+    # Reference lookups and the review join go through this index
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_verses_ref ON verses (book, chapter, verse)")
+
+    # Store the due date so the review queue is a range scan, and link to the verse row
+    conn.execute("ALTER TABLE memorized_verses ADD COLUMN verse_id INTEGER REFERENCES verses(id)")
+    conn.execute("ALTER TABLE memorized_verses ADD COLUMN next_due TIMESTAMP")
+    conn.execute("""
+        UPDATE memorized_verses
+        SET next_due = datetime(last_reviewed, '+' || interval || ' days'),
+            verse_id = (SELECT v.id FROM verses v
+                        WHERE v.book = memorized_verses.book
+                          AND v.chapter = memorized_verses.chapter
+                          AND v.verse = memorized_verses.verse)""")
+
+    # Keep the newest row per verse before enforcing uniqueness
+    conn.execute("""
+        DELETE FROM memorized_verses WHERE id NOT IN (
+            SELECT MAX(id) FROM memorized_verses GROUP BY book, chapter, verse)""")
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_memorized_ref ON memorized_verses (book, chapter, verse)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_memorized_next_due ON memorized_verses (next_due, verse_id)")
+
+OUTLINE_SQL = """
+    INSERT INTO outline (translation_id, book, chapter, book_order, verse_count, first_verse,
+                         last_verse, first_id, verse_list)
+    SELECT ?, book, chapter, MIN(MIN(id)) OVER (PARTITION BY book),
+           COUNT(*), MIN(verse), MAX(verse), MIN(id),
+           CASE WHEN COUNT(*) = MAX(verse) - MIN(verse) + 1 THEN NULL ELSE group_concat(verse) END
+    FROM verses
+    WHERE id BETWEEN ? AND ?
+    GROUP BY book, chapter"""
+
+def _migrate_outline(conn):
+    # One row per chapter, rebuilt on every import
+    conn.execute('''CREATE TABLE IF NOT EXISTS outline (
+                    book TEXT,
+                    chapter INTEGER,
+                    book_order INTEGER,
+                    verse_count INTEGER,
+                    first_verse INTEGER,
+                    last_verse INTEGER,
+                    first_id INTEGER,
+                    verse_list TEXT,
+                    PRIMARY KEY (book, chapter))''')
+    conn.execute("DELETE FROM outline")
+    conn.execute("""
+        INSERT INTO outline (book, chapter, book_order, verse_count, first_verse, last_verse, first_id, verse_list)
+        SELECT book, chapter, MIN(MIN(id)) OVER (PARTITION BY book),
+               COUNT(*), MIN(verse), MAX(verse), MIN(id),
+               CASE WHEN COUNT(*) = MAX(verse) - MIN(verse) + 1 THEN NULL ELSE group_concat(verse) END
+        FROM verses
+        GROUP BY book, chapter""")
+
+def _migrate_translations(conn):
+    # Every translation's verses share one table: a verse's id is its
+    # translation's id << TRANSLATION_SHIFT plus its verse_ref, so the ids
+    # of a translation form one range and the same verse in another
+    # translation differs only in the high bits
+    conn.execute('''CREATE TABLE IF NOT EXISTS translations (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT UNIQUE NOT NULL)''')
+    conn.execute('''CREATE TABLE IF NOT EXISTS extra_books (
+                    name TEXT PRIMARY KEY,
+                    number INTEGER UNIQUE)''')
+    conn.execute("DROP TABLE outline")
+    conn.execute('''CREATE TABLE outline (
+                    translation_id INTEGER,
+                    book TEXT,
+                    chapter INTEGER,
+                    book_order INTEGER,
+                    verse_count INTEGER,
+                    first_verse INTEGER,
+                    last_verse INTEGER,
+                    first_id INTEGER,
+                    verse_list TEXT,
+                    PRIMARY KEY (translation_id, book, chapter))''')
+    if conn.execute("SELECT 1 FROM verses LIMIT 1").fetchone() is None:
+        return
+    # Verses already imported become the first translation; references that
+    # cannot be numbered, and repeats of a reference, are dropped
+    conn.execute("INSERT INTO translations (id, name) VALUES (1, ?)", (DEFAULT_TRANSLATION,))
+    conn.execute("DELETE FROM verses WHERE chapter NOT BETWEEN 1 AND 999 OR verse NOT BETWEEN 1 AND 999")
+    conn.execute("""
+        DELETE FROM verses WHERE id NOT IN (
+            SELECT MIN(id) FROM verses GROUP BY book, chapter, verse)""")
+    _register_verse_ref(conn)
+    first, last = translation_range(1)
+    conn.execute("UPDATE verses SET id = ? + verse_ref(book, chapter, verse)", (first,))
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name='verses_fts'").fetchone():
+        conn.execute("INSERT INTO verses_fts(verses_fts) VALUES('rebuild')")
+    conn.execute(OUTLINE_SQL, (1, first, last))
+
+def _migrate_memorized_ref(conn):
+    # Memorized verses are keyed by their reference, which every translation
+    # shares, rather than by the book name of whichever translation was open
+    conn.execute("ALTER TABLE memorized_verses ADD COLUMN ref INTEGER")
+    number = _book_numberer(conn, allocate=False)
+
+    def ref(book, chapter, verse):
+        book_number = number(book)
+        if book_number is None:
+            return None
+        try:
+            return verse_ref(book_number, chapter, verse)
+        except ValueError:
+            return None
+    conn.create_function("memorized_ref", 3, ref, deterministic=True)
+    conn.execute("UPDATE memorized_verses SET ref = memorized_ref(book, chapter, verse)")
+
+    # The same verse memorized under two book names keeps its latest review
+    conn.execute("""
+        DELETE FROM memorized_verses WHERE id IN (
+            SELECT id FROM (SELECT id, ROW_NUMBER() OVER (
+                                PARTITION BY ref ORDER BY last_reviewed DESC, id DESC) AS rank
+                            FROM memorized_verses WHERE ref IS NOT NULL)
+            WHERE rank > 1)""")
+    conn.execute("DROP INDEX IF EXISTS idx_memorized_ref")
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_memorized_verse_ref ON memorized_verses (ref)")
+
+def _migrate_word_counts(conn):
+    # Word counts are filled once per import from the verse text; init_db
+    # fills them in for translations imported before this migration
+    for table in ("concordance", "word_counts", "verses_vocab"):
+        conn.execute(f"DROP TABLE IF EXISTS {table}")
+    create_concordance_tables(conn)
+
+def _migrate_progress_tables(conn):
+    # A profile's own database: memorized_verses as the migrations above
+    # leave it, linked by verse_id to verses in the attached corpus
+    conn.execute('''CREATE TABLE IF NOT EXISTS memorized_verses (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    book TEXT,
+                    chapter INTEGER,
+                    verse INTEGER,
+                    last_reviewed TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    ease_factor REAL DEFAULT 2.5,
+                    interval INTEGER DEFAULT 1,
+                    verse_id INTEGER,
+                    next_due TIMESTAMP)''')
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_memorized_ref ON memorized_verses (book, chapter, verse)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_memorized_next_due ON memorized_verses (next_due, verse_id)")
+
+# Schema migrations, applied in order; PRAGMA user_version records how many ran
+MIGRATIONS = [
+    _migrate_base_tables,
+    _migrate_review_queue,
+    _migrate_outline,
+    _migrate_translations,
+    _migrate_memorized_ref,
+    _migrate_word_counts,
+]
+
+# Migrations for a profile's separate progress database
+PROGRESS_MIGRATIONS = [
+    _migrate_progress_tables,
+    _migrate_memorized_ref,
+]
+
+def _migrate(conn, migrations):
+    """Apply the migrations conn has not had yet; returns its previous version"""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for number, migration in enumerate(migrations[version:], version + 1):
+        conn.execute("BEGIN")
+        try:
+            migration(conn)
+            conn.execute(f"PRAGMA user_version={number}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return version
+
+class VerseStore:
+    """Owns one long-lived SQLite connection per thread for a Bible database
+
+    db_path holds the verses. Given progress_path, review progress is kept
+    in that database instead: each connection opens it with db_path
+    attached read-only as "corpus", so profiles and processes can share one
+    corpus. Otherwise both live in db_path.
+
+    Reads and tests use one translation at a time: translation names it,
+    and by default it is the first one imported.
+    """
+
+    def __init__(self, db_path=DB_PATH, timeout=5.0, cached_statements=256, wal=True, corpus=True,
+                 progress_path=None, translation=None):
+        self.db_path = db_path
+        self.progress_path = progress_path or db_path
+        self.split = progress_path is not None
+        self._corpus_schema = "corpus" if self.split else "main"
+        # Verse text is also compiled to a memory-mapped file per translation on import
+        self.compile_corpus = corpus
+        self.translation = translation
+        self._translations = None
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+        self.wal = wal
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._fts = None
+        self._random_cache = {}
+        self._outline = None
+        self._book_index = None
+        self._fuzzy = None
+        self._book_number = None
+        # Bumped whenever the caches above are reset, so a cache built from
+        # data read before the reset is not stored over it
+        self._generation = 0
+        self._corpus = None
+
+    def _connect(self):
+        ensure_data_dir(self.progress_path)
+        # sqlite3 keeps a per-connection cache of prepared statements keyed by
+        # the SQL text, so reusing the connection reuses the compiled queries
+        # URIs are accepted so databases can be attached read-only
+        conn = profiler.connect(self.progress_path, timeout=self.timeout,
+                                cached_statements=self.cached_statements, uri=True)
+        if self.wal:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+        if self.split:
+            if not os.path.exists(self.db_path):
+                # An empty file is an empty database; init_db adds the schema
+                ensure_data_dir(self.db_path)
+                open(self.db_path, "ab").close()
+            # Unqualified names resolve to main first, so memorized_verses is
+            # the profile's and verses, outline and the FTS tables the corpus's
+            uri = pathlib.Path(os.path.abspath(self.db_path)).as_uri() + "?mode=ro"
+            conn.execute("ATTACH DATABASE ? AS corpus", (uri,))
+        return conn
+
+    def _corpus_writer(self):
+        """A writable connection to the verse database; release with _release_writer"""
+        if not self.split:
+            return self.connection()
+        ensure_data_dir(self.db_path)
+        conn = profiler.connect(self.db_path, timeout=self.timeout, uri=True)
+        conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+        return conn
+
+    def _release_writer(self, conn):
+        if self.split:
+            conn.close()
+
+    def connection(self):
+        """Return the connection owned by the calling thread, opening it if needed"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self):
+        """Close the connection owned by the calling thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.conn = None
+            with self._lock:
+                self._connections.remove(conn)
+            conn.close()
+
+    def close_all(self):
+        """Close every connection opened by this store (call on shutdown)"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.ProgrammingError:
+                # Connections can only be closed from their own thread
+                pass
+        self._local = threading.local()
+        self._close_corpus()
+
+    def init_db(self):
+        """Create the schema or bring existing databases up to date
+
+        Returns how many memorized verses were moved out of the verse
+        database into a new profile (the old layout); usually 0.
+        """
+        conn = self._corpus_writer()
+        try:
+            migrated = _migrate(conn, MIGRATIONS) < len(MIGRATIONS)
+            self._init_fts(conn)
+            if migrated and self.has_fts():
+                for (translation_id,) in conn.execute("""
+                        SELECT id FROM translations t
+                        WHERE NOT EXISTS (SELECT 1 FROM word_counts w WHERE w.translation_id = t.id)""").fetchall():
+                    build_word_counts(conn, translation_id, translation_range(translation_id))
+            conn.commit()
+            if self.split:
+                # Read-only attachment needs a rollback journal rather than WAL
+                conn.execute("PRAGMA journal_mode=DELETE")
+        finally:
+            self._release_writer(conn)
+
+        conn = self.connection()
+        if migrated:
+            # Verse ids may have been renumbered
+            self._reset_caches("_translations", "_book_number")
+            self._rebuild_corpus(conn)
+        moved = 0
+        if self.split and _migrate(conn, PROGRESS_MIGRATIONS) == 0:
+            moved = self._adopt_legacy_progress(conn)
+        self._relink_memorized(conn)
+        return moved
+
+    def _adopt_legacy_progress(self, conn):
+        """Move progress kept in the verse database (the old layout) into a new profile; returns the count"""
+        moved = conn.execute("""
+            INSERT OR IGNORE INTO main.memorized_verses
+                (book, chapter, verse, ref, verse_id, last_reviewed, ease_factor, interval, next_due)
+            SELECT book, chapter, verse, ref, verse_id, last_reviewed, ease_factor, interval, next_due
+            FROM corpus.memorized_verses""").rowcount
+        conn.commit()
+        if moved > 0:
+            writer = self._corpus_writer()
+            try:
+                writer.execute("DELETE FROM memorized_verses")
+                writer.commit()
+            finally:
+                self._release_writer(writer)
+        return max(moved, 0)
+
+    def _relink_memorized(self, conn):
+        """Point memorized verses at the current translation's verses
+
+        A verse keeps its reference in every translation, so it is found
+        by id, even where the translation names its book differently; verses
+        of books that had no number when memorized are matched by name.
+        """
+        first, last = self.translation_range()
+        conn.execute("""
+            UPDATE memorized_verses
+            SET verse_id = link.verse_id
+            FROM (SELECT mv.id, COALESCE(
+                      (SELECT v.id FROM verses v WHERE v.id = :first + mv.ref),
+                      (SELECT v.id FROM verses v
+                       WHERE v.book = mv.book AND v.chapter = mv.chapter AND v.verse = mv.verse
+                         AND v.id BETWEEN :first AND :last)) AS verse_id
+                  FROM memorized_verses mv) AS link
+            WHERE link.id = memorized_verses.id AND memorized_verses.verse_id IS NOT link.verse_id""",
+                     {"first": first, "last": last})
+        conn.commit()
+
+    def _init_fts(self, conn):
+        """Create the FTS5 index over verse text if SQLite supports it"""
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name='verses_fts'").fetchone()
+        try:
+            # External-content index: the text lives only in verses
+            conn.execute('''CREATE VIRTUAL TABLE IF NOT EXISTS verses_fts USING fts5(
+                              text, content='verses', content_rowid='id',
+                              tokenize='unicode61')''')
+            # One row per occurrence (term, doc, col, offset); doc is the verse id
+            conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS verses_instance USING fts5vocab(verses_fts, 'instance')")
+        except sqlite3.OperationalError as e:
+            print(f"Full-text search unavailable, falling back to LIKE: {e}")
+            self._fts = False
+            return
+        if not exists:
+            # Index verses imported before the index existed
+            conn.execute("INSERT INTO verses_fts(verses_fts) VALUES('rebuild')")
+        self._fts = True
+
+    def has_fts(self):
+        """Return True if the database has a full-text index"""
+        if self._fts is None:
+            self._fts = self.connection().execute(
+                f"SELECT 1 FROM {self._corpus_schema}.sqlite_master WHERE name='verses_fts'"
+            ).fetchone() is not None
+        return self._fts
+
+    def _reset_caches(self, *names):
+        """Drop the named lazily built caches; see _store_cache"""
+        with self._lock:
+            self._generation += 1
+            for name in names:
+                setattr(self, name, None)
+
+    def _store_cache(self, name, value, generation):
+        """Keep a cache built since generation unless it was reset meanwhile; returns value"""
+        with self._lock:
+            if generation == self._generation:
+                setattr(self, name, value)
+        return value
+
+    def _translation_ids(self):
+        translations = self._translations
+        if translations is None:
+            generation = self._generation
+            translations = self._store_cache("_translations", dict(self.connection().execute(
+                "SELECT name, id FROM translations ORDER BY id").fetchall()), generation)
+        return translations
+
+    def get_translations(self):
+        """Names of the imported translations, oldest first"""
+        return list(self._translation_ids())
+
+    def current_translation(self):
+        """Name of the translation reads and tests use, or None before any import"""
+        return self._current(self._translation_ids())
+
+    def _current(self, translations):
+        if self.translation in translations:
+            return self.translation
+        return next(iter(translations), None)
+
+    def _translation_id(self):
+        translations = self._translation_ids()
+        return translations.get(self._current(translations), 0)
+
+    def translation_range(self):
+        """(first, last) verse id of the current translation"""
+        return translation_range(self._translation_id())
+
+    def use_translation(self, name):
+        """Read and test against another imported translation"""
+        if name not in self.get_translations():
+            raise ValueError(f"Unknown translation '{name}'")
+        self.translation = name
+        self._reset_caches("_outline", "_fuzzy")
+        self.invalidate_random_cache()
+        self._close_corpus()
+        conn = self.connection()
+        if self.compile_corpus and self._corpus_file() is None:
+            self._rebuild_corpus(conn)
+        self._relink_memorized(conn)
+
+    def get_parallel(self, book, chapter, verse):
+        """Get [(translation, text)] for one verse of the current translation in every translation
+
+        The verse's reference bits are shared, so this is one rowid lookup per
+        translation in a single query.
+        """
+        first, last = self.translation_range()
+        return self.connection().execute("""
+            SELECT t.name, p.text
+            FROM verses v
+            JOIN translations t
+            JOIN verses p ON p.id = (t.id << ?) + (v.id & ?)
+            WHERE v.book=? AND v.chapter=? AND v.verse=? AND v.id BETWEEN ? AND ?
+            ORDER BY t.id""", (TRANSLATION_SHIFT, REF_MASK, book, chapter, verse, first, last)).fetchall()
+
+    def bulk_import(self, rows, progress=None, total=None, chunk_size=IMPORT_CHUNK_SIZE, translation=None):
+        """Replace a translation's verses with (book, chapter, verse, text) rows in one transaction
+
+        Rows are consumed lazily in chunks and written with executemany. If
+        given, progress(imported, total) is called after every chunk.
+        translation defaults to the current one (DEFAULT_TRANSLATION if none);
+        other translations are left as they are. A repeated reference
+        replaces the earlier verse. Returns the number of verses imported.
+        """
+        def insert(conn, first_id, book_number):
+            imported = 0
+            rows_left = iter(rows)
+            while True:
+                chunk = [(first_id + verse_ref(book_number(book), chapter, verse), book, chapter, verse, text)
+                         for book, chapter, verse, text in itertools.islice(rows_left, chunk_size)]
+                if not chunk:
+                    break
+                conn.executemany(
+                    "INSERT OR REPLACE INTO verses (id, book, chapter, verse, text) VALUES (?, ?, ?, ?, ?)",
+                    chunk)
+                imported += len(chunk)
+                if progress:
+                    progress(imported, total)
+            return imported
+
+        imported = self._import(insert, translation)
+        if progress:
+            progress(imported, imported)
+        return imported
+
+    def copy_import(self, source_path, selects, progress=None, translation=None):
+        """Replace a translation's verses with rows copied from another SQLite database
+
+        The source is attached read-only as "source"; selects are (sql, params)
+        queries over it, each returning book, chapter, verse, text for one book.
+        Each is copied with one INSERT ... SELECT, so rows never pass through
+        Python. progress(done, len(selects)) is called per query.
+        Returns the number of verses imported.
+        """
+        def insert(conn, first_id, book_number):
+            imported = 0
+            for done, (sql, params) in enumerate(selects, 1):
+                cursor = conn.execute(f"""
+                    INSERT OR REPLACE INTO verses (id, book, chapter, verse, text)
+                    SELECT ? + verse_ref(book, chapter, verse), book, chapter, verse, text
+                    FROM ({sql})""", (first_id, *params))
+                imported += cursor.rowcount
+                if progress:
+                    progress(done, len(selects))
+            return imported
+
+        uri = pathlib.Path(os.path.abspath(source_path)).as_uri() + "?mode=ro"
+        return self._import(insert, translation, attach=uri)
+
+    def _import(self, insert, translation=None, attach=None):
+        """Replace a translation's verses with those insert() writes, rebuilding what depends on them
+
+        insert(conn, first_id, book_number) adds first_id + verse_ref() ids.
+        Runs on the corpus writer in one transaction; the translation's
+        full-text entries and outline are replaced, then its compiled corpus
+        and the memorized links are rebuilt. Other translations are not
+        touched. attach is a database URI attached as "source" meanwhile.
+        """
+        translation = translation or self.current_translation() or DEFAULT_TRANSLATION
+        conn = self._corpus_writer()
+        saved = {name: conn.execute(f"PRAGMA {name}").fetchone()[0]
+                 for name in ("synchronous", "cache_size")}
+
+        # Import-time settings. The database holds every other translation
+        # too, so the journal stays on disk for a crash to roll back; only
+        # the fsyncs of a FULL sync are skipped
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size={IMPORT_CACHE_SIZE}")
+
+        try:
+            if attach:
+                # ATTACH is not allowed inside a transaction
+                conn.execute("ATTACH DATABASE ? AS source", (attach,))
+            conn.execute("BEGIN")
+            conn.execute("INSERT OR IGNORE INTO translations (name) VALUES (?)", (translation,))
+            translation_id = conn.execute(
+                "SELECT id FROM translations WHERE name=?", (translation,)).fetchone()[0]
+            first, last = translation_range(translation_id)
+            book_number = _register_verse_ref(conn)
+            fts = self.has_fts()
+            if fts:
+                # External-content entries are removed with the text they indexed
+                conn.execute("""
+                    INSERT INTO verses_fts(verses_fts, rowid, text)
+                    SELECT 'delete', id, text FROM verses WHERE id BETWEEN ? AND ?""", (first, last))
+            conn.execute("DELETE FROM verses WHERE id BETWEEN ? AND ?", (first, last))
+            imported = insert(conn, first, book_number)
+            if fts:
+                conn.execute("""
+                    INSERT INTO verses_fts(rowid, text)
+                    SELECT id, text FROM verses WHERE id BETWEEN ? AND ?""", (first, last))
+            conn.execute("DELETE FROM outline WHERE translation_id=?", (translation_id,))
+            conn.execute(OUTLINE_SQL, (translation_id, first, last))
+            if fts:
+                build_word_counts(conn, translation_id, (first, last))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.invalidate_random_cache()
+            self._reset_caches("_outline", "_translations", "_fuzzy", "_book_number")
+            if attach and conn.execute(
+                    "SELECT 1 FROM pragma_database_list WHERE name='source'").fetchone():
+                conn.execute("DETACH DATABASE source")
+            conn.execute(f"PRAGMA cache_size={saved['cache_size']}")
+            conn.execute(f"PRAGMA synchronous={saved['synchronous']}")
+            self._release_writer(conn)
+
+        self.translation = translation
+        conn = self.connection()
+        self._rebuild_corpus(conn)
+        # Verses may have been dropped or added, so relink memorized verses
+        self._relink_memorized(conn)
+        return imported
+
+    def import_bible_from_text(self, file_path, progress=None, stats=None, translation=None):
+        """Import Bible verses from a text file into the database
+
+        Pass a verse_parser.ParseStats as stats to collect skipped lines.
+        The translation is named after the file unless translation is given.
+        """
+        # The parser is only needed for imports, so it stays off the startup path
+        from verse_parser import parse_file, ParseStats
+
+        if stats is None:
+            stats = ParseStats()
+        try:
+            self.bulk_import(parse_file(file_path, stats), progress=progress,
+                             total=count_lines(file_path),
+                             translation=translation or translation_name(file_path))
+        except Exception as e:
+            print(f"Error importing Bible: {e}")
+            return False
+        return stats.processed > 0
+
+    def import_bible_file(self, file_path, progress=None, translation=None):
+        """Import a Bible from any file type importers.IMPORTERS knows; True on success
+
+        The translation is named after the file unless translation is given;
+        importing under an existing name replaces that translation.
+        """
+        from importers import importer_for
+        try:
+            imported = importer_for(file_path).load(self, progress,
+                                                    translation or translation_name(file_path))
+        except Exception as e:
+            print(f"Error importing Bible: {e}")
+            return False
+        return imported > 0
+
+    def _close_corpus(self):
+        # Readers on other threads may still hold the old Corpus, so it is
+        # not closed here: the mapping is unmapped when the last of them
+        # drops it, and rebuilds write a new file beside it
+        with self._lock:
+            self._corpus = None
+
+    def _corpus_file(self):
+        """Path of the current translation's newest compiled corpus, or None"""
+        if not self.compile_corpus:
+            return None
+        return newest_corpus(self.db_path, self._translation_id())
+
+    def _rebuild_corpus(self, conn):
+        """Recompile the current translation's corpus file, or remove stale ones"""
+        if not self.compile_corpus:
+            return
+        translation_id = self._translation_id()
+        self._close_corpus()
+        id_range = self.translation_range()
+        keep = None
+        try:
+            if conn.execute("SELECT 1 FROM verses WHERE id BETWEEN ? AND ? LIMIT 1", id_range).fetchone():
+                path = next_corpus_path(self.db_path, translation_id)
+                build_corpus(conn, path, id_range)
+                keep = path
+        except (OSError, ValueError) as e:
+            print(f"Compiled corpus not built, using SQLite for verse text: {e}")
+        remove_corpora(self.db_path, translation_id, keep)
+
+    def get_corpus(self):
+        """Return the memory-mapped Corpus, or None if there is no usable one"""
+        if self._corpus is None:
+            corpus = False
+            path = self._corpus_file()
+            if path:
+                try:
+                    corpus = Corpus(path)
+                except (OSError, ValueError) as e:
+                    print(f"Ignoring compiled corpus: {e}")
+                else:
+                    # A corpus left from another database is not used
+                    count, max_id = self.connection().execute(
+                        "SELECT COUNT(*), MAX(id) FROM verses WHERE id BETWEEN ? AND ?",
+                        self.translation_range()).fetchone()
+                    if len(corpus) != count or (count and corpus.verse_at(count - 1)[0] != max_id):
+                        corpus.close()
+                        corpus = False
+            with self._lock:
+                if self._corpus is None:
+                    self._corpus = corpus
+                elif corpus:
+                    corpus.close()
+        return self._corpus or None
+
+    def count_verses(self):
+        """Count the verses of the current translation"""
+        cursor = self.connection().execute(
+            "SELECT COUNT(*) FROM verses WHERE id BETWEEN ? AND ?", self.translation_range())
+        return cursor.fetchone()[0]
+
+    def _random_pool(self, book, chapters, unmemorized, weighted):
+        """Return (ids, cum_weights) for a filter, cached until the data changes"""
+        key = (book, chapters, unmemorized, weighted)
+        pool = self._random_cache.get(key)
+        if pool is not None:
+            return pool
+
+        conn = self.connection()
+        sql = "SELECT v.id, v.progress FROM verses v WHERE v.id BETWEEN ? AND ?"
+        params = list(self.translation_range())
+        if book is not None:
+            sql += " AND v.book=?"
+            params.append(book)
+        if chapters is not None:
+            sql += " AND v.chapter BETWEEN ? AND ?"
+            params.extend(chapters)
+        if unmemorized:
+            sql += " AND NOT EXISTS (SELECT 1 FROM memorized_verses mv WHERE mv.ref = v.id & ?)"
+            params.append(REF_MASK)
+        rows = conn.execute(sql + " ORDER BY v.id", params).fetchall()
+
+        ids = array("q", (row[0] for row in rows))
+        cum_weights = None
+        if weighted:
+            # Verses with little progress are picked more often
+            cum_weights = list(itertools.accumulate(1.0 / (1 + max(row[1] or 0, 0)) for row in rows))
+        pool = (ids, cum_weights)
+        self._random_cache[key] = pool
+        return pool
+
+    def invalidate_random_cache(self):
+        """Forget cached id pools after verses or memorized verses change"""
+        self._random_cache.clear()
+
+    def get_random_verses(self, count=1, book=None, chapters=None, unmemorized=False, weighted=False):
+        """Get up to count distinct random verses as (book, chapter, verse, text)
+
+        book limits the pick to one book, chapters to an inclusive
+        (first, last) chapter range, unmemorized skips verses already in the
+        review list, and weighted favours verses with low progress.
+        """
+        corpus = self.get_corpus()
+        if corpus and not (book or chapters or unmemorized or weighted):
+            # Every verse of the corpus is a candidate, so pick array indexes
+            picked = random.sample(range(len(corpus)), min(count, len(corpus)))
+            return [corpus.verse_at(index)[1:] for index in picked]
+
+        ids, cum_weights = self._random_pool(book, tuple(chapters) if chapters else None,
+                                             unmemorized, weighted)
+        if not ids:
+            return []
+        count = min(count, len(ids))
+
+        if cum_weights is None:
+            picked = random.sample(ids, count)
+        else:
+            picked = []
+            seen = set()
+            # Rejection sampling keeps picks distinct; give up after enough
+            # attempts and top up uniformly when a few weights dominate
+            for _ in range(count * 20):
+                verse_id = random.choices(ids, cum_weights=cum_weights)[0]
+                if verse_id not in seen:
+                    seen.add(verse_id)
+                    picked.append(verse_id)
+                    if len(picked) == count:
+                        break
+            if len(picked) < count:
+                picked.extend(random.sample([i for i in ids if i not in seen], count - len(picked)))
+
+        if corpus:
+            indexes = (corpus.index_of_id(verse_id) for verse_id in picked)
+            return [corpus.verse_at(index)[1:] for index in indexes if index is not None]
+        placeholders = ",".join("?" * len(picked))
+        rows = self.connection().execute(
+            f"SELECT id, book, chapter, verse, text FROM verses WHERE id IN ({placeholders})",
+            picked).fetchall()
+        by_id = {row[0]: row[1:] for row in rows}
+        return [by_id[verse_id] for verse_id in picked if verse_id in by_id]
+
+    def get_random_verse(self, **filters):
+        """Get a random verse from the database"""
+        verses = self.get_random_verses(1, **filters)
+        if verses:
+            return verses[0]
+        if not filters and self.count_verses() == 0:
+            return ("No verses found", 0, 0, "Please import a Bible text file.")
+        return ("John", 3, 16, "For God so loved the world, that he gave his only begotten Son, that whosoever believeth in him should not perish, but have everlasting life.")
+
+    def get_verse_by_reference(self, book, chapter, verse):
+        """Get a specific verse by reference"""
+        corpus = self.get_corpus()
+        if corpus:
+            text = corpus.verse(book, chapter, verse)
+            return None if text is None else (book, chapter, verse, text)
+        cursor = self.connection().execute(
+            "SELECT book, chapter, verse, text FROM verses WHERE book=? AND chapter=? AND verse=? AND id BETWEEN ? AND ?",
+            (book, chapter, verse, *self.translation_range()))
+        return cursor.fetchone()
+
+    def book_number(self, book):
+        """Canonical number of a book name, or None for a book never imported"""
+        number = self._book_number
+        if number is None:
+            generation = self._generation
+            number = self._store_cache("_book_number", _book_numberer(self.connection(), allocate=False),
+                                       generation)
+        return number(book)
+
+    def reference(self, book, chapter, verse):
+        """Reference number the verse has in every translation, or None if it cannot have one"""
+        book_number = self.book_number(book)
+        if book_number is None:
+            return None
+        try:
+            return verse_ref(book_number, chapter, verse)
+        except ValueError:
+            return None
+
+    def save_memorized_verse(self, book, chapter, verse):
+        """Mark a verse as memorized and schedule it for spaced repetition"""
+        ref = self.reference(book, chapter, verse)
+        if ref is None:
+            return
+        conn = self.connection()
+        conn.execute("""
+            INSERT INTO memorized_verses
+                (book, chapter, verse, ref, verse_id, last_reviewed, ease_factor, interval, next_due)
+            VALUES (?, ?, ?, ?, (SELECT id FROM verses WHERE id = ?),
+                    CURRENT_TIMESTAMP, 2.5, 1, datetime('now', '+1 days'))
+            ON CONFLICT (ref) DO UPDATE
+            SET book=excluded.book,
+                chapter=excluded.chapter,
+                verse=excluded.verse,
+                verse_id=excluded.verse_id,
+                last_reviewed=excluded.last_reviewed,
+                ease_factor=2.5,
+                interval=1,
+                next_due=excluded.next_due""",
+            (book, chapter, verse, ref, self.translation_range()[0] + ref))
         conn.commit()
-        return True
-    except Exception as e:
-        print(f"Error importing Bible: {e}")
-        return False
-    finally:
-        conn.close()
+        self.invalidate_random_cache()
+
+    def get_verses_due_for_review(self, limit=10):
+        """Get verses that are due for review based on spaced repetition algorithm"""
+        cursor = self.connection().execute("""
+            SELECT mv.book, mv.chapter, mv.verse, v.text, mv.ease_factor, mv.interval
+            FROM memorized_verses mv
+            JOIN verses v ON v.id = mv.verse_id
+            WHERE mv.next_due <= datetime('now')
+            ORDER BY mv.next_due
+            LIMIT ?
+        """, (limit,))
+        return cursor.fetchall()
+
+    def get_due_queue(self, limit=None):
+        """Get (verse_id, book, chapter, verse, ease_factor, interval) for every due verse, most overdue first"""
+        cursor = self.connection().execute("""
+            SELECT mv.verse_id, mv.book, mv.chapter, mv.verse, mv.ease_factor, mv.interval
+            FROM memorized_verses mv
+            WHERE mv.next_due <= datetime('now') AND mv.verse_id IS NOT NULL
+            ORDER BY mv.next_due
+            LIMIT ?
+        """, (-1 if limit is None else limit,))
+        return cursor.fetchall()
+
+    def get_verse_texts(self, verse_ids):
+        """Get {verse_id: text} for a list of verse ids"""
+        if not verse_ids:
+            return {}
+        corpus = self.get_corpus()
+        if corpus:
+            indexes = ((verse_id, corpus.index_of_id(verse_id)) for verse_id in verse_ids)
+            return {verse_id: corpus.text(index) for verse_id, index in indexes if index is not None}
+        placeholders = ",".join("?" * len(verse_ids))
+        cursor = self.connection().execute(
+            f"SELECT id, text FROM verses WHERE id IN ({placeholders})", list(verse_ids))
+        return dict(cursor.fetchall())
+
+    def get_memorized_verses(self):
+        """Get (book, chapter, verse, text) for every memorized verse"""
+        cursor = self.connection().execute("""
+            SELECT mv.book, mv.chapter, mv.verse, v.text
+            FROM memorized_verses mv
+            JOIN verses v ON v.id = mv.verse_id
+            ORDER BY mv.verse_id
+        """)
+        return cursor.fetchall()
+
+    def get_review_status(self, book):
+        """Get {(chapter, verse): due} for the memorized verses of a book"""
+        book_number = self.book_number(book)
+        if book_number is None:
+            return {}
+        # Matched by reference, so verses memorized under another name of the book count too
+        cursor = self.connection().execute("""
+            SELECT ref, next_due <= datetime('now')
+            FROM memorized_verses
+            WHERE ref BETWEEN ? AND ?
+        """, (verse_ref(book_number, 1, 1), verse_ref(book_number, 999, 999)))
+        return {(ref // 1000 % 1000, ref % 1000): bool(due) for ref, due in cursor}
+
+    def update_spaced_repetition(self, book, chapter, verse, quality):
+        """Update spaced repetition parameters based on performance quality (0-5)"""
+        conn = self.connection()
+
+        # Get current parameters
+        result = conn.execute("""
+            SELECT id, ease_factor, interval
+            FROM memorized_verses
+            WHERE ref=?
+        """, (self.reference(book, chapter, verse),)).fetchone()
+
+        if result:
+            row_id, ease_factor, interval = result
+            ease_factor, interval = sm2(ease_factor, interval, quality)
+
+            # Update the database
+            conn.execute("""
+                UPDATE memorized_verses
+                SET ease_factor=?, interval=?, last_reviewed=CURRENT_TIMESTAMP,
+                    next_due=datetime('now', '+' || ? || ' days')
+                WHERE id=?
+            """, (ease_factor, interval, interval, row_id))
+
+            conn.commit()
+
+    def get_outline(self):
+        """Get the current translation's BibleOutline, loading it once and again after each import"""
+        outline = self._outline
+        if outline is None:
+            generation = self._generation
+            outline = self._store_cache("_outline", BibleOutline(self.connection().execute("""
+                SELECT book, chapter, verse_count, first_verse, last_verse, first_id, verse_list
+                FROM outline
+                WHERE translation_id=?
+                ORDER BY book_order, chapter""", (self._translation_id(),))), generation)
+        return outline
+
+    def get_book_index(self):
+        """Get the BookIndex that resolves typed book names for the current outline"""
+        # Compiling the reference patterns is left out of startup
+        from references import BookIndex
+        outline = self.get_outline()
+        if self._book_index is None or self._book_index.outline is not outline:
+            self._book_index = BookIndex(outline)
+        return self._book_index
+
+    def get_passages(self, passages):
+        """Get [(book, chapter, verse, text)] for each Passage
+
+        Each passage is one contiguous range of verse ids, read with a single
+        range scan (or straight from the compiled corpus).
+        """
+        from references import passage_ids
+        outline = self.get_outline()
+        corpus = self.get_corpus()
+        results = []
+        for passage in passages:
+            span = passage_ids(outline, passage)
+            if span is None:
+                results.append([])
+            elif corpus:
+                first, last = corpus.index_of_id(span[0]), corpus.index_of_id(span[1])
+                rows = [] if first is None or last is None else (
+                    corpus.verse_at(index)[1:] for index in range(first, last + 1))
+                results.append([row for row in rows if row[0] == passage.book])
+            else:
+                results.append(self.connection().execute(
+                    "SELECT book, chapter, verse, text FROM verses WHERE id BETWEEN ? AND ? AND book=? ORDER BY id",
+                    (span[0], span[1], passage.book)).fetchall())
+        return results
+
+    def lookup_references(self, text):
+        """Parse references like "Jn 3:16-18; Ps 23" and get [(Passage, rows)]
+
+        Raises ValueError if text is not a reference.
+        """
+        from references import parse_references
+        passages = parse_references(text, self.get_book_index())
+        return list(zip(passages, self.get_passages(passages)))
+
+    def get_books(self):
+        """Get list of all books in the Bible"""
+        return self.get_outline().books()
+
+    def get_chapters_for_book(self, book):
+        """Get all chapters for a specific book"""
+        return self.get_outline().chapters(book)
+
+    def get_verses_for_chapter(self, book, chapter):
+        """Get all verses for a specific chapter in a book"""
+        corpus = self.get_corpus()
+        if corpus:
+            return corpus.chapter(book, chapter)
+        cursor = self.connection().execute(
+            "SELECT verse, text FROM verses WHERE book=? AND chapter=? AND id BETWEEN ? AND ? ORDER BY verse",
+            (book, chapter, *self.translation_range()))
+        return cursor.fetchall()
+
+    def search(self, query, limit=20, offset=0):
+        """Search the current translation's verse text, best matches first
+
+        Returns SearchResults(occurrences, verse_count, rows) where rows are
+        (book, chapter, verse, text, snippet) for at most limit verses and
+        snippet marks the matched words with <b> tags.
+        """
+        parsed = _fts_query(query)
+        if parsed is None:
+            return SearchResults(0, 0, [])
+        if not self.has_fts():
+            return self._search_like(parsed, limit, offset)
+
+        expression, terms, kind = parsed
+        conn = self.connection()
+        # The index covers every translation; a rowid range keeps one
+        first, last = self.translation_range()
+        verse_count = conn.execute(
+            "SELECT COUNT(*) FROM verses_fts WHERE verses_fts MATCH ? AND rowid BETWEEN ? AND ?",
+            (expression, first, last)).fetchone()[0]
+        if verse_count == 0:
+            return SearchResults(0, 0, [])
+
+        rows = conn.execute("""
+            SELECT v.book, v.chapter, v.verse, v.text,
+                   snippet(verses_fts, 0, '<b>', '</b>', '...', 16)
+            FROM verses_fts
+            JOIN verses v ON v.id = verses_fts.rowid
+            WHERE verses_fts MATCH ? AND verses_fts.rowid BETWEEN ? AND ?
+            ORDER BY rank
+            LIMIT ? OFFSET ?
+        """, (expression, first, last, -1 if limit is None else limit, offset)).fetchall()
+
+        # Single words and prefixes are counted straight from the word
+        # counts; multi-word queries count matches in the matching verses
+        if kind == "word":
+            occurrences = self.word_count(terms[0])[0]
+        elif kind == "prefix":
+            prefix = terms[0]
+            occurrences = conn.execute("""
+                SELECT COALESCE(SUM(occurrences), 0) FROM word_counts
+                WHERE translation_id=? AND book='' AND chapter=0 AND word >= ? AND word < ?""",
+                (self._translation_id(), prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1))).fetchone()[0]
+        else:
+            texts = (text for text, in conn.execute("""
+                SELECT v.text FROM verses_fts JOIN verses v ON v.id = verses_fts.rowid
+                WHERE verses_fts MATCH ? AND verses_fts.rowid BETWEEN ? AND ?""", (expression, first, last)))
+            occurrences = _count_occurrences(texts, terms, kind)
+
+        return SearchResults(occurrences, verse_count, rows)
+
+    def _search_like(self, parsed, limit, offset):
+        """Fallback search for SQLite builds without FTS5"""
+        expression, terms, kind = parsed
+        pattern = "%" + ("%".join(terms) if kind == "phrase" else terms[0]) + "%"
+        matches = []
+        for book, chapter, verse, text in self.connection().execute(
+                "SELECT book, chapter, verse, text FROM verses WHERE text LIKE ? AND id BETWEEN ? AND ? ORDER BY id",
+                (pattern, *self.translation_range())):
+            found = _count_occurrences([text], terms, kind)
+            if kind == "all":
+                found = found if all(_count_occurrences([text], [t], kind) for t in terms) else 0
+            if found:
+                matches.append((found, (book, chapter, verse, text, text)))
+        rows = [row for _, row in matches]
+        end = None if limit is None else offset + limit
+        return SearchResults(sum(found for found, _ in matches), len(matches), rows[offset:end])
+
+    def word_count(self, word):
+        """(occurrences, verses) of a word in the current translation"""
+        if not self.has_fts():
+            occurrences, verses, _ = self.search(f'"{word}"', limit=0)
+            return occurrences, verses
+        row = self.connection().execute("""
+            SELECT occurrences, verses FROM word_counts
+            WHERE translation_id=? AND book='' AND chapter=0 AND word=?""",
+            (self._translation_id(), remove_diacritics(word.lower()))).fetchone()
+        return row or (0, 0)
+
+    def top_words(self, book=None, chapter=None, limit=TOP_WORDS):
+        """Get [(word, occurrences, verses)] for the most frequent words, most frequent first
+
+        Counts are for a chapter, a book, or with neither the whole translation.
+        """
+        return self.connection().execute("""
+            SELECT word, occurrences, verses FROM word_counts
+            WHERE translation_id=? AND book=? AND chapter=?
+            ORDER BY occurrences DESC, word
+            LIMIT ?""", (self._translation_id(), book or "", chapter or 0,
+                         -1 if limit is None else limit)).fetchall()
+
+    def get_concordance(self, word, after=0, limit=CONCORDANCE_PAGE):
+        """Get (verse_id, book, chapter, verse, text, positions) for the verses containing word
+
+        Rows come in verse order, starting after the verse id after, so a
+        page continues from the last verse_id of the one before it.
+        positions are the word's indexes among the words of the verse.
+        """
+        if not self.has_fts():
+            return []
+        first, last = self.translation_range()
+        return verses_with(self.connection(), remove_diacritics(word.lower()), (max(first, after + 1), last), limit)
+
+    def get_fuzzy_index(self):
+        """Get the fuzzy.FuzzyIndex of the current translation's words, built once per import"""
+        generation = self._generation
+        translation_id = self._translation_id()
+        fuzzy = self._fuzzy
+        if fuzzy is None or fuzzy[0] != translation_id:
+            from fuzzy import FuzzyIndex
+            # Most frequent first, so ties go to the commoner word
+            fuzzy = self._store_cache("_fuzzy", (translation_id, FuzzyIndex(
+                word for word, _, _ in self.top_words(limit=None))), generation)
+        return fuzzy[1]
+
+    def suggest_words(self, word, limit=5):
+        """Words of the current translation within a few edits of word, closest first"""
+        return [match for _, match in self.get_fuzzy_index().matches(word.lower(), limit=limit)]
+
+    def did_you_mean(self, query):
+        """A corrected query for one that found nothing, or None
+
+        A single word that is not in the text but is close to a book name
+        becomes a reference to the book's first chapter; otherwise unknown
+        words are replaced by their closest known word.
+        """
+        parsed = _fts_query(query)
+        if parsed is None or parsed[2] == "prefix":
+            return None
+        terms = parsed[1]
+        index = self.get_fuzzy_index()
+        unknown = [term for term in terms if term not in index]
+        if len(terms) == 1 and unknown:
+            book = self.get_book_index().resolve(terms[0])
+            if book:
+                return f"{book} {self.get_outline().chapters(book)[0]}"
+        corrections = {term: index.correct(term) for term in unknown}
+        corrections = {term: word for term, word in corrections.items() if word}
+        if not corrections:
+            return None
+        return TOKEN_PATTERN.sub(lambda match: corrections.get(match.group().lower(), match.group()), query)
+
+    def backup_progress(self, dest_path):
+        """Copy the progress database to dest_path while it stays in use"""
+        self._backup("main", dest_path)
+
+    def backup_corpus(self, dest_path):
+        """Copy the verse database to dest_path (the same file without a separate profile)"""
+        self._backup(self._corpus_schema, dest_path)
+
+    def _backup(self, schema, dest_path):
+        ensure_data_dir(dest_path)
+        dest = sqlite3.connect(dest_path)
+        try:
+            self.connection().backup(dest, name=schema)
+        finally:
+            dest.close()
+
+    def search_word(self, word, limit=None):
+        """Search for a word in the Bible and return (occurrences, verses containing it)"""
+        occurrences, _, rows = self.search(word, limit)
+        return occurrences, [row[:4] for row in rows]
+
+# Timed when profiling is on; the connection is used to explain slow calls
+profiler.register(VerseStore, "db", connection=lambda store: store.connection(),
+                  exclude=("connection", "close", "close_all", "invalidate_random_cache"))
+
+# Shared store used by the module-level functions below
+_store = VerseStore(progress_path=profile_path(DEFAULT_PROFILE))
+
+def get_store():
+    """Return the shared VerseStore used by the module-level functions"""
+    return _store
+
+def configure(db_path=DB_PATH, **kwargs):
+    """Point the module-level functions at a different database"""
+    global _store
+    _store.close_all()
+    _store = VerseStore(db_path, **kwargs)
+    return _store
+
+def switch_profile(name):
+    """Point the module-level functions at another profile's progress, sharing the corpus
+
+    Returns what init_db does: the memorized verses moved into the profile.
+    """
+    store = configure(_store.db_path, progress_path=profile_path(name, _store.db_path),
+                      translation=_store.translation)
+    return store.init_db()
+
+def init_db():
+    return _store.init_db()
+
+def release_connection():
+    """Close the calling thread's connection, e.g. at the end of a worker job"""
+    _store.close()
+
+def import_bible_from_text(file_path, progress=None, translation=None):
+    """Import Bible verses from a text file into the database"""
+    return _store.import_bible_from_text(file_path, progress, translation=translation)
+
+def import_bible_file(file_path, progress=None, translation=None):
+    """Import a Bible from a .txt, .pdf or SQLite file as a translation"""
+    return _store.import_bible_file(file_path, progress, translation)
+
+def get_translations():
+    """Names of the imported translations"""
+    return _store.get_translations()
+
+def current_translation():
+    """Name of the translation reads and tests use"""
+    return _store.current_translation()
+
+def use_translation(name):
+    """Read and test against another imported translation"""
+    _store.use_translation(name)
+
+def get_parallel(book, chapter, verse):
+    """Get [(translation, text)] for a verse in every translation"""
+    return _store.get_parallel(book, chapter, verse)
+
+def suggest_words(word, limit=5):
+    """Known words within a few edits of a misspelled word"""
+    return _store.suggest_words(word, limit)
+
+def did_you_mean(query):
+    """A corrected query for one that found nothing, or None"""
+    return _store.did_you_mean(query)
+
+def word_count(word):
+    """(occurrences, verses) of a word in the current translation"""
+    return _store.word_count(word)
+
+def top_words(book=None, chapter=None, limit=TOP_WORDS):
+    """Most frequent words of a chapter, a book or the whole translation"""
+    return _store.top_words(book, chapter, limit)
+
+def get_concordance(word, after=0, limit=CONCORDANCE_PAGE):
+    """Get a page of the verses containing word, with the word's positions"""
+    return _store.get_concordance(word, after, limit)
 
 def count_verses():
     """Count total number of verses in the database"""
-    conn = sqlite3.connect("data/bible_memory.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT COUNT(*) FROM verses")
-    count = cursor.fetchone()[0]
-    conn.close()
-    return count
+    return _store.count_verses()
 
-def get_random_verse():
+def get_random_verse(**filters):
     """Get a random verse from the database"""
-    conn = sqlite3.connect("data/bible_memory.db")
-    cursor = conn.cursor()
-    
-    # Check if there are any verses in the database
-    cursor.execute("SELECT COUNT(*) FROM verses")
-    count = cursor.fetchone()[0]
-    
-    if count == 0:
-        conn.close()
-        return ("No verses found", 0, 0, "Please import a Bible text file.")
-    
-    # Get a random verse
-    cursor.execute("SELECT book, chapter, verse, text FROM verses ORDER BY RANDOM() LIMIT 1")
-    result = cursor.fetchone()
-    conn.close()
-    
-    # Return the verse or a default if none found
-    if result:
-        return result
-    else:
-        return ("John", 3, 16, "For God so loved the world, that he gave his only begotten Son, that whosoever believeth in him should not perish, but have everlasting life.")
+    return _store.get_random_verse(**filters)
+
+def get_random_verses(count=1, **filters):
+    """Get up to count distinct random verses, e.g. to prefetch"""
+    return _store.get_random_verses(count, **filters)
 
 def get_verse_by_reference(book, chapter, verse):
     """Get a specific verse by reference"""
-    conn = sqlite3.connect("data/bible_memory.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT book, chapter, verse, text FROM verses WHERE book=? AND chapter=? AND verse=?", 
-                  (book, chapter, verse))
-    result = cursor.fetchone()
-    conn.close()
-    return result
+    return _store.get_verse_by_reference(book, chapter, verse)
 
 def save_memorized_verse(book, chapter, verse):
     """Mark a verse as memorized and schedule it for spaced repetition"""
-    conn = sqlite3.connect("data/bible_memory.db")
-    cursor = conn.cursor()
-    
-    # Check if verse already exists in memorized_verses
-    cursor.execute("SELECT id FROM memorized_verses WHERE book=? AND chapter=? AND verse=?",
-                  (book, chapter, verse))
-    existing = cursor.fetchone()
-    
-    if existing:
-        # Update existing record
-        cursor.execute("""
-            UPDATE memorized_verses 
-            SET last_reviewed=CURRENT_TIMESTAMP, 
-                ease_factor=2.5, 
-                interval=1 
-            WHERE id=?""", (existing[0],))
-    else:
-        # Insert new record
-        cursor.execute("""
-            INSERT INTO memorized_verses (book, chapter, verse) 
-            VALUES (?, ?, ?)""", (book, chapter, verse))
-    
-    conn.commit()
-    conn.close()
+    _store.save_memorized_verse(book, chapter, verse)
 
 def get_verses_due_for_review(limit=10):
     """Get verses that are due for review based on spaced repetition algorithm"""
-    conn = sqlite3.connect("data/bible_memory.db")
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT mv.book, mv.chapter, mv.verse, v.text, mv.ease_factor, mv.interval
-        FROM memorized_verses mv
-        JOIN verses v ON mv.book = v.book AND mv.chapter = v.chapter AND mv.verse = v.verse
-        WHERE julianday('now') - julianday(mv.last_reviewed) >= mv.interval
-        ORDER BY julianday('now') - julianday(mv.last_reviewed) - mv.interval DESC
-        LIMIT ?
-    """, (limit,))
-    
-    results = cursor.fetchall()
-    conn.close()
-    return results
+    return _store.get_verses_due_for_review(limit)
+
+def get_review_status(book):
+    """Get {(chapter, verse): due} for the memorized verses of a book"""
+    return _store.get_review_status(book)
 
 def update_spaced_repetition(book, chapter, verse, quality):
     """Update spaced repetition parameters based on performance quality (0-5)"""
-    conn = sqlite3.connect("data/bible_memory.db")
-    cursor = conn.cursor()
-    
-    # Get current parameters
-    cursor.execute("""
-        SELECT ease_factor, interval 
-        FROM memorized_verses 
-        WHERE book=? AND chapter=? AND verse=?
-    """, (book, chapter, verse))
-    
-    result = cursor.fetchone()
-    if result:
-        ease_factor, interval = result
-        
-        # Update based on SM-2 algorithm
-        ease_factor = max(1.3, ease_factor + (0.1 - (5-quality) * (0.08 + (5-quality) * 0.02)))
-        
-        if quality < 3:
-            interval = 1  # Reset interval if quality is poor
-        elif interval == 1:
-            interval = 6  # First successful recall
-        else:
-            interval = int(interval * ease_factor)  # Increase interval based on ease factor
-        
-        # Update the database
-        cursor.execute("""
-            UPDATE memorized_verses 
-            SET ease_factor=?, interval=?, last_reviewed=CURRENT_TIMESTAMP 
-            WHERE book=? AND chapter=? AND verse=?
-        """, (ease_factor, interval, book, chapter, verse))
-        
-        conn.commit()
-    
-    conn.close()
+    _store.update_spaced_repetition(book, chapter, verse, quality)
+
+def get_outline():
+    """Get the in-memory book/chapter/verse outline"""
+    return _store.get_outline()
+
+def lookup_references(text):
+    """Get [(Passage, rows)] for references like "Jn 3:16-18; Ps 23" """
+    return _store.lookup_references(text)
 
 def get_books():
     """Get list of all books in the Bible"""
-    conn = sqlite3.connect("data/bible_memory.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT DISTINCT book FROM verses ORDER BY id")
-    books = [row[0] for row in cursor.fetchall()]
-    conn.close()
-    return books
+    return _store.get_books()
 
 def get_chapters_for_book(book):
     """Get all chapters for a specific book"""
-    conn = sqlite3.connect("data/bible_memory.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT DISTINCT chapter FROM verses WHERE book=? ORDER BY chapter", (book,))
-    chapters = [row[0] for row in cursor.fetchall()]
-    conn.close()
-    return chapters
+    return _store.get_chapters_for_book(book)
 
 def get_verses_for_chapter(book, chapter):
     """Get all verses for a specific chapter in a book"""
-    conn = sqlite3.connect("data/bible_memory.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT verse, text FROM verses WHERE book=? AND chapter=? ORDER BY verse", 
-                  (book, chapter))
-    verses = cursor.fetchall()
-    conn.close()
-    return verses
+    return _store.get_verses_for_chapter(book, chapter)
 
 def get_top_memory_verses():
     """Get one of the top 300 most quoted Bible verses"""
@@ -246,28 +1458,14 @@ def get_top_memory_verses():
         ("Romans", 8, 28, "And we know that all things work together for good..."),
         # Add more verses here or load from a file/database
     ]
-    
+
     # Return a random verse from the top memory verses
-    import random
     return random.choice(top_memory_verses)
 
-def search_word(word):
-    """Search for a word in the Bible and return verses containing it"""
-    conn = sqlite3.connect("data/bible_memory.db")
-    cursor = conn.cursor()
-    
-    search_term = f"%{word}%"
-    cursor.execute("""
-        SELECT book, chapter, verse, text 
-        FROM verses 
-        WHERE text LIKE ? 
-        ORDER BY id
-    """, (search_term,))
-    
-    results = cursor.fetchall()
-    
-    # Count occurrences (this is simplified - in a real app would count actual word occurrences)
-    count = len(results)
-    
-    conn.close()
-    return count, results
+def search_verses(query, limit=20, offset=0):
+    """Full-text search returning SearchResults(occurrences, verse_count, rows)"""
+    return _store.search(query, limit, offset)
+
+def search_word(word, limit=None):
+    """Search for a word in the Bible and return (occurrences, verses containing it)"""
+    return _store.search_word(word, limit)
@@ -0,0 +1,82 @@
+# fuzzy.py
+"""Typo-tolerant lookup of words by edit distance, through a trigram index
+
+Each word is indexed under the trigrams of its padded form ("  word "),
+so "beleive" and "believe" share "  b", " be", "bel" and "ve ". A lookup
+counts the trigrams each word shares with the query and only measures
+the edit distance of words that share enough of them to be within reach,
+which keeps it to a few milliseconds over a whole Bible's vocabulary.
+"""
+from collections import Counter
+
+def trigrams(word):
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def max_distance_for(word):
+    """Edits tolerated in a word of this length: none for very short words"""
+    if len(word) <= 2:
+        return 0
+    return 1 if len(word) <= 5 else 2
+
+def edit_distance(a, b, limit):
+    """Edit distance of a and b counting a swap of neighbours as one edit, or limit + 1 if over limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = None
+    row = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        before, previous, row = previous, row, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            row[j] = min(previous[j] + 1, row[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                row[j] = min(row[j], before[j - 2] + 1)
+        if min(row) > limit:
+            return limit + 1
+    return row[-1]
+
+class FuzzyIndex:
+    """Find the words of a vocabulary within a few edits of a misspelling
+
+    words are given most preferred first (e.g. most frequent); among
+    matches at the same distance the earlier word wins.
+    """
+
+    def __init__(self, words):
+        self.words = list(dict.fromkeys(words))
+        self._rank = {word: rank for rank, word in enumerate(self.words)}
+        self._postings = {}
+        for rank, word in enumerate(self.words):
+            for gram in trigrams(word):
+                self._postings.setdefault(gram, []).append(rank)
+
+    def __contains__(self, word):
+        return word in self._rank
+
+    def matches(self, word, max_distance=None, limit=5):
+        """Get [(distance, word)] for the closest words, closest first"""
+        if max_distance is None:
+            max_distance = max_distance_for(word)
+        grams = trigrams(word)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+        found = []
+        for rank, count in shared.items():
+            candidate = self.words[rank]
+            # One edit changes at most four trigrams (a swap of neighbours)
+            if count < max(len(grams), len(candidate) + 1) - 4 * max_distance:
+                continue
+            distance = edit_distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                found.append((distance, rank))
+        found.sort()
+        return [(distance, self.words[rank]) for distance, rank in found[:limit]]
+
+    def correct(self, word):
+        """The word itself if known, else the closest word within reach, else None"""
+        if word in self._rank:
+            return word
+        found = self.matches(word, limit=1)
+        return found[0][1] if found else None
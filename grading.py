@@ -0,0 +1,156 @@
+# grading.py
+import html
+from collections import namedtuple
+
+EQUAL, MISSPELLED, WRONG, MISSING, EXTRA = "equal", "misspelled", "wrong", "missing", "extra"
+
+# (op, verse word, typed word); one of the words is None for MISSING/EXTRA
+Grade = namedtuple("Grade", ["ops", "accuracy", "quality"])
+
+MISSPELLED_COST = 0.5
+
+def normalize_word(word):
+    """Lower-case a word and drop punctuation, as the answer check always has"""
+    return ''.join(c.lower() for c in word if c.isalnum())
+
+def tokenize(text):
+    """Split text into (words, normalized tokens), skipping bare punctuation"""
+    pairs = [(word, normalize_word(word)) for word in text.split()]
+    pairs = [(word, token) for word, token in pairs if token]
+    return [word for word, _ in pairs], [token for _, token in pairs]
+
+def edit_distance(a, b, limit):
+    """Character Levenshtein distance, or limit + 1 once it is known to exceed limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+def quality_for(accuracy):
+    """Map the share of correctly recalled words to an SM-2 quality (0-5)"""
+    for threshold, quality in ((0.98, 5), (0.9, 4), (0.75, 3), (0.5, 2), (0.25, 1)):
+        if accuracy >= threshold:
+            return quality
+    return 0
+
+class AnswerGrader:
+    """Word-level alignment of a typed answer against one verse
+
+    The verse is tokenised once. Alignment rows are kept per typed word, so
+    when the answer changes only the rows after the first changed word are
+    recomputed; typing at the end costs one row per keystroke.
+    """
+
+    def __init__(self, verse_text):
+        self.verse_words, self.verse_tokens = tokenize(verse_text)
+        self._typed_tokens = []
+        self._typed_words = []
+        self._rows = [[float(j) for j in range(len(self.verse_tokens) + 1)]]
+        self._costs = {}
+        self._letters = {token: frozenset(token) for token in self.verse_tokens}
+
+    def _substitution_cost(self, typed, expected):
+        if typed == expected:
+            return 0.0
+        key = (typed, expected)
+        cost = self._costs.get(key)
+        if cost is None:
+            limit = max(1, len(expected) // 4)
+            # Each edit changes at most two letters of the letter sets, which
+            # rules out most pairs without running the full distance
+            if (abs(len(typed) - len(expected)) > limit
+                    or len(self._letters[expected].symmetric_difference(typed)) > 2 * limit):
+                cost = 1.0
+            else:
+                cost = MISSPELLED_COST if edit_distance(typed, expected, limit) <= limit else 1.0
+            self._costs[key] = cost
+        return cost
+
+    def _next_row(self, previous, typed):
+        row = [previous[0] + 1]
+        for j, expected in enumerate(self.verse_tokens, 1):
+            row.append(min(previous[j - 1] + self._substitution_cost(typed, expected),
+                           previous[j] + 1,    # extra typed word
+                           row[j - 1] + 1))    # verse word left out
+        return row
+
+    def _align(self, user_text):
+        words, tokens = tokenize(user_text)
+        # Reuse rows for the unchanged leading words
+        keep = 0
+        for old, new in zip(self._typed_tokens, tokens):
+            if old != new:
+                break
+            keep += 1
+        del self._rows[keep + 1:]
+        for typed in tokens[keep:]:
+            self._rows.append(self._next_row(self._rows[-1], typed))
+        self._typed_tokens = tokens
+        self._typed_words = words
+
+    def _backtrace(self, end):
+        ops = []
+        i, j = len(self._typed_tokens), end
+        while i or j:
+            cost = self._rows[i][j]
+            if i and j:
+                sub = self._substitution_cost(self._typed_tokens[i - 1], self.verse_tokens[j - 1])
+                if cost == self._rows[i - 1][j - 1] + sub:
+                    op = EQUAL if sub == 0 else MISSPELLED if sub == MISSPELLED_COST else WRONG
+                    ops.append((op, self.verse_words[j - 1], self._typed_words[i - 1]))
+                    i -= 1
+                    j -= 1
+                    continue
+            if i and cost == self._rows[i - 1][j] + 1:
+                ops.append((EXTRA, None, self._typed_words[i - 1]))
+                i -= 1
+            else:
+                ops.append((MISSING, self.verse_words[j - 1], None))
+                j -= 1
+        ops.reverse()
+        return ops
+
+    def grade(self, user_text, partial=False):
+        """Align user_text with the verse and return a Grade
+
+        With partial, the answer is compared with the best-matching start
+        of the verse, for feedback while the user is still typing.
+        """
+        self._align(user_text)
+        last = self._rows[-1]
+        end = min(range(len(last)), key=last.__getitem__) if partial else len(last) - 1
+        ops = self._backtrace(end)
+        expected = end if partial else len(self.verse_tokens)
+        if not expected:
+            return Grade(ops, 1.0 if not self._typed_tokens else 0.0, 0)
+        matched = sum(1.0 if op == EQUAL else 0.5 if op == MISSPELLED else 0.0 for op, _, _ in ops)
+        extra = sum(1 for op, _, _ in ops if op == EXTRA)
+        accuracy = max(0.0, (matched - extra * 0.5) / expected)
+        return Grade(ops, accuracy, quality_for(accuracy))
+
+    def is_exact(self, grade):
+        """True if every verse word was typed correctly and nothing else"""
+        return all(op == EQUAL for op, _, _ in grade.ops) and len(grade.ops) == len(self.verse_tokens)
+
+def format_feedback(grade):
+    """Render a Grade as HTML: misspelled in orange, wrong or missing in red, extra struck out"""
+    parts = []
+    for op, expected, typed in grade.ops:
+        if op == EQUAL:
+            parts.append(html.escape(typed))
+        elif op == MISSPELLED:
+            parts.append(f"<span style='color:#d08000'>{html.escape(typed)}</span>")
+        elif op == WRONG:
+            parts.append(f"<span style='color:#c00000'>{html.escape(typed)}</span>")
+        elif op == MISSING:
+            parts.append(f"<span style='color:#c00000'>{'_' * len(expected)}</span>")
+        else:
+            parts.append(f"<s>{html.escape(typed)}</s>")
+    return " ".join(parts)
@@ -0,0 +1,217 @@
+# importers.py
+"""Importers that load a Bible file into a VerseStore
+
+Each importer reads one kind of file and hands the verses to the store's
+bulk import path as one translation, so every format gets the same single
+transaction, rebuilt indexes and progress reporting. IMPORTERS maps file extensions to
+importer classes; decorate a class with register_importer to add one.
+"""
+import itertools
+import os
+import re
+import sqlite3
+import pathlib
+from collections import deque
+
+PDF_BATCH_PAGES = 16
+VERSE_COLUMNS = {"book", "chapter", "verse", "text"}
+# Tables of the widely shared bible_databases collection: t_kjv(id, b, c, v, t)
+NUMBERED_TABLE = re.compile(r"^t_\w+$", re.IGNORECASE)
+
+IMPORTERS = {}
+
+def register_importer(cls):
+    """Class decorator that makes an importer available for its extensions"""
+    for extension in cls.extensions:
+        IMPORTERS[extension] = cls
+    return cls
+
+def importer_for(file_path):
+    """An importer for a file, chosen by its extension"""
+    extension = os.path.splitext(file_path)[1].lower()
+    cls = IMPORTERS.get(extension)
+    if cls is None:
+        raise ValueError(f"Unsupported file type '{extension}'")
+    return cls(file_path)
+
+def file_filter():
+    """Filter string for a file dialog listing every importable file type"""
+    patterns = " ".join(f"*{extension}" for extension in IMPORTERS)
+    filters = [f"Bible Files ({patterns})"]
+    for cls in dict.fromkeys(IMPORTERS.values()):
+        filters.append(f"{cls.name} ({' '.join('*' + extension for extension in cls.extensions)})")
+    return ";;".join(filters)
+
+@register_importer
+class TextImporter:
+    """Verses from a text file with one "Book Chapter:Verse Text" line each"""
+
+    name = "Text Files"
+    extensions = (".txt",)
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        from verse_parser import ParseStats
+        self.stats = ParseStats()
+
+    def load(self, store, progress=None, translation=None):
+        from database import count_lines
+        from verse_parser import parse_file
+        return store.bulk_import(parse_file(self.file_path, self.stats), progress=progress,
+                                 total=count_lines(self.file_path), translation=translation)
+
+_pdf_reader = None
+
+def _open_pdf(file_path):
+    """Open the PDF once in each worker process"""
+    global _pdf_reader
+    from pypdf import PdfReader
+    _pdf_reader = PdfReader(file_path)
+
+def _parse_pages(start, end):
+    """Extract and parse pages [start, end) of the worker's PDF"""
+    from verse_parser import parse_wrapped_lines
+    lines = []
+    for number in range(start, end):
+        lines.extend((_pdf_reader.pages[number].extract_text() or "").splitlines())
+    leading, records, dropped = parse_wrapped_lines(lines)
+    # Plain tuples pickle smaller than namedtuples
+    return leading, [tuple(record) for record in records], dropped, len(lines)
+
+@register_importer
+class PdfImporter:
+    """Verses from the text layer of a PDF, parsed in page batches by worker processes
+
+    Pages are extracted and parsed in parallel, PDF_BATCH_PAGES at a time,
+    and the batches are put back in page order as they finish. Only a few
+    batches per worker are in flight at once, so memory use does not grow
+    with the size of the file. Needs pypdf.
+    """
+
+    name = "PDF Files"
+    extensions = (".pdf",)
+
+    def __init__(self, file_path, batch_pages=PDF_BATCH_PAGES, max_workers=None):
+        self.file_path = file_path
+        self.batch_pages = batch_pages
+        self.max_workers = max_workers or os.cpu_count() or 1
+        from verse_parser import ParseStats
+        self.stats = ParseStats()
+
+    def page_count(self):
+        try:
+            from pypdf import PdfReader
+        except ImportError:
+            raise ValueError("Importing PDF files needs pypdf (pip install pypdf)")
+        return len(PdfReader(self.file_path).pages)
+
+    def rows(self, progress=None):
+        """Yield VerseRecords in page order; progress(pages done, pages) per batch"""
+        from concurrent.futures import ProcessPoolExecutor
+        from verse_parser import VerseRecord
+
+        pages = self.page_count()
+        batches = ((start, min(start + self.batch_pages, pages))
+                   for start in range(0, pages, self.batch_pages))
+        # The last verse of a batch may continue on the next batch's first page
+        held = None
+        with ProcessPoolExecutor(self.max_workers, initializer=_open_pdf,
+                                 initargs=(self.file_path,)) as pool:
+            futures = deque((end, pool.submit(_parse_pages, start, end))
+                            for start, end in itertools.islice(batches, self.max_workers * 2))
+            while futures:
+                done, future = futures.popleft()
+                for start, end in itertools.islice(batches, 1):
+                    futures.append((end, pool.submit(_parse_pages, start, end)))
+                leading, records, dropped, lines = future.result()
+                self.stats.lines += lines
+                self.stats.skipped += dropped
+                if leading:
+                    if held:
+                        held = held._replace(text=f"{held.text} {leading}")
+                    else:
+                        self.stats.skipped += 1  # Title pages before the first verse
+                if records:
+                    if held:
+                        yield held
+                    for record in records[:-1]:
+                        yield VerseRecord(*record)
+                    held = VerseRecord(*records[-1])
+                    self.stats.processed += len(records)
+                if progress:
+                    progress(done, pages)
+        if held:
+            yield held
+
+    def load(self, store, progress=None, translation=None):
+        return store.bulk_import(self.rows(progress), translation=translation)
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+@register_importer
+class SqliteImporter:
+    """Verses copied from another SQLite Bible database with ATTACH and INSERT ... SELECT
+
+    Two layouts are recognized: a table with book, chapter, verse and text
+    columns, with books given by name or by number in canon order (this
+    app's own databases and many exports), and the t_<version>(b, c, v, t)
+    tables with a key_english book-name table of the bible_databases
+    collection. The copy runs inside SQLite one book at a time.
+    """
+
+    name = "SQLite Bibles"
+    extensions = (".sqlite", ".sqlite3", ".db")
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+
+    def selects(self):
+        """(sql, params) for each book, reading from the database attached as "source" """
+        uri = pathlib.Path(os.path.abspath(self.file_path)).as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True)
+        try:
+            tables = [name for (name,) in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name <> 'verses', name")]
+            for table in tables:
+                columns = {row[1].lower() for row in conn.execute(f"PRAGMA table_info({_quote(table)})")}
+                if VERSE_COLUMNS <= columns and self._has_rows(conn, table):
+                    return self._verse_table_selects(conn, table)
+            if "key_english" in tables:
+                for table in tables:
+                    columns = {row[1].lower() for row in conn.execute(f"PRAGMA table_info({_quote(table)})")}
+                    if (NUMBERED_TABLE.match(table) and {"b", "c", "v", "t"} <= columns
+                            and self._has_rows(conn, table)):
+                        return self._numbered_table_selects(conn, table)
+        finally:
+            conn.close()
+        raise ValueError(f"No table of verses found in {self.file_path}")
+
+    def _has_rows(self, conn, table):
+        return conn.execute(f"SELECT 1 FROM {_quote(table)} LIMIT 1").fetchone() is not None
+
+    def _verse_table_selects(self, conn, table):
+        from references import BOOK_ALIASES
+        canon = list(BOOK_ALIASES)
+        source = f"source.{_quote(table)}"
+        where = "WHERE book = ? AND chapter > 0 AND verse > 0 AND text IS NOT NULL"
+        selects = []
+        for (book,) in conn.execute(f"SELECT book FROM {_quote(table)} GROUP BY book ORDER BY min(rowid)"):
+            if isinstance(book, int):
+                # Books stored by number take their canonical name
+                name = canon[book - 1] if 0 < book <= len(canon) else str(book)
+                selects.append((f"SELECT ? AS book, chapter, verse, text FROM {source} {where}", (name, book)))
+            else:
+                selects.append((f"SELECT book, chapter, verse, text FROM {source} {where}", (book,)))
+        return selects
+
+    def _numbered_table_selects(self, conn, table):
+        source = f"source.{_quote(table)}"
+        sql = (f"SELECT k.n AS book, t.c AS chapter, t.v AS verse, t.t AS text FROM {source} t "
+               f"JOIN source.key_english k ON k.b = t.b WHERE t.b = ? AND t.c > 0 AND t.v > 0")
+        return [(sql, (book,)) for (book,) in conn.execute(f"SELECT DISTINCT b FROM {_quote(table)} ORDER BY b")]
+
+    def load(self, store, progress=None, translation=None):
+        if os.path.exists(store.db_path) and os.path.samefile(self.file_path, store.db_path):
+            raise ValueError("Cannot import the app's own verse database into itself")
+        return store.copy_import(self.file_path, self.selects(), progress=progress, translation=translation)
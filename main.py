@@ -1,41 +1,135 @@
 # main.py
 import sys
 import os
-import sqlite3
 from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QPushButton, 
                             QTextEdit, QLabel, QHBoxLayout, QSplitter, 
                             QComboBox, QScrollArea, QFileDialog, QMessageBox,
-                            QSpinBox, QGroupBox, QSlider, QLineEdit)
-from PyQt6.QtGui import QFont, QColor, QPalette
+                            QSpinBox, QGroupBox, QSlider, QLineEdit, QProgressBar,
+                            QDialog, QInputDialog, QTextBrowser)
+from PyQt6.QtGui import QFont, QColor, QPalette, QPainter
 from PyQt6.QtCore import Qt, QTimer
-from database import (init_db, get_random_verse, save_memorized_verse, 
-                     import_bible_from_text, get_books, get_chapters_for_book,
-                     get_verses_for_chapter, get_verse_by_reference,
-                     count_verses, get_verses_due_for_review)
-import pyttsx3
+from database import (init_db, get_random_verse, 
+                     import_bible_file, get_outline, get_verse_by_reference,
+                     get_verses_for_chapter, get_review_status, lookup_references,
+                     count_verses, get_store, list_profiles, switch_profile,
+                     profile_path, DEFAULT_PROFILE, get_translations, current_translation,
+                     use_translation, get_parallel, word_count, top_words, get_concordance,
+                     release_connection)
+from workers import DatabaseWorker, StallMonitor, StartupTimer
+from tts import SpeechWorker
+from audio_cache import AudioCache, chapter_reference, verse_reference
+from review_journal import ReviewJournal
+from grading import AnswerGrader, format_feedback
+from profiler import profiler
+from reading_view import ReadingView, VerseListModel
 
-class TextToSpeech:
-    def __init__(self):
-        self.engine = pyttsx3.init()
-        self.engine.setProperty('rate', 150)
-        
-    def speak(self, text):
-        try:
-            self.engine.say(text)
-            self.engine.runAndWait()
-        except Exception as e:
-            print(f"TTS Error: {e}")
+SEARCH_DELAY_MS = 300
+GRADE_DELAY_MS = 150
+FORECAST_DAYS = 30
+READING_SCOPES = ["Chapter", "Book"]
+
+def import_and_count(file_path, progress=None):
+    """Import a Bible file and return the number of verses, or None on failure"""
+    if import_bible_file(file_path, progress):
+        return count_verses()
+    return None
+
+def load_first_screen(verse=None):
+    """Load the outline, a random verse and the translations (runs on the worker)"""
+    return get_outline(), verse or get_random_verse(), get_translations(), current_translation()
+
+def load_translation(name, reference=None):
+    """Switch translation and load its first screen, keeping the verse if it has it (runs on the worker)"""
+    use_translation(name)
+    verse = get_verse_by_reference(*reference) if reference else None
+    return load_first_screen(verse)
+
+def load_startup_data(profile=None):
+    """Open the database and load what the first screen shows (runs on the worker)
+
+    With a profile name, switch to that profile's progress first. Also
+    returns how many memorized verses were moved into the profile from the
+    old single-database layout.
+    """
+    if profile:
+        moved = switch_profile(profile)
+    else:
+        moved = init_db()
+    # Reviews are batched to SQLite; entries left by a crash are replayed here
+    journal = ReviewJournal(get_store())
+    return journal, load_first_screen(), moved
+
+def find_verses(term, limit=20):
+    """Look up term as references ("Jn 3:16-18; Ps 23"), or else search the text (runs on the worker)
+
+    Returns (passages, search result, suggestion); a search that finds
+    nothing comes with a corrected spelling to try, if there is one.
+    """
+    from database import search_verses, did_you_mean
+    try:
+        return lookup_references(term), None, None
+    except ValueError:
+        result = search_verses(term, limit=limit)
+        return None, result, did_you_mean(term) if result.verse_count == 0 else None
+
+def load_concordance_word(word):
+    """Load a word's counts and first page of concordance verses (runs on the worker)"""
+    return word_count(word), get_concordance(word)
+
+def after_flush(journal, fn, *args):
+    """Write the journal's buffered reviews to SQLite, then return fn(*args) (runs on the worker)"""
+    if journal:
+        journal.flush()
+    return fn(*args)
+
+def load_review_forecast(days=FORECAST_DAYS):
+    """Simulate the review load for the coming days (runs on the worker)"""
+    # NumPy is only needed for the forecast, so import it on demand
+    from scheduler import BatchScheduler
+    return BatchScheduler.load(get_store()).forecast(days).tolist()
+
+class ReviewLoadChart(QWidget):
+    """Bar chart of how many reviews fall due on each coming day"""
+    
+    def __init__(self, counts, parent=None):
+        super().__init__(parent)
+        self.counts = counts
+        self.setMinimumSize(480, 200)
+        self.setToolTip(" ".join(f"Day {day}: {count}" for day, count in enumerate(counts)))
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        width = self.width() / max(len(self.counts), 1)
+        height = self.height() - 20
+        peak = max(self.counts, default=0) or 1
+        painter.drawText(4, 14, f"Reviews per day, next {len(self.counts)} days (peak {peak})")
+        painter.setBrush(QColor("#4a7bd0"))
+        for day, count in enumerate(self.counts):
+            bar = int(height * count / peak)
+            painter.drawRect(int(day * width) + 1, self.height() - bar, max(int(width) - 2, 1), bar)
+        painter.end()
 
 class BibleMemoryApp(QWidget):
     def __init__(self):
         super().__init__()
-        self.tts = TextToSpeech()
+        self.tts = SpeechWorker(rate=150)
+        self.audio_cache = AudioCache()
+        self.audio_player = None
+        # Each job closes the connection it opened
+        self.worker = DatabaseWorker(self, release=release_connection)
+        self.worker.progress.connect(self.update_progress)
+        self.review_session = None
+        self.review_card = None
+        self.journal = None
         self.current_book = None
         self.current_chapter = None
         self.current_verse = None
         self.current_text = None
         self.test_mode = False
         self.attempts = 0
+        self.grader = None
+        self.outline = None
+        self.startup_timer = None
         self.initUI()
         
     def initUI(self):
@@ -53,6 +147,11 @@ class BibleMemoryApp(QWidget):
         # Navigation controls
         nav_layout = QHBoxLayout()
         
+        self.translation_selector = QComboBox()
+        self.translation_selector.currentTextChanged.connect(self.translation_selected)
+        nav_layout.addWidget(QLabel("Translation:"))
+        nav_layout.addWidget(self.translation_selector)
+        
         self.book_selector = QComboBox()
         self.book_selector.currentTextChanged.connect(self.book_selected)
         
@@ -69,6 +168,12 @@ class BibleMemoryApp(QWidget):
         nav_layout.addWidget(QLabel("Verse:"))
         nav_layout.addWidget(self.verse_selector)
         
+        self.scope_selector = QComboBox()
+        self.scope_selector.addItems(READING_SCOPES)
+        self.scope_selector.currentTextChanged.connect(self.display_verse)
+        nav_layout.addWidget(QLabel("Show:"))
+        nav_layout.addWidget(self.scope_selector)
+        
         left_layout.addLayout(nav_layout)
         
         # Search controls
@@ -77,13 +182,26 @@ class BibleMemoryApp(QWidget):
         self.search_input.setPlaceholderText("Search word...")
         self.search_btn = QPushButton("Search")
         self.search_btn.clicked.connect(self.search_word)
+        # Search as the user types, once they pause
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.search_word)
+        self.search_input.textChanged.connect(self.search_timer.start)
+        self.search_input.returnPressed.connect(self.search_word)
+        self.concordance_btn = QPushButton("Concordance")
+        self.concordance_btn.clicked.connect(self.show_concordance)
+        self.concordance_dialog = None
         search_layout.addWidget(self.search_input)
         search_layout.addWidget(self.search_btn)
+        search_layout.addWidget(self.concordance_btn)
         left_layout.addLayout(search_layout)
 
         # Search results area
-        self.search_results = QTextEdit()
-        self.search_results.setReadOnly(True)
+        # Links in the results are handled here rather than followed
+        self.search_results = QTextBrowser()
+        self.search_results.setOpenLinks(False)
+        self.search_results.anchorClicked.connect(self.load_verse_from_search)
         self.search_results.setMaximumHeight(150)
         self.search_results.setVisible(False)
         left_layout.addWidget(self.search_results)
@@ -94,7 +212,7 @@ class BibleMemoryApp(QWidget):
         self.theme_toggle_btn.clicked.connect(self.toggle_theme)
         main_layout.addWidget(self.theme_toggle_btn, alignment=Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignRight)
         
-        # Bible text area with scroll
+        # Bible text area with scroll; used while loading and during tests
         self.scroll_area = QScrollArea()
         self.scroll_area.setWidgetResizable(True)
         self.bible_display = QTextEdit()
@@ -103,22 +221,60 @@ class BibleMemoryApp(QWidget):
         self.scroll_area.setWidget(self.bible_display)
         left_layout.addWidget(self.scroll_area)
         
+        # Reading view of the current chapter or book; rows load as they scroll into view
+        self.reading_model = VerseListModel(self)
+        self.reading_model.chapter_needed.connect(self.load_reading_chapter)
+        self.reading_view = ReadingView(self.reading_model)
+        self.reading_view.setFont(QFont("Times New Roman", 12))
+        self.reading_view.clicked.connect(self.reading_verse_clicked)
+        self.reading_view.activated.connect(self.reading_verse_clicked)
+        self.reading_view.setVisible(False)
+        left_layout.addWidget(self.reading_view)
+        
         # Import button
         import_layout = QHBoxLayout()
         self.import_btn = QPushButton("Import Bible Text")
         self.import_btn.clicked.connect(self.import_bible)
         self.read_aloud_btn = QPushButton("Read Aloud")
         self.read_aloud_btn.clicked.connect(self.read_current_verse)
+        self.read_chapter_btn = QPushButton("Read Chapter")
+        self.read_chapter_btn.clicked.connect(self.read_current_chapter)
+        self.stop_reading_btn = QPushButton("Stop")
+        self.stop_reading_btn.clicked.connect(self.stop_reading)
+        self.compare_btn = QPushButton("Compare Translations")
+        self.compare_btn.clicked.connect(self.compare_translations)
         import_layout.addWidget(self.import_btn)
         import_layout.addWidget(self.read_aloud_btn)
+        import_layout.addWidget(self.read_chapter_btn)
+        import_layout.addWidget(self.stop_reading_btn)
+        import_layout.addWidget(self.compare_btn)
         left_layout.addLayout(import_layout)
         
+        self.import_progress = QProgressBar()
+        self.import_progress.setVisible(False)
+        left_layout.addWidget(self.import_progress)
+        
         self.left_panel.setLayout(left_layout)
         
         # Right panel (Memory test)
         self.right_panel = QWidget()
         right_layout = QVBoxLayout()
         
+        # Each profile keeps its own progress; the verses are shared
+        profile_layout = QHBoxLayout()
+        self.profile_selector = QComboBox()
+        self.profile_selector.addItems(list_profiles())
+        self.profile_selector.currentTextChanged.connect(self.profile_selected)
+        self.new_profile_btn = QPushButton("New Profile")
+        self.new_profile_btn.clicked.connect(self.new_profile)
+        self.backup_btn = QPushButton("Back Up Progress")
+        self.backup_btn.clicked.connect(self.backup_progress)
+        profile_layout.addWidget(QLabel("Profile:"))
+        profile_layout.addWidget(self.profile_selector, 1)
+        profile_layout.addWidget(self.new_profile_btn)
+        profile_layout.addWidget(self.backup_btn)
+        right_layout.addLayout(profile_layout)
+        
         # Test controls
         self.verse_ref_label = QLabel("Verse Reference")
         self.verse_ref_label.setFont(QFont("Arial", 14, QFont.Weight.Bold))
@@ -148,11 +304,31 @@ class BibleMemoryApp(QWidget):
         self.memory_verse_btn.clicked.connect(self.load_memory_verse)
         test_controls.addWidget(self.memory_verse_btn)
         
+        self.forecast_btn = QPushButton("Review Forecast")
+        self.forecast_btn.clicked.connect(self.show_review_forecast)
+        test_controls.addWidget(self.forecast_btn)
+        
+        if profiler.enabled():
+            self.profile_btn = QPushButton("Performance Report")
+            self.profile_btn.clicked.connect(self.show_performance_report)
+            test_controls.addWidget(self.profile_btn)
+        
         # User input area
         self.user_input = QTextEdit()
         self.user_input.setFont(QFont("Arial", 12))
         self.user_input.setPlaceholderText("Type the verse here when in test mode...")
         right_layout.addWidget(self.user_input)
+        
+        # Live grading while typing, once the user pauses briefly
+        self.live_feedback_label = QLabel("")
+        self.live_feedback_label.setWordWrap(True)
+        self.live_feedback_label.setTextFormat(Qt.TextFormat.RichText)
+        right_layout.addWidget(self.live_feedback_label)
+        self.grade_timer = QTimer(self)
+        self.grade_timer.setSingleShot(True)
+        self.grade_timer.setInterval(GRADE_DELAY_MS)
+        self.grade_timer.timeout.connect(self.grade_typing)
+        self.user_input.textChanged.connect(self.grade_timer.start)
        
         
         # Submit and feedback
@@ -166,7 +342,7 @@ class BibleMemoryApp(QWidget):
         
         # Next verse button
         self.next_btn = QPushButton("Next Verse")
-        self.next_btn.clicked.connect(self.load_random_verse)
+        self.next_btn.clicked.connect(self.next_verse)
         self.next_btn.setVisible(False)
         right_layout.addWidget(self.next_btn)
         
@@ -180,14 +356,142 @@ class BibleMemoryApp(QWidget):
         main_layout.addWidget(self.splitter)
         self.setLayout(main_layout)
         
-        # Initialize and load data
-        init_db()
-        self.update_book_selector()
-        self.load_random_verse()
+        # Open the database on the worker so the window paints first; the
+        # controls that need it are enabled once it is ready
+        self.database_controls = [self.search_input, self.search_btn, self.import_btn,
+                                  self.memory_test_btn, self.random_verse_btn, self.review_due_btn,
+                                  self.memory_verse_btn, self.forecast_btn, self.submit_btn,
+                                  self.profile_selector, self.new_profile_btn, self.backup_btn,
+                                  self.translation_selector, self.compare_btn, self.concordance_btn]
+        self.load_profile(None)
+    
+    def load_profile(self, profile):
+        """Open the database, or switch profile, in the background"""
+        for control in self.database_controls:
+            control.setEnabled(False)
+        self.bible_display.setText("Loading...")
+        self.worker.submit("startup", load_startup_data, profile, on_result=self.startup_finished,
+                           on_error=self.startup_failed)
+    
+    def startup_finished(self, result):
+        """Enable the database controls once startup loading is done"""
+        self.journal, first_screen, moved = result
+        self.show_first_screen(first_screen)
+        for control in self.database_controls:
+            control.setEnabled(True)
+        if self.startup_timer:
+            self.startup_timer.finish("first_verse")
+            self.startup_timer = None
+        if moved:
+            QMessageBox.information(self, "Progress Moved",
+                                    f"Moved {moved} memorized verses into the "
+                                    f"'{self.profile_selector.currentText() or DEFAULT_PROFILE}' profile.")
     
-    def update_book_selector(self):
+    def startup_failed(self, message):
+        QMessageBox.critical(self, "Database Error", f"Could not open the Bible database:\n{message}")
+        # Another profile may still open
+        for control in (self.profile_selector, self.new_profile_btn):
+            control.setEnabled(True)
+    
+    def profile_selected(self, profile):
+        """Switch to another user's progress; the verses stay loaded"""
+        if not profile or not self.journal:
+            return
+        self.end_review_session()
+        for control in self.database_controls:
+            control.setEnabled(False)
+        # Buffered reviews belong to the profile being left; they are written
+        # on the worker, and the new profile loads once they are
+        journal, self.journal = self.journal, None
+        self.worker.submit(None, journal.close, on_result=lambda _: self.load_profile(profile),
+                           on_error=lambda message: self.journal_close_failed(message, profile))
+    
+    def journal_close_failed(self, message, profile):
+        # The journal file keeps the reviews; they are replayed when the profile is next opened
+        print(f"Error saving reviews: {message}")
+        self.load_profile(profile)
+    
+    def new_profile(self):
+        """Create a profile and switch to it"""
+        name, ok = QInputDialog.getText(self, "New Profile", "Profile name:")
+        name = name.strip()
+        if not ok or not name:
+            return
+        try:
+            profile_path(name)
+        except ValueError as e:
+            QMessageBox.warning(self, "New Profile", str(e))
+            return
+        if self.profile_selector.findText(name) < 0:
+            self.profile_selector.addItem(name)
+        self.profile_selector.setCurrentText(name)
+    
+    def backup_progress(self):
+        """Save a copy of the current profile's progress database"""
+        profile = self.profile_selector.currentText() or DEFAULT_PROFILE
+        path, _ = QFileDialog.getSaveFileName(self, "Back Up Progress", f"{profile}-progress.db",
+                                              "SQLite Databases (*.db)")
+        if path:
+            self.worker.submit(None, after_flush, self.journal, lambda: get_store().backup_progress(path),
+                               on_result=lambda _: QMessageBox.information(
+                                   self, "Backup Complete", f"Progress saved to {path}"),
+                               on_error=lambda message: QMessageBox.critical(
+                                   self, "Backup Failed", message))
+    
+    def show_first_screen(self, result):
+        """Fill in the outline, random verse and translations loaded in the background"""
+        outline, verse, translations, translation = result
+        self.show_translations(translations, translation)
+        self.show_outline(outline)
+        self.end_review_session()
+        self.show_random_verse(verse)
+        # The random verse is already shown; drop loads the selectors queued
+        self.worker.cancel("verse")
+    
+    def show_translations(self, translations, translation):
+        """List the imported translations without switching to one"""
+        self.translation_selector.blockSignals(True)
+        self.translation_selector.clear()
+        self.translation_selector.addItems(translations)
+        if translation:
+            self.translation_selector.setCurrentText(translation)
+        self.translation_selector.blockSignals(False)
+    
+    def translation_selected(self, translation):
+        """Read and test against another translation, staying on the same verse"""
+        if not translation or not self.journal:
+            return
+        self.end_review_session()
+        reference = None
+        if self.current_book:
+            reference = (self.current_book, self.current_chapter, self.current_verse)
+        self.worker.submit("outline", load_translation, translation, reference,
+                           on_result=self.show_first_screen)
+    
+    def compare_translations(self):
+        """Show the current verse in every imported translation"""
+        if self.current_book:
+            self.worker.submit("parallel", get_parallel, self.current_book, self.current_chapter,
+                               self.current_verse, on_result=self.show_parallel)
+    
+    def show_parallel(self, rows):
+        """List the current verse side by side in each translation"""
+        reference = f"{self.current_book} {self.current_chapter}:{self.current_verse}"
+        output = f"<b>{reference}</b><br>"
+        for translation, text in rows:
+            output += f"<b>{translation}</b>: {text}<br>"
+        missing = self.translation_selector.count() - len(rows)
+        if missing > 0:
+            output += f"<br>Not found in {missing} other translation(s)."
+        self.search_results.setHtml(output)
+        self.search_results.setVisible(True)
+    
+    def show_outline(self, outline):
         """Update the book selector dropdown with available books"""
-        books = get_books()
+        self.outline = outline
+        # The verses may have been replaced by an import
+        self.reading_model.clear()
+        books = self.outline.books()
         if books:
             self.book_selector.clear()
             self.book_selector.addItems(books)
@@ -202,50 +506,116 @@ class BibleMemoryApp(QWidget):
         
     
     def search_word(self):
-        """Search for a word in the Bible"""
-        from database import search_word
-        
+        """Look up a reference, or search for a word in the Bible"""
+        self.search_timer.stop()
         search_term = self.search_input.text().strip()
         if not search_term:
+            self.worker.cancel("search")
+            self.search_results.setVisible(False)
             return
             
-        count, results = search_word(search_term)
+        # A newer search makes any running one stale
+        self.worker.submit("search", find_verses, search_term, limit=20,
+                           on_result=lambda result: self.show_found_verses(search_term, result))
         
-        if count == 0:
-            self.search_results.setText(f"No occurrences of '{search_term}' found.")
+    def show_found_verses(self, search_term, result):
+        """Show passages if the search was a reference, otherwise the search results"""
+        passages, search_result, suggestion = result
+        if passages is None:
+            self.show_search_results(search_term, search_result, suggestion)
         else:
-            output = f"'{search_term}' appears {count} times in the Bible:\n\n"
+            self.show_passages(passages)
+    
+    def show_passages(self, passages):
+        """List the verses of each referenced passage, each linking to its verse"""
+        from references import format_passage
+        output = ""
+        for passage, rows in passages:
+            output += f"<b>{format_passage(passage)}</b><br>"
+            if not rows:
+                output += "Not found in this Bible.<br>"
+            for book, chapter, verse, text in rows:
+                output += f"<a href=\"{book},{chapter},{verse}\">{chapter}:{verse}</a> {text}<br>"
+            output += "<br>"
+        self.search_results.setHtml(output)
+        self.search_results.setVisible(True)
+    
+    def show_search_results(self, search_term, result, suggestion=None):
+        """Display search results delivered by the worker"""
+        occurrences, verse_count, results = result
+        
+        if verse_count == 0:
+            output = f"No occurrences of '{search_term}' found."
+            if suggestion:
+                output += f" Did you mean <a href=\"search:{suggestion}\">{suggestion}</a>?"
+            self.search_results.setHtml(output)
+        else:
+            output = f"'{search_term}' appears {occurrences} times in {verse_count} verses:<br><br>"
             
-            for book, chapter, verse, text in results[:20]:  # Limit to first 20 results
+            for book, chapter, verse, text, snippet in results:  # Best 20 matches
                 reference = f"{book} {chapter}:{verse}"
                 # Make each result clickable by formatting as HTML
-                output += f"<a href=\"{book},{chapter},{verse}\">{reference}</a> - {text[:50]}...\n"
+                output += f"<a href=\"{book},{chapter},{verse}\">{reference}</a> - {snippet}<br>"
                 
-            if count > 20:
-                output += f"\n... and {count-20} more occurrences."
+            if verse_count > len(results):
+                output += f"<br>... and {verse_count - len(results)} more verses."
                 
             self.search_results.setHtml(output)
-            self.search_results.setVisible(True)
-            
-            # Connect linkClicked signal if not already connected
-            if not hasattr(self, 'search_results_connected'):
-                self.search_results.anchorClicked.connect(self.load_verse_from_search)
-                self.search_results_connected = True
+        self.search_results.setVisible(True)
             
     def load_verse_from_search(self, url):
         """Load a verse when clicked in search results"""
+        if url.toString().startswith("search:"):
+            # A "did you mean" suggestion is searched for in turn
+            self.search_input.setText(url.toString()[len("search:"):])
+            self.search_word()
+            return
         parts = url.toString().split(',')
         if len(parts) == 3:
             book = parts[0]
             chapter = int(parts[1])
             verse = int(parts[2])
             
-            result = get_verse_by_reference(book, chapter, verse)
-            if result:
-                self.current_book, self.current_chapter, self.current_verse, self.current_text = result
-                self.display_verse()
-                self.reset_test_ui()
+            self.worker.submit("verse", get_verse_by_reference, book, chapter, verse,
+                               on_result=self.show_search_verse)
             
+    def show_search_verse(self, result):
+        """Show a verse picked from the search results"""
+        if result:
+            self.current_book, self.current_chapter, self.current_verse, self.current_text = result
+            self.display_verse()
+            self.reset_test_ui()
+            
+    def show_concordance(self):
+        """Open the concordance on the searched word and the current book's top words"""
+        if self.concordance_dialog is None:
+            # The panel is only built the first time it is opened
+            from concordance_view import ConcordanceDialog
+            self.concordance_dialog = ConcordanceDialog(self)
+            self.concordance_dialog.word_requested.connect(self.load_concordance_word)
+            self.concordance_dialog.top_words_requested.connect(self.load_top_words)
+            self.concordance_dialog.model.page_needed.connect(self.load_concordance_page)
+            self.concordance_dialog.verse_chosen.connect(
+                lambda *verse: self.show_search_verse(verse))
+        self.concordance_dialog.show_book(self.current_book)
+        if self.search_input.text().strip():
+            self.concordance_dialog.lookup(self.search_input.text())
+        self.concordance_dialog.show()
+        self.concordance_dialog.raise_()
+    
+    def load_concordance_word(self, word):
+        self.worker.submit("concordance", load_concordance_word, word,
+                           on_result=lambda result: self.concordance_dialog.show_word(word, *result))
+    
+    def load_concordance_page(self, word, after):
+        """Load the next page of verses the concordance list has scrolled to"""
+        self.worker.submit("concordance-page", get_concordance, word, after,
+                           on_result=lambda rows: self.concordance_dialog.model.add_page(word, after, rows))
+    
+    def load_top_words(self, book):
+        self.worker.submit("top-words", top_words, book or None,
+                           on_result=lambda rows: self.concordance_dialog.show_top_words(book, rows))
+    
     def toggle_theme(self):
         self.is_dark_mode = not self.is_dark_mode
     
@@ -266,7 +636,7 @@ class BibleMemoryApp(QWidget):
         """Handle book selection"""
         if self.book_selector.currentText():
             self.current_book = self.book_selector.currentText()
-            chapters = get_chapters_for_book(self.current_book)
+            chapters = self.outline.chapters(self.current_book)
             
             self.chapter_selector.clear()
             self.chapter_selector.addItems([str(ch) for ch in chapters])
@@ -275,10 +645,10 @@ class BibleMemoryApp(QWidget):
         """Handle chapter selection"""
         if self.chapter_selector.currentText():
             self.current_chapter = int(self.chapter_selector.currentText())
-            verses = get_verses_for_chapter(self.current_book, self.current_chapter)
+            verses = self.outline.verses(self.current_book, self.current_chapter)
             
             self.verse_selector.clear()
-            self.verse_selector.addItems([str(v[0]) for v in verses])
+            self.verse_selector.addItems([str(v) for v in verses])
     
     def verse_selected(self):
         """Handle verse selection"""
@@ -289,31 +659,48 @@ class BibleMemoryApp(QWidget):
     def load_selected_verse(self):
         """Load the selected verse"""
         if self.current_book and self.current_chapter and self.current_verse:
-            result = get_verse_by_reference(self.current_book, self.current_chapter, self.current_verse)
-            if result:
-                self.current_book, self.current_chapter, self.current_verse, self.current_text = result
-                self.display_verse()
+            self.worker.submit("verse", get_verse_by_reference,
+                               self.current_book, self.current_chapter, self.current_verse,
+                               on_result=self.show_selected_verse)
+    
+    def show_selected_verse(self, result):
+        """Show the verse picked in the selectors"""
+        if result:
+            self.current_book, self.current_chapter, self.current_verse, self.current_text = result
+            self.display_verse()
+    
+    def next_verse(self):
+        """Move on to the next review card, or a random verse outside a review"""
+        if self.review_session:
+            self.show_next_review_card()
+        else:
+            self.load_random_verse()
     
     def load_random_verse(self):
         """Load a random verse from the database"""
+        self.end_review_session()
+        self.worker.submit("verse", get_random_verse, on_result=self.show_random_verse)
+    
+    def show_random_verse(self, result):
+        """Show a random verse and move the selectors to it"""
         self.test_mode = False
-        self.current_book, self.current_chapter, self.current_verse, self.current_text = get_random_verse()
+        self.current_book, self.current_chapter, self.current_verse, self.current_text = result
         
         # Update the selectors to match the current verse
         if self.current_book in [self.book_selector.itemText(i) for i in range(self.book_selector.count())]:
             self.book_selector.setCurrentText(self.current_book)
             
             # Update chapter selector
-            chapters = get_chapters_for_book(self.current_book)
+            chapters = self.outline.chapters(self.current_book)
             self.chapter_selector.clear()
             self.chapter_selector.addItems([str(ch) for ch in chapters])
             if str(self.current_chapter) in [self.chapter_selector.itemText(i) for i in range(self.chapter_selector.count())]:
                 self.chapter_selector.setCurrentText(str(self.current_chapter))
             
             # Update verse selector
-            verses = get_verses_for_chapter(self.current_book, self.current_chapter)
+            verses = self.outline.verses(self.current_book, self.current_chapter)
             self.verse_selector.clear()
-            self.verse_selector.addItems([str(v[0]) for v in verses])
+            self.verse_selector.addItems([str(v) for v in verses])
             if str(self.current_verse) in [self.verse_selector.itemText(i) for i in range(self.verse_selector.count())]:
                 self.verse_selector.setCurrentText(str(self.current_verse))
         
@@ -332,11 +719,62 @@ class BibleMemoryApp(QWidget):
             full_text = f"{reference}\n\n{self.current_text}"
             self.bible_display.setText(full_text)
             self.test_verse_label.setText(self.current_text)
+        self.update_reading_view()
+    
+    def update_reading_view(self):
+        """Show the current verse in the reading view, or hide the view during a test"""
+        # The surrounding verses would give the answer away
+        reading = (not self.test_mode and self.outline is not None
+                   and self.current_book in self.outline.books())
+        self.scroll_area.setVisible(not reading)
+        self.reading_view.setVisible(reading)
+        if not reading:
+            return
+        if self.scope_selector.currentText() == "Book":
+            chapters = self.outline.chapters(self.current_book)
+        else:
+            chapters = [self.current_chapter]
+        if self.reading_model.set_range(self.outline, self.current_book, chapters):
+            book = self.current_book
+            # Buffered reviews would otherwise still show as due
+            self.worker.submit("reading-status", after_flush, self.journal, get_review_status, book,
+                               on_result=lambda status: self.show_review_status(book, status))
+        self.reading_view.show_verse(self.current_chapter, self.current_verse)
+    
+    def load_reading_chapter(self, book, chapter):
+        """Load the text of a chapter the reading view has scrolled to"""
+        # One channel per chapter, so loads of chapters scrolled past are not cancelled
+        self.worker.submit(f"reading:{book}:{chapter}", get_verses_for_chapter, book, chapter,
+                           on_result=lambda verses: self.reading_model.add_chapter(book, chapter, verses))
+    
+    def show_review_status(self, book, status):
+        """Mark memorized and due verses in the reading view"""
+        if book == self.reading_model.book:
+            self.reading_model.set_status(status)
+    
+    def reading_verse_clicked(self, index):
+        """Make the verse picked in the reading view the current verse"""
+        book, chapter, verse, text = self.reading_model.reference(index.row())
+        if text is None:
+            self.worker.submit("verse", get_verse_by_reference, book, chapter, verse,
+                               on_result=self.show_reading_verse)
+        else:
+            self.show_reading_verse((book, chapter, verse, text))
+    
+    def show_reading_verse(self, result):
+        """Test the verse picked in the reading view"""
+        if result:
+            self.end_review_session()
+            self.show_random_verse(result)
+            # The selectors now match; drop the verse loads they queued
+            self.worker.cancel("verse")
     
     def start_test(self):
         """Start the memory test for the current verse"""
         self.test_mode = True
         self.attempts = 0
+        # The verse is tokenised once per card and graded incrementally
+        self.grader = AnswerGrader(self.current_text)
         self.user_input.clear()
         self.feedback_label.setText("Try to recall the verse!")
         self.next_btn.setVisible(False)
@@ -348,14 +786,19 @@ class BibleMemoryApp(QWidget):
             self.feedback_label.setText("Click 'Start Memory Test' first!")
             return
         
+        self.grade_timer.stop()
         user_text = self.user_input.toPlainText().strip()
-        # Simple normalization for comparison - remove punctuation and case
-        normalized_user = ''.join(c.lower() for c in user_text if c.isalnum() or c.isspace())
-        normalized_verse = ''.join(c.lower() for c in self.current_text if c.isalnum() or c.isspace())
+        grade = self.grader.grade(user_text)
+        self.live_feedback_label.setText(format_feedback(grade))
         
-        if normalized_user == normalized_verse:
+        if self.grader.is_exact(grade):
             self.feedback_label.setText("Correct! Well done!")
-            save_memorized_verse(self.current_book, self.current_chapter, self.current_verse)
+            if self.review_card:
+                # Fewer hints needed means a better recall grade
+                self.review_session.record(self.review_card, max(5 - self.attempts, 3))
+            else:
+                self.journal.mark_memorized(self.current_book, self.current_chapter, self.current_verse)
+            self.reading_model.mark(self.current_book, self.current_chapter, self.current_verse, due=False)
             self.next_btn.setVisible(True)
             self.test_mode = False
             self.display_verse()  # Show the full verse again
@@ -373,65 +816,229 @@ class BibleMemoryApp(QWidget):
                     hint_words.append(hint_word)
                 
                 hint_text = " ".join(hint_words)
-                self.feedback_label.setText(f"Attempt {self.attempts}/5. Hint: {hint_text}")
+                self.feedback_label.setText(f"Attempt {self.attempts}/5 ({grade.accuracy:.0%} right). "
+                                            f"Hint: {hint_text}")
             else:
                 self.feedback_label.setText(f"Out of attempts! The correct verse is:\n{self.current_text}")
+                if self.review_card:
+                    # A failed recall, graded by how much of the verse was right
+                    self.review_session.record(self.review_card, min(grade.quality, 2))
                 self.next_btn.setVisible(True)
                 self.test_mode = False
                 self.display_verse()  # Show the full verse again
     
+    def grade_typing(self):
+        """Show which words so far are right, misspelled, wrong or missing"""
+        if self.test_mode and self.grader:
+            grade = self.grader.grade(self.user_input.toPlainText(), partial=True)
+            self.live_feedback_label.setText(format_feedback(grade))
+    
     def reset_test_ui(self):
         """Reset the test UI components"""
         self.test_mode = False
         self.user_input.clear()
+        self.live_feedback_label.setText("")
         self.feedback_label.setText("")
         self.next_btn.setVisible(False)
         self.attempts = 0
     
     def import_bible(self):
-        """Import Bible text from a file"""
+        """Import a Bible from a text, PDF or SQLite file"""
+        from importers import file_filter
+        if self.worker.is_busy("import"):
+            return
         file_dialog = QFileDialog()
-        file_path, _ = file_dialog.getOpenFileName(self, "Open Bible Text File", "", "Text Files (*.txt)")
+        file_path, _ = file_dialog.getOpenFileName(self, "Open Bible File", "", file_filter())
         
         if file_path:
-            success = import_bible_from_text(file_path)
-            if success:
-                verses_count = count_verses()
-                QMessageBox.information(self, "Import Successful", 
-                                       f"Successfully imported {verses_count} verses into the database.")
-                self.update_book_selector()
-                self.load_random_verse()
-            else:
-                QMessageBox.critical(self, "Import Failed", 
-                                    "Failed to import Bible text. Check file format.")
+            self.import_btn.setEnabled(False)
+            self.import_progress.setValue(0)
+            self.import_progress.setVisible(True)
+            self.worker.submit("import", import_and_count, file_path, report_progress=True,
+                               on_result=self.import_finished,
+                               on_error=lambda message: self.import_finished(None))
+    
+    def update_progress(self, channel, done, total):
+        """Show import progress reported by the worker"""
+        if channel == "import" and total:
+            self.import_progress.setMaximum(total)
+            self.import_progress.setValue(min(done, total))
+    
+    def import_finished(self, verses_count):
+        """Report the result of a background import"""
+        self.import_btn.setEnabled(True)
+        self.import_progress.setVisible(False)
+        if verses_count:
+            QMessageBox.information(self, "Import Successful", 
+                                   f"Successfully imported {verses_count} verses into the database.")
+            # The outline is reloaded by the database layer after each import
+            self.worker.submit("outline", load_first_screen, on_result=self.show_first_screen)
+        else:
+            QMessageBox.critical(self, "Import Failed", 
+                                "Failed to import Bible text. Check file format.")
     
     def read_current_verse(self):
         """Read the current verse aloud using TTS"""
         if self.current_text:
-            self.tts.speak(self.current_text)
+            self.stop_reading()
+            reference = verse_reference(self.current_book, self.current_chapter, self.current_verse)
+            cached = self.audio_cache.lookup(self.audio_cache.key(self.current_text, reference,
+                                                                  rate=self.tts.rate))
+            if cached:
+                self.play_audio(cached)
+            else:
+                self.tts.speak(self.current_text)
     
-    def review_due_verses(self):
-        """Load verses that are due for review based on spaced repetition"""
-        due_verses = get_verses_due_for_review()
-        if due_verses:
-            # Get the first due verse
-            book, chapter, verse, text, ease_factor, interval = due_verses[0]
-            self.current_book = book
-            self.current_chapter = chapter
-            self.current_verse = verse
-            self.current_text = text
-            
-            self.display_verse()
-            self.reset_test_ui()
-            QMessageBox.information(self, "Review Mode", 
-                                   f"Reviewing verse due for repetition. Next review in {interval} days.")
+    def play_audio(self, path):
+        """Play a pre-rendered audio file"""
+        if self.audio_player is None:
+            from PyQt6.QtMultimedia import QAudioOutput, QMediaPlayer
+            from PyQt6.QtCore import QUrl
+            self.audio_output = QAudioOutput(self)
+            self.audio_player = QMediaPlayer(self)
+            self.audio_player.setAudioOutput(self.audio_output)
+            self._file_url = QUrl.fromLocalFile
+        self.audio_player.setSource(self._file_url(os.path.abspath(path)))
+        self.audio_player.play()
+    
+    def stop_reading(self):
+        """Stop live speech and any cached audio that is playing"""
+        self.tts.stop()
+        if self.audio_player is not None:
+            self.audio_player.stop()
+    
+    def read_current_chapter(self):
+        """Read the current chapter aloud, verse by verse"""
+        if self.current_book and self.current_chapter:
+            book, chapter = self.current_book, self.current_chapter
+            self.worker.submit("chapter", get_verses_for_chapter, book, chapter,
+                               on_result=lambda verses: self.read_chapter_verses(book, chapter, verses))
+    
+    def read_chapter_verses(self, book, chapter, verses):
+        """Play the chapter's pre-rendered audio, or queue its verses for live reading"""
+        self.stop_reading()
+        if not verses:
+            return
+        # audio_cache renders a chapter as its verses joined by spaces
+        text = " ".join(text for _, text in verses)
+        cached = self.audio_cache.lookup(self.audio_cache.key(text, chapter_reference(book, chapter),
+                                                              rate=self.tts.rate))
+        if cached:
+            self.play_audio(cached)
         else:
+            self.tts.speak_many([text for _, text in verses])
+    
+    def review_due_verses(self):
+        """Start a review session over the verses due for spaced repetition"""
+        from review_session import ReviewSession
+        
+        self.worker.submit("review", ReviewSession, get_store(), journal=self.journal,
+                           on_result=self.start_review_session)
+    
+    def start_review_session(self, session):
+        """Begin reviewing once the due queue has been loaded"""
+        self.end_review_session()
+        if len(session) == 0:
+            session.close()
             QMessageBox.information(self, "No Reviews Due", 
                                    "No verses are currently due for review.")
+            return
+        self.review_session = session
+        QMessageBox.information(self, "Review Mode", 
+                               f"Reviewing {len(session)} verses due for repetition.")
+        self.show_next_review_card()
+    
+    def show_next_review_card(self):
+        """Show the next card from the prefetched review buffer"""
+        session = self.review_session
+        self.review_card = session.next_card()
+        if self.review_card is None:
+            reviewed = session.reviewed
+            self.end_review_session()
+            QMessageBox.information(self, "Review Complete", 
+                                   f"Reviewed {reviewed} verses.")
+            return
+        
+        card = self.review_card
+        self.current_book = card.book
+        self.current_chapter = card.chapter
+        self.current_verse = card.verse
+        self.current_text = card.text
+        
+        self.display_verse()
+        self.reset_test_ui()
+        self.feedback_label.setText(f"Review {session.position} of {len(session)}. "
+                                    f"Last interval: {card.interval} days.")
+    
+    def show_review_forecast(self):
+        """Chart the simulated review load for the coming days"""
+        self.worker.submit("forecast", after_flush, self.journal, load_review_forecast,
+                           on_result=self.show_forecast_chart)
+    
+    def show_forecast_chart(self, counts):
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Review Forecast")
+        layout = QVBoxLayout()
+        layout.addWidget(ReviewLoadChart(counts))
+        dialog.setLayout(layout)
+        dialog.exec()
+    
+    def show_performance_report(self):
+        """Show timings of database calls and UI actions so far"""
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Performance Report")
+        layout = QVBoxLayout()
+        report = QTextEdit()
+        report.setReadOnly(True)
+        report.setFont(QFont("Courier New", 10))
+        report.setPlainText(profiler.report() + f"\n\nCalls over {profiler.slow_ms:g} ms are logged "
+                            f"with their query plans in {profiler.slow_log}")
+        report.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
+        layout.addWidget(report)
+        dialog.setLayout(layout)
+        dialog.resize(900, 500)
+        dialog.exec()
+    
+    def end_review_session(self):
+        """Leave review mode, letting pending writes finish"""
+        if self.review_session:
+            self.review_session.close()
+        self.review_session = None
+        self.review_card = None
+    
+    def close_journal(self):
+        """Write any buffered reviews (call on exit)"""
+        if self.journal:
+            self.journal.close()
+
+# Only wrapped once profiling is enabled (BMA_PROFILE=1 or --profile)
+profiler.register(BibleMemoryApp, "ui", exclude=("show_performance_report",), slots=True)
 
 if __name__ == "__main__":
+    if "--profile" in sys.argv:
+        profiler.enable()
+    startup_timer = None
+    if "--startup-benchmark" in sys.argv:
+        # Print startup timings and quit; see benchmarks/bench_startup.py
+        startup_timer = StartupTimer(float(os.environ.get("BMA_STARTUP_T0", 0)) or None)
+        startup_timer.mark("imported")
     app = QApplication(sys.argv)
     window = BibleMemoryApp()
+    if startup_timer:
+        window.startup_timer = startup_timer
+        startup_timer.watch(window)
+    app.aboutToQuit.connect(window.end_review_session)
+    app.aboutToQuit.connect(window.worker.shutdown)
+    app.aboutToQuit.connect(window.close_journal)
+    app.aboutToQuit.connect(window.tts.shutdown)
+    app.aboutToQuit.connect(lambda: get_store().close_all())
+    if StallMonitor.enabled():
+        # Set BMA_STALL_MONITOR=1 to measure how long the UI thread blocks
+        stall_monitor = StallMonitor(app)
+        stall_monitor.start()
+        app.aboutToQuit.connect(lambda: print(stall_monitor.summary()))
+    if profiler.enabled():
+        app.aboutToQuit.connect(lambda: print(profiler.report()))
     window.show()
     sys.exit(app.exec())
 
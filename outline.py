@@ -0,0 +1,53 @@
+# outline.py
+from collections import namedtuple
+
+ChapterInfo = namedtuple("ChapterInfo", ["chapter", "verse_count", "first_verse", "last_verse",
+                                         "first_id", "numbers"])
+
+class BibleOutline:
+    """In-memory book/chapter/verse outline used to fill the navigation selectors"""
+
+    def __init__(self, rows=()):
+        """rows are (book, chapter, verse_count, first_verse, last_verse, first_id, verse_list)
+        in canon order; verse_list is a comma-separated list of verse numbers
+        for chapters with gaps and None otherwise"""
+        self._books = []
+        self._chapters = {}
+        for book, chapter, verse_count, first_verse, last_verse, first_id, verse_list in rows:
+            if book not in self._chapters:
+                self._books.append(book)
+                self._chapters[book] = {}
+            numbers = tuple(sorted(int(v) for v in verse_list.split(","))) if verse_list else None
+            self._chapters[book][chapter] = ChapterInfo(chapter, verse_count, first_verse, last_verse,
+                                                        first_id, numbers)
+
+    def __bool__(self):
+        return bool(self._books)
+
+    def books(self):
+        """Get list of all books in canon order"""
+        return list(self._books)
+
+    def chapters(self, book):
+        """Get all chapter numbers for a book"""
+        return list(self._chapters.get(book, ()))
+
+    def chapter_info(self, book, chapter):
+        """Get the ChapterInfo for a chapter, or None"""
+        return self._chapters.get(book, {}).get(chapter)
+
+    def verses(self, book, chapter):
+        """Get all verse numbers for a chapter"""
+        info = self.chapter_info(book, chapter)
+        if info is None:
+            return []
+        if info.numbers is not None:
+            return list(info.numbers)
+        return list(range(info.first_verse, info.last_verse + 1))
+
+    def verse_count(self, book, chapter=None):
+        """Number of verses in a chapter, or in a whole book if chapter is None"""
+        if chapter is not None:
+            info = self.chapter_info(book, chapter)
+            return info.verse_count if info else 0
+        return sum(info.verse_count for info in self._chapters.get(book, {}).values())
@@ -1,86 +1,35 @@
 # parse_bible.py
-import sqlite3
-import re
 import os
+from database import DB_PATH, DEFAULT_PROFILE, VerseStore, count_lines, profile_path, translation_name
+from verse_parser import parse_file, ParseStats
 
-def ensure_data_dir():
-    if not os.path.exists("data"):
-        os.makedirs("data")
-
-def parse_bible_text(file_path, db_path="data/bible_memory.db"):
+def parse_bible_text(file_path, db_path=DB_PATH, progress=None, profile=DEFAULT_PROFILE):
     """
     Parse a Bible text file and store verses in SQLite database.
     Expected format: "Book Chapter:Verse Text"
     Example: "Genesis 1:1 In the beginning God created the heaven and the earth."
+    Verses are written in one bulk transaction; progress(imported, total) is
+    called as chunks are stored. The memorized verses of the profile (kept
+    beside db_path, see profile_path) are relinked to the new verses; with
+    profile=None, db_path holds the progress too.
     """
-    ensure_data_dir()
-    
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    # Create or clear the table
-    cursor.execute('''CREATE TABLE IF NOT EXISTS verses (
-                      id INTEGER PRIMARY KEY,
-                      book TEXT, 
-                      chapter INTEGER, 
-                      verse INTEGER, 
-                      text TEXT, 
-                      progress INTEGER DEFAULT 0)''')
-    
-    cursor.execute("DELETE FROM verses")  # Clear existing data
-    
-    verse_id = 1
-    skipped_lines = 0
-    processed_lines = 0
-    
-    with open(file_path, 'r', encoding='utf-8') as file:
-        for line in file:
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
-                
-            try:
-                # Try to match various Bible text formats
-                
-                # Format 1: "Genesis 1:1 In the beginning..."
-                match = re.match(r"^(\w+(?:\s+\w+)*)\s+(\d+):(\d+)\s+(.+)$", line)
-                
-                if match:
-                    book, chapter, verse, text = match.groups()
-                    cursor.execute(
-                        "INSERT INTO verses (id, book, chapter, verse, text) VALUES (?, ?, ?, ?, ?)",
-                        (verse_id, book, int(chapter), int(verse), text)
-                    )
-                    verse_id += 1
-                    processed_lines += 1
-                else:
-                    # Format 2: Try to handle alternative formats
-                    parts = line.split(' ', 1)
-                    if len(parts) >= 2:
-                        reference, text = parts
-                        
-                        # Try to parse reference like "Genesis1:1" (no space)
-                        ref_match = re.match(r"^(\w+(?:\s+\w+)*)(\d+):(\d+)$", reference)
-                        if ref_match:
-                            book, chapter, verse = ref_match.groups()
-                            cursor.execute(
-                                "INSERT INTO verses (id, book, chapter, verse, text) VALUES (?, ?, ?, ?, ?)",
-                                (verse_id, book, int(chapter), int(verse), text)
-                            )
-                            verse_id += 1
-                            processed_lines += 1
-                        else:
-                            skipped_lines += 1
-                    else:
-                        skipped_lines += 1
-            except Exception as e:
-                print(f"Error processing line: {line}")
-                print(f"Error: {e}")
-                skipped_lines += 1
-    
-    conn.commit()
-    conn.close()
-    
+    store = VerseStore(db_path, progress_path=profile_path(profile, db_path) if profile else None)
+    moved = store.init_db()
+    if moved:
+        print(f"Moved {moved} memorized verses into profile '{profile}'")
+
+    stats = ParseStats()
+    try:
+        store.bulk_import(parse_file(file_path, stats), progress=progress,
+                          total=count_lines(file_path), translation=translation_name(file_path))
+    finally:
+        store.close_all()
+
+    processed_lines = stats.processed
+    skipped_lines = stats.skipped + stats.errors
+    for line_no, reason, line in stats.samples:
+        print(f"Skipped line {line_no} ({reason}): {line}")
+
     print(f"✅ Bible parsing complete!")
     print(f"Processed: {processed_lines} verses")
     print(f"Skipped: {skipped_lines} lines")
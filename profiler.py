@@ -0,0 +1,331 @@
+# profiler.py
+"""Opt-in timing of database calls and UI actions
+
+Enable with BMA_PROFILE=1 (or `python main.py --profile`). Every public
+VerseStore method and every BibleMemoryApp action is then timed, with the
+rows its SQL returned or changed and the SQL it ran. Calls slower than BMA_SLOW_MS (default 50)
+are written to the slow-query log with their EXPLAIN QUERY PLAN, and a
+summary is saved on exit; `python profiler.py` prints it.
+
+When disabled nothing is wrapped and connections are plain sqlite3 ones,
+so the only cost is one check per new connection.
+"""
+import atexit
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+
+SLOW_LOG_PATH = "data/slow_queries.log"
+REPORT_PATH = "data/profile.json"
+SLOW_MS = 50.0
+WINDOW = 1000         # recent samples kept per name for percentiles
+MAX_STATEMENTS = 20   # SQL kept per call; bulk imports run thousands
+MAX_SQL_CHARS = 300
+
+def percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+class _Cursor(sqlite3.Cursor):
+    """Cursor that adds the rows it fetches or changes to the current call's count"""
+
+    def _count(self, rows):
+        self.connection.profiler._add_rows(rows)
+
+    def execute(self, *args):
+        super().execute(*args)
+        # rowcount is -1 for queries; for writes it is the rows changed
+        self._count(max(self.rowcount, 0))
+        return self
+
+    def executemany(self, *args):
+        super().executemany(*args)
+        self._count(max(self.rowcount, 0))
+        return self
+
+    def fetchone(self):
+        row = super().fetchone()
+        self._count(row is not None)
+        return row
+
+    def fetchmany(self, *args):
+        rows = super().fetchmany(*args)
+        self._count(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        self._count(len(rows))
+        return rows
+
+    def __next__(self):
+        row = super().__next__()
+        self._count(1)
+        return row
+
+class _Connection(sqlite3.Connection):
+    # Connection.execute makes a plain cursor, so it is routed through cursor()
+    def cursor(self, factory=_Cursor):
+        return super().cursor(factory)
+
+    def execute(self, *args):
+        return self.cursor().execute(*args)
+
+    def executemany(self, *args):
+        return self.cursor().executemany(*args)
+
+class _Stat:
+    def __init__(self, window):
+        self.calls = 0
+        self.rows = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.slow = 0
+        self.samples = deque(maxlen=window)
+
+    def summary(self):
+        ordered = sorted(self.samples)
+        return {"calls": self.calls, "rows": self.rows, "slow": self.slow,
+                "total_ms": round(self.total_ms, 3), "max_ms": round(self.max_ms, 3),
+                "p50_ms": round(percentile(ordered, 0.5), 3),
+                "p95_ms": round(percentile(ordered, 0.95), 3),
+                "p99_ms": round(percentile(ordered, 0.99), 3)}
+
+class Profiler:
+    """Rolling per-name timings plus a slow-query log"""
+
+    def __init__(self, slow_ms=SLOW_MS, window=WINDOW, slow_log=SLOW_LOG_PATH, report_path=REPORT_PATH):
+        self.slow_ms = slow_ms
+        self.window = window
+        self.slow_log = slow_log
+        self.report_path = report_path
+        self._enabled = False
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._targets = []
+
+    def enabled(self):
+        return self._enabled
+
+    def enable(self, slow_ms=None):
+        """Start profiling; wraps every registered class"""
+        if slow_ms is not None:
+            self.slow_ms = slow_ms
+        if self._enabled:
+            return
+        self._enabled = True
+        for target in self._targets:
+            self._instrument(*target)
+        atexit.register(self.save)
+
+    def register(self, cls, prefix, connection=None, exclude=(), slots=False):
+        """Time cls's public methods as "prefix.name" once profiling is enabled
+
+        connection(instance) returns the SQLite connection used to explain
+        slow calls; without it they are logged without SQL. Set slots for
+        Qt classes whose methods are connected to signals.
+        """
+        target = (cls, prefix, connection, exclude, slots)
+        self._targets.append(target)
+        if self._enabled:
+            self._instrument(*target)
+
+    def _instrument(self, cls, prefix, connection, exclude, slots):
+        import inspect
+
+        for name, fn in list(vars(cls).items()):
+            if name.startswith("_") or name in exclude or not inspect.isfunction(fn):
+                continue
+            setattr(cls, name, self._wrap(fn, f"{prefix}.{name}", connection, slots))
+
+    def _wrap(self, fn, name, connection, slots=False):
+        import inspect
+
+        # Qt passes signal arguments to slots that can take them, so for
+        # slots the wrapper drops any the original method would not have accepted
+        positional = None
+        if slots:
+            params = inspect.signature(fn).parameters.values()
+            if not any(p.kind == p.VAR_POSITIONAL for p in params):
+                positional = sum(1 for p in params if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD))
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if positional is not None:
+                args = args[:positional]
+            stack = self._stack()
+            stack.append([0, [], 0])
+            start = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            finally:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                count, statements, rows = stack.pop()
+                if stack:
+                    # Nested calls' SQL also counts towards the caller
+                    stack[-1][0] += count
+                    stack[-1][1].extend(statements[:MAX_STATEMENTS - len(stack[-1][1])])
+                    stack[-1][2] += rows
+            slow = elapsed_ms >= self.slow_ms
+            self._record(name, elapsed_ms, rows, slow)
+            if slow:
+                conn = connection(args[0]) if connection and args else None
+                self._log_slow(name, elapsed_ms, rows, count, statements, conn)
+            return result
+        return wrapper
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def connect(self, *args, **kwargs):
+        """sqlite3.connect, capturing the SQL run and rows returned when profiling is enabled"""
+        if not self._enabled:
+            return sqlite3.connect(*args, **kwargs)
+        conn = sqlite3.connect(*args, factory=_Connection, **kwargs)
+        conn.profiler = self
+        conn.set_trace_callback(self._trace)
+        return conn
+
+    def _add_rows(self, rows):
+        stack = getattr(self._local, "stack", None)
+        if stack:
+            stack[-1][2] += rows
+
+    def _trace(self, sql):
+        stack = getattr(self._local, "stack", None)
+        # Statements starting "--" are run internally by virtual tables (FTS5)
+        if stack and not sql.startswith("--"):
+            entry = stack[-1]
+            entry[0] += 1
+            if len(entry[1]) < MAX_STATEMENTS:
+                entry[1].append(sql)
+
+    def _record(self, name, elapsed_ms, rows, slow=False):
+        with self._lock:
+            stat = self._stats.get(name)
+            if stat is None:
+                stat = self._stats[name] = _Stat(self.window)
+            stat.calls += 1
+            stat.rows += rows
+            stat.total_ms += elapsed_ms
+            stat.max_ms = max(stat.max_ms, elapsed_ms)
+            stat.slow += slow
+            stat.samples.append(elapsed_ms)
+
+    def _explain(self, conn, sql):
+        if not sql.lstrip().upper().startswith(("SELECT", "WITH")):
+            return []
+        # Keep the EXPLAIN itself out of the caller's statements
+        stack, self._local.stack = self._local.stack, []
+        try:
+            return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+        except sqlite3.Error as e:
+            return [f"(no plan: {e})"]
+        finally:
+            self._local.stack = stack
+
+    def _log_slow(self, name, elapsed_ms, rows, count, statements, conn):
+        lines = [f"{time.strftime('%Y-%m-%d %H:%M:%S')} {name} {elapsed_ms:.1f} ms, "
+                 f"{rows} rows, {count} statements"]
+        for sql in statements:
+            sql = " ".join(sql.split())
+            lines.append("  SQL: " + (sql if len(sql) <= MAX_SQL_CHARS else sql[:MAX_SQL_CHARS] + "..."))
+            if conn is not None:
+                lines.extend("    plan: " + detail for detail in self._explain(conn, sql))
+        if count > len(statements):
+            lines.append(f"  ... {count - len(statements)} more statements")
+        directory = os.path.dirname(self.slow_log)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock, open(self.slow_log, "a", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+
+    def action(self, name):
+        """Time a block of code: `with profiler.action("ui.import"): ...`"""
+        return _Action(self, name)
+
+    def summary(self):
+        """{name: stats} for everything recorded so far"""
+        with self._lock:
+            return {name: stat.summary() for name, stat in self._stats.items()}
+
+    def report(self):
+        return format_report(self.summary())
+
+    def save(self):
+        """Write the summary to report_path"""
+        summary = self.summary()
+        if not summary:
+            return
+        directory = os.path.dirname(self.report_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.report_path, "w", encoding="utf-8") as file:
+            json.dump({"slow_ms": self.slow_ms, "stats": summary}, file, indent=2)
+
+class _Action:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.profiler.enabled():
+            elapsed_ms = (time.perf_counter() - self.start) * 1000
+            self.profiler._record(self.name, elapsed_ms, 0, elapsed_ms >= self.profiler.slow_ms)
+        return False
+
+def format_report(summary):
+    """A text table of summary(), slowest total time first"""
+    if not summary:
+        return "No calls recorded."
+    width = max(len(name) for name in summary)
+    lines = [f"{'name':{width}} {'calls':>7} {'rows':>8} {'p50 ms':>8} {'p95 ms':>8} "
+             f"{'p99 ms':>8} {'max ms':>8} {'total ms':>10} {'slow':>5}"]
+    for name, stat in sorted(summary.items(), key=lambda item: -item[1]["total_ms"]):
+        lines.append(f"{name:{width}} {stat['calls']:7} {stat['rows']:8} {stat['p50_ms']:8.2f} "
+                     f"{stat['p95_ms']:8.2f} {stat['p99_ms']:8.2f} {stat['max_ms']:8.2f} "
+                     f"{stat['total_ms']:10.1f} {stat['slow']:5}")
+    return "\n".join(lines)
+
+profiler = Profiler(slow_ms=float(os.environ.get("BMA_SLOW_MS", SLOW_MS)))
+if os.environ.get("BMA_PROFILE", "") not in ("", "0"):
+    profiler.enable()
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Print the timings saved by the last profiled run")
+    parser.add_argument("path", nargs="?", default=REPORT_PATH)
+    parser.add_argument("--slow", type=int, default=0, metavar="N",
+                        help="Also print the last N entries of the slow-query log")
+    args = parser.parse_args()
+
+    try:
+        with open(args.path, encoding="utf-8") as file:
+            saved = json.load(file)
+    except FileNotFoundError:
+        print(f"No profile at {args.path}; run the app with BMA_PROFILE=1 first")
+        return
+    print(format_report(saved["stats"]))
+    if args.slow and os.path.exists(SLOW_LOG_PATH):
+        with open(SLOW_LOG_PATH, encoding="utf-8") as file:
+            entries = file.read().replace("\n  ", "\x00  ").splitlines()
+        print(f"\nSlowest calls over {saved['slow_ms']:g} ms ({SLOW_LOG_PATH}):")
+        for entry in entries[-args.slow:]:
+            print(entry.replace("\x00", "\n"))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# reading_view.py
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, QRect, QSize, Qt, pyqtSignal
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import QAbstractItemView, QListView, QStyledItemDelegate
+
+MEMORIZED_COLOR = QColor("#3a9a4a")
+DUE_COLOR = QColor("#d07000")
+
+class VerseListModel(QAbstractListModel):
+    """The verses of a chapter or a whole book, with text loaded a chapter at a time
+
+    Rows come from the outline, so the model is complete before any text
+    is loaded. Asking for the text of a row emits chapter_needed once for
+    its chapter; the owner loads it and hands it back with add_chapter.
+    """
+
+    TextRole = Qt.ItemDataRole.UserRole + 1
+    LabelRole = Qt.ItemDataRole.UserRole + 2
+
+    chapter_needed = pyqtSignal(str, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.book = None
+        self.chapters = ()
+        self._rows = []
+        self._row_of = {}
+        self._texts = {}
+        self._requested = set()
+        self._status = {}
+
+    def set_range(self, outline, book, chapters):
+        """Show the given chapters of a book; returns False if already shown"""
+        chapters = tuple(chapters)
+        if (book, chapters) == (self.book, self.chapters):
+            return False
+        self.beginResetModel()
+        self.book = book
+        self.chapters = chapters
+        self._rows = [(chapter, verse) for chapter in chapters for verse in outline.verses(book, chapter)]
+        self._row_of = {ref: row for row, ref in enumerate(self._rows)}
+        self._texts = {}
+        self._requested = set()
+        self._status = {}
+        self.endResetModel()
+        return True
+
+    def clear(self):
+        """Forget everything, e.g. after an import replaced the verses"""
+        self.beginResetModel()
+        self.book = None
+        self.chapters = ()
+        self._rows = []
+        self._row_of = {}
+        self._texts = {}
+        self._requested = set()
+        self._status = {}
+        self.endResetModel()
+
+    def add_chapter(self, book, chapter, verses):
+        """Store [(verse, text)] loaded for a chapter"""
+        if book != self.book:
+            return
+        for verse, text in verses:
+            self._texts[(chapter, verse)] = text
+        # Loaded text changes row heights, so the view has to lay out again
+        self.layoutAboutToBeChanged.emit()
+        self.layoutChanged.emit()
+
+    def set_status(self, status):
+        """Set {(chapter, verse): due} for the memorized verses of the book"""
+        self._status = status
+        if self._rows:
+            self.dataChanged.emit(self.index(0), self.index(len(self._rows) - 1))
+
+    def mark(self, book, chapter, verse, due):
+        """Update the marker of one verse after it was memorized or reviewed"""
+        row = self.row_for(chapter, verse) if book == self.book else None
+        if row is not None:
+            self._status[(chapter, verse)] = due
+            self.dataChanged.emit(self.index(row), self.index(row))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def row_for(self, chapter, verse):
+        return self._row_of.get((chapter, verse))
+
+    def reference(self, row):
+        """(book, chapter, verse, text or None) for a row"""
+        chapter, verse = self._rows[row]
+        return self.book, chapter, verse, self._texts.get((chapter, verse))
+
+    def _label(self, chapter, verse, text):
+        number = str(verse) if len(self.chapters) == 1 else f"{chapter}:{verse}"
+        return f"{number}  {text if text is not None else '...'}"
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        chapter, verse = self._rows[index.row()]
+        text = self._texts.get((chapter, verse))
+        if role == Qt.ItemDataRole.DisplayRole:
+            # Only painted rows ask for this role, so only they load text
+            if text is None and chapter not in self._requested:
+                self._requested.add(chapter)
+                self.chapter_needed.emit(self.book, chapter)
+            return self._label(chapter, verse, text)
+        if role == self.LabelRole:
+            return self._label(chapter, verse, text) if text is not None else None
+        if role == self.TextRole:
+            return text
+        due = self._status.get((chapter, verse))
+        if role == Qt.ItemDataRole.DecorationRole and due is not None:
+            return DUE_COLOR if due else MEMORIZED_COLOR
+        if role == Qt.ItemDataRole.ToolTipRole and due is not None:
+            return "Due for review" if due else "Memorized"
+        return None
+
+class VerseDelegate(QStyledItemDelegate):
+    """Sizes rows from their wrapped text without loading rows that are not shown"""
+
+    PLACEHOLDER_LINES = 2
+
+    def sizeHint(self, option, index):
+        view = self.parent()
+        # Leave room for the marker and the vertical scroll bar
+        width = max(view.viewport().width() - 2 * option.decorationSize.width() - 8, 80)
+        label = index.data(VerseListModel.LabelRole)
+        if label is None:
+            height = option.fontMetrics.lineSpacing() * self.PLACEHOLDER_LINES
+        else:
+            height = option.fontMetrics.boundingRect(QRect(0, 0, width, 1 << 20),
+                                                     Qt.TextFlag.TextWordWrap, label).height()
+        return QSize(width, height + 6)
+
+class ReadingView(QListView):
+    """List view for a VerseListModel that lays rows out in batches"""
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.setModel(model)
+        self.setItemDelegate(VerseDelegate(self))
+        self.setWordWrap(True)
+        self.setUniformItemSizes(False)
+        # Large books are laid out a batch at a time between events
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setBatchSize(200)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+
+    def show_verse(self, chapter, verse):
+        """Select and scroll to a verse without emitting clicked"""
+        row = self.model().row_for(chapter, verse)
+        if row is not None:
+            index = self.model().index(row)
+            self.setCurrentIndex(index)
+            self.scrollTo(index, QAbstractItemView.ScrollHint.PositionAtCenter)
@@ -0,0 +1,259 @@
+# references.py
+"""Parse Bible references such as "Jn 3:16-18; Rom 8:28-39" or "Ps 23"
+
+Book names are resolved through an alias table built once per outline: the
+usual abbreviations of the 66 books plus every unambiguous prefix of each
+book name, keyed by a normalized form ("1 Jn", "1Jn." and "First John" all
+become "1jn"). Names that match nothing are tried against the full names
+and longer aliases allowing for typos, so "Philipians" is Philippians. A parsed reference is a list of Passages, each of which maps
+to one contiguous range of verse ids, so a whole passage is one range read.
+"""
+import bisect
+import re
+from collections import namedtuple
+from fuzzy import FuzzyIndex
+
+Passage = namedtuple("Passage", ["book", "start_chapter", "start_verse", "end_chapter", "end_verse"])
+Passage.__doc__ = "A span of verses; verse numbers of None mean from the start or to the end of the chapter"
+
+# Canonical names with their common abbreviations (SBL and the usual short forms)
+BOOK_ALIASES = {
+    "Genesis": ["Gen", "Ge", "Gn"],
+    "Exodus": ["Exod", "Ex", "Exo"],
+    "Leviticus": ["Lev", "Le", "Lv"],
+    "Numbers": ["Num", "Nu", "Nm", "Nb"],
+    "Deuteronomy": ["Deut", "Dt", "De"],
+    "Joshua": ["Josh", "Jos", "Jsh"],
+    "Judges": ["Judg", "Jdg", "Jg", "Jdgs"],
+    "Ruth": ["Rth", "Ru"],
+    "1 Samuel": ["1 Sam", "1 Sa", "1 Sm", "1 S"],
+    "2 Samuel": ["2 Sam", "2 Sa", "2 Sm", "2 S"],
+    "1 Kings": ["1 Kgs", "1 Ki", "1 Kin", "1 K"],
+    "2 Kings": ["2 Kgs", "2 Ki", "2 Kin", "2 K"],
+    "1 Chronicles": ["1 Chr", "1 Chron", "1 Ch"],
+    "2 Chronicles": ["2 Chr", "2 Chron", "2 Ch"],
+    "Ezra": ["Ezr"],
+    "Nehemiah": ["Neh", "Ne"],
+    "Esther": ["Esth", "Est", "Es"],
+    "Job": ["Jb"],
+    "Psalms": ["Psalm", "Ps", "Psa", "Pss", "Psm"],
+    "Proverbs": ["Prov", "Pro", "Prv", "Pr"],
+    "Ecclesiastes": ["Eccl", "Eccles", "Ecc", "Ec", "Qoh"],
+    "Song of Solomon": ["Song", "Song of Songs", "SOS", "Canticles", "Cant"],
+    "Isaiah": ["Isa", "Is"],
+    "Jeremiah": ["Jer", "Je", "Jr"],
+    "Lamentations": ["Lam", "La"],
+    "Ezekiel": ["Ezek", "Eze", "Ezk"],
+    "Daniel": ["Dan", "Da", "Dn"],
+    "Hosea": ["Hos", "Ho"],
+    "Joel": ["Jl"],
+    "Amos": ["Am"],
+    "Obadiah": ["Obad", "Ob"],
+    "Jonah": ["Jon", "Jnh"],
+    "Micah": ["Mic", "Mc"],
+    "Nahum": ["Nah", "Na"],
+    "Habakkuk": ["Hab", "Hb"],
+    "Zephaniah": ["Zeph", "Zep", "Zp"],
+    "Haggai": ["Hag", "Hg"],
+    "Zechariah": ["Zech", "Zec", "Zc"],
+    "Malachi": ["Mal", "Ml"],
+    "Matthew": ["Matt", "Mat", "Mt"],
+    "Mark": ["Mk", "Mrk", "Mar"],
+    "Luke": ["Lk", "Luk"],
+    "John": ["Jn", "Jhn", "Joh"],
+    "Acts": ["Act", "Ac"],
+    "Romans": ["Rom", "Ro", "Rm"],
+    "1 Corinthians": ["1 Cor", "1 Co"],
+    "2 Corinthians": ["2 Cor", "2 Co"],
+    "Galatians": ["Gal", "Ga"],
+    "Ephesians": ["Eph", "Ephes"],
+    "Philippians": ["Phil", "Php", "Pp"],
+    "Colossians": ["Col", "Co"],
+    "1 Thessalonians": ["1 Thess", "1 Thes", "1 Th"],
+    "2 Thessalonians": ["2 Thess", "2 Thes", "2 Th"],
+    "1 Timothy": ["1 Tim", "1 Ti"],
+    "2 Timothy": ["2 Tim", "2 Ti"],
+    "Titus": ["Tit", "Ti"],
+    "Philemon": ["Phlm", "Philem", "Phm"],
+    "Hebrews": ["Heb"],
+    "James": ["Jas", "Jm"],
+    "1 Peter": ["1 Pet", "1 Pe", "1 Pt"],
+    "2 Peter": ["2 Pet", "2 Pe", "2 Pt"],
+    "1 John": ["1 Jn", "1 Jhn", "1 Jo"],
+    "2 John": ["2 Jn", "2 Jhn", "2 Jo"],
+    "3 John": ["3 Jn", "3 Jhn", "3 Jo"],
+    "Jude": ["Jud", "Jd"],
+    "Revelation": ["Rev", "Re", "Rv", "Revelations", "Revelation of John", "Apocalypse"],
+}
+
+ORDINALS = re.compile(r"^(first|1st|iii|ii|i|second|2nd|third|3rd)\s+")
+ORDINAL_NUMBERS = {"first": "1", "1st": "1", "i": "1", "second": "2", "2nd": "2", "ii": "2",
+                   "third": "3", "3rd": "3", "iii": "3"}
+# A book name (possibly numbered) followed by chapter and verse numbers
+PART_PATTERN = re.compile(r"^\s*(?P<book>(?:[1-3]\s*)?[^\W\d_][^\d]*?)?\s*(?P<refs>\d[\d\s:,\-–]*)$")
+ITEM_PATTERN = re.compile(r"^(\d+)(?::(\d+))?$")
+MIN_PREFIX = 2
+# Shorter names are abbreviations, too close to each other to correct
+MIN_FUZZY = 4
+
+def book_key(name):
+    """Normalize a book name for lookup: "1 Jn.", "1Jn" and "First John" -> "1jn", "1john" """
+    key = name.lower().replace(".", " ").strip()
+    key = ORDINALS.sub(lambda match: ORDINAL_NUMBERS[match.group(1)], key)
+    return "".join(key.split())
+
+def _canonical_keys():
+    keys = {}
+    for name, aliases in BOOK_ALIASES.items():
+        for alias in [name] + aliases:
+            keys[book_key(alias)] = name
+    return keys
+
+CANONICAL_KEYS = _canonical_keys()
+
+class BookIndex:
+    """Resolve typed book names to the book names of an outline"""
+
+    def __init__(self, outline):
+        self.outline = outline
+        exact = {}
+        prefixes = {}
+        for book in outline.books():
+            key = book_key(book)
+            canonical = CANONICAL_KEYS.get(key)
+            names = [book]
+            if canonical:
+                names += [canonical] + BOOK_ALIASES[canonical]
+            for name in names:
+                exact.setdefault(book_key(name), book)
+            for end in range(MIN_PREFIX, len(key)):
+                prefixes.setdefault(key[:end], set()).add(book)
+        # Exact names and aliases win; a prefix only counts if it names one book
+        self._keys = {prefix: books.pop() for prefix, books in prefixes.items() if len(books) == 1}
+        self._keys.update(exact)
+        self._exact = exact
+        self._fuzzy = None
+
+    def resolve(self, name):
+        """The outline's name for a typed book name, or None"""
+        key = book_key(name)
+        book = self._keys.get(key)
+        if book is None and len(key) >= MIN_FUZZY:
+            book = self._closest(key)
+        return book
+
+    def _closest(self, key):
+        """The one book whose name is nearest a misspelled key, or None if none or several are"""
+        if self._fuzzy is None:
+            self._fuzzy = FuzzyIndex(name for name in self._exact if len(name) >= MIN_FUZZY)
+        matches = self._fuzzy.matches(key, limit=len(self._fuzzy.words))
+        books = {self._exact[name] for distance, name in matches if distance == matches[0][0]}
+        return books.pop() if len(books) == 1 else None
+
+def _item(text):
+    match = ITEM_PATTERN.match(text.strip())
+    if match is None:
+        raise ValueError(f"'{text.strip()}' is not a chapter or verse")
+    first, second = match.groups()
+    return int(first), None if second is None else int(second)
+
+def parse_references(text, index):
+    """Parse "Jn 3:16-18, 20; Rom 8:28-39; Ps 23" into a list of Passages
+
+    Parts separated by ';' may leave out the book to continue the previous
+    one; items separated by ',' continue the previous chapter when it gave
+    verses. In books of one chapter a lone number is a verse ("Jude 3").
+    Raises ValueError if the text is not a reference to books of the index.
+    """
+    passages = []
+    book = None
+    for part in text.split(";"):
+        if not part.strip():
+            continue
+        match = PART_PATTERN.match(part)
+        if match is None:
+            raise ValueError(f"'{part.strip()}' is not a reference")
+        if match.group("book"):
+            book = index.resolve(match.group("book"))
+            if book is None:
+                raise ValueError(f"Unknown book '{match.group('book').strip()}'")
+        elif book is None:
+            raise ValueError(f"'{part.strip()}' does not name a book")
+        chapters = index.outline.chapters(book)
+        single = chapters[0] if len(chapters) == 1 else None
+        chapter = None
+        for item in match.group("refs").split(","):
+            start, _, end = item.replace("–", "-").partition("-")
+            first, second = _item(start)
+            if second is not None:
+                chapter, start_verse = first, second
+            elif chapter is not None or single:
+                # A lone number after verses, or in a one-chapter book, is a verse
+                chapter, start_verse = chapter or single, first
+            else:
+                chapter, start_verse = first, None
+            end_chapter, end_verse = chapter, start_verse
+            if end:
+                first, second = _item(end)
+                if second is not None:
+                    end_chapter, end_verse = first, second
+                elif start_verse is not None:
+                    end_verse = first
+                else:
+                    end_chapter = first
+            if (end_chapter, end_verse or 0) < (chapter, start_verse or 0):
+                raise ValueError(f"'{item.strip()}' runs backwards")
+            passages.append(Passage(book, chapter, start_verse, end_chapter, end_verse))
+            if start_verse is None:
+                # After whole chapters, a following number is another chapter
+                chapter = None
+            else:
+                chapter = end_chapter
+    if not passages:
+        raise ValueError("No reference given")
+    return passages
+
+def format_passage(passage):
+    """"John 3:16-18", "Romans 8", "John 3:16-4:2" """
+    book, start_chapter, start_verse, end_chapter, end_verse = passage
+    start = f"{start_chapter}" if start_verse is None else f"{start_chapter}:{start_verse}"
+    if (end_chapter, end_verse) == (start_chapter, start_verse):
+        return f"{book} {start}"
+    if end_chapter == start_chapter and start_verse is not None:
+        end = str(end_verse)
+    else:
+        end = f"{end_chapter}" if end_verse is None else f"{end_chapter}:{end_verse}"
+    return f"{book} {start}-{end}"
+
+def _verse_id(info, verse, last):
+    """Id of a verse in a chapter, moving to the nearest verse inside the span"""
+    numbers = info.numbers or range(info.first_verse, info.last_verse + 1)
+    if verse is None:
+        position = len(numbers) - 1 if last else 0
+    elif last:
+        position = bisect.bisect_right(numbers, verse) - 1
+    else:
+        position = bisect.bisect_left(numbers, verse)
+    if not 0 <= position < len(numbers):
+        return None
+    # Ids encode the verse number, counted from the chapter's first verse
+    return info.first_id - info.first_verse + numbers[position]
+
+def passage_ids(outline, passage):
+    """(first id, last id) of the verses a passage covers, or None if it covers none
+
+    Chapters past the end of the book are left out, so "Ps 150-200" is Psalm 150.
+    """
+    chapters = [chapter for chapter in outline.chapters(passage.book)
+                if passage.start_chapter <= chapter <= passage.end_chapter]
+    if not chapters:
+        return None
+    first_info = outline.chapter_info(passage.book, chapters[0])
+    last_info = outline.chapter_info(passage.book, chapters[-1])
+    start_verse = passage.start_verse if chapters[0] == passage.start_chapter else None
+    end_verse = passage.end_verse if chapters[-1] == passage.end_chapter else None
+    first = _verse_id(first_info, start_verse, last=False)
+    last = _verse_id(last_info, end_verse, last=True)
+    if first is None or last is None or last < first:
+        return None
+    return first, last
@@ -0,0 +1,207 @@
+# review_journal.py
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+
+from database import sm2
+
+JOURNAL_FILE = "review_journal.log"
+FLUSH_INTERVAL = 30.0   # seconds
+FLUSH_THRESHOLD = 50    # pending reviews
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"  # same as SQLite CURRENT_TIMESTAMP (UTC)
+
+def _now():
+    return datetime.now(timezone.utc).replace(microsecond=0)
+
+class ReviewJournal:
+    """Write-behind buffer for spaced-repetition updates
+
+    Reviews update an in-memory copy of the schedule immediately and are
+    appended to a journal file; they reach SQLite in batched transactions
+    on a timer, once enough are pending, and on close(). Each journal entry
+    holds the resulting schedule rather than the grade, so replaying an
+    entry twice is harmless, and any entries left by a crash are replayed
+    when the journal is next opened.
+    """
+
+    def __init__(self, store, path=None, flush_interval=FLUSH_INTERVAL,
+                 flush_threshold=FLUSH_THRESHOLD, fsync=False):
+        self.store = store
+        # By default the journal sits next to the database it is flushed to
+        self.path = path or os.path.join(os.path.dirname(store.progress_path), JOURNAL_FILE)
+        self.flush_threshold = flush_threshold
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = {}
+        self._wake = threading.Event()
+        self._closed = False
+
+        # Keyed by the verse's reference, the same in every translation
+        self.state = {ref: [ease_factor, interval]
+                      for ref, ease_factor, interval in store.connection().execute(
+                          "SELECT ref, ease_factor, interval FROM memorized_verses WHERE ref IS NOT NULL")}
+
+        self._replay()
+        self._file = self._open()
+
+        self._thread = None
+        if flush_interval:
+            self._thread = threading.Thread(target=self._run, args=(flush_interval,),
+                                            name="review-journal", daemon=True)
+            self._thread.start()
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return open(self.path, "a", encoding="utf-8")
+
+    def _replay(self):
+        """Apply entries left over from a previous run"""
+        entries = []
+        for path in (self.path + ".flushing", self.path):
+            if not os.path.exists(path):
+                continue
+            with open(path, encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        break  # A torn final line from a crash mid-write
+        for entry in entries:
+            if "ref" not in entry:
+                # Written before entries carried their reference
+                entry["ref"] = self.store.reference(entry["book"], entry["chapter"], entry["verse"])
+                if entry["ref"] is None:
+                    continue
+            key = entry["ref"]
+            self.state[key] = [entry["ease_factor"], entry["interval"]]
+            self._pending[key] = entry
+        if entries:
+            self._write(list(self._pending.values()))
+            self._pending.clear()
+        for path in (self.path + ".flushing", self.path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _append(self, key, book, chapter, verse, ease_factor, interval):
+        reviewed = _now()
+        entry = {"ref": key, "book": book, "chapter": chapter, "verse": verse,
+                 "ease_factor": ease_factor, "interval": interval,
+                 "last_reviewed": reviewed.strftime(TIME_FORMAT),
+                 "next_due": (reviewed + timedelta(days=interval)).strftime(TIME_FORMAT)}
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("review journal is closed")
+            self.state[key] = [ease_factor, interval]
+            self._file.write(json.dumps(entry) + "\n")
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._pending[key] = entry
+            pending = len(self._pending)
+        if pending >= self.flush_threshold:
+            self._wake.set()
+
+    def record_review(self, book, chapter, verse, quality):
+        """Apply an SM-2 review graded 0-5; unknown verses are ignored"""
+        key = self.store.reference(book, chapter, verse)
+        current = self.state.get(key)
+        if current is None:
+            return None
+        ease_factor, interval = sm2(current[0], current[1], quality)
+        self._append(key, book, chapter, verse, ease_factor, interval)
+        return ease_factor, interval
+
+    def mark_memorized(self, book, chapter, verse):
+        """Add a verse to the review list, or restart its schedule"""
+        key = self.store.reference(book, chapter, verse)
+        if key is not None:
+            self._append(key, book, chapter, verse, 2.5, 1)
+
+    def pending(self):
+        return len(self._pending)
+
+    def _write(self, entries):
+        conn = self.store.connection()
+        # Verses are linked in the translation being studied
+        first = self.store.translation_range()[0]
+        rows = [dict(entry, first=first) for entry in entries]
+        try:
+            conn.execute("BEGIN")
+            conn.executemany("""
+                INSERT INTO memorized_verses
+                    (book, chapter, verse, ref, verse_id, last_reviewed, ease_factor, interval, next_due)
+                VALUES (:book, :chapter, :verse, :ref, (SELECT id FROM verses WHERE id = :first + :ref),
+                        :last_reviewed, :ease_factor, :interval, :next_due)
+                ON CONFLICT (ref) DO UPDATE
+                SET book=excluded.book,
+                    chapter=excluded.chapter,
+                    verse=excluded.verse,
+                    verse_id=excluded.verse_id,
+                    last_reviewed=excluded.last_reviewed,
+                    ease_factor=excluded.ease_factor,
+                    interval=excluded.interval,
+                    next_due=excluded.next_due""", rows)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        self.store.invalidate_random_cache()
+
+    def flush(self):
+        """Write pending reviews to SQLite in one transaction"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                # Start a fresh journal; the old one is kept until the commit lands
+                self._file.close()
+                os.replace(self.path, self.path + ".flushing")
+                self._file = self._open()
+                entries = list(self._pending.values())
+                self._pending = {}
+            try:
+                self._write(entries)
+            except Exception:
+                # Put the entries back, in the live journal too, so the next
+                # flush (or a replay) still has them
+                with self._lock:
+                    for entry in entries:
+                        key = entry["ref"]
+                        if key not in self._pending:
+                            self._pending[key] = entry
+                            self._file.write(json.dumps(entry) + "\n")
+                    self._file.flush()
+                os.remove(self.path + ".flushing")
+                raise
+            os.remove(self.path + ".flushing")
+            return len(entries)
+
+    def _run(self, interval):
+        while not self._closed:
+            self._wake.wait(interval)
+            self._wake.clear()
+            if self._closed:
+                break
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Error saving reviews: {e}")
+        # Connections belong to the thread that opened them
+        self.store.close()
+
+    def close(self):
+        """Flush everything and stop the background thread (call on exit)"""
+        if self._closed:
+            return
+        self.flush()
+        with self._lock:
+            self._closed = True
+            self._file.close()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,93 @@
+# review_session.py
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+ReviewCard = namedtuple("ReviewCard", ["verse_id", "book", "chapter", "verse", "text", "ease_factor", "interval"])
+
+class ReviewSession:
+    """A day's review: the due queue is loaded once and verse text is prefetched
+
+    Cards come from an in-memory buffer that a background thread tops up as
+    it drains. Results go to a ReviewJournal when one is given, otherwise
+    they are written on the prefetch thread, so next_card() and record()
+    do not touch the database on the caller's thread.
+    """
+
+    def __init__(self, store, buffer_size=20, refill_at=5, limit=None, journal=None):
+        self.store = store
+        self.journal = journal
+        if journal is not None:
+            # The due queue must reflect reviews still waiting to be written
+            journal.flush()
+        self.buffer_size = buffer_size
+        self.refill_at = refill_at
+        self.queue = store.get_due_queue(limit)
+        self.results = []
+        self.position = 0
+        self._next_index = 0
+        self._buffer = deque()
+        self._lock = threading.Lock()
+        self._refilling = False
+        # One thread keeps prefetches and writes in order
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="review")
+        self._fill()
+
+    def __len__(self):
+        return len(self.queue)
+
+    @property
+    def reviewed(self):
+        return len(self.results)
+
+    @property
+    def remaining(self):
+        return len(self.queue) - len(self.results)
+
+    def _fill(self):
+        """Load text for the next slice of the queue into the buffer"""
+        with self._lock:
+            start = self._next_index
+            end = min(start + self.buffer_size - len(self._buffer), len(self.queue))
+            self._next_index = max(end, start)
+        if end <= start:
+            return
+        entries = self.queue[start:end]
+        texts = self.store.get_verse_texts([entry[0] for entry in entries])
+        for verse_id, book, chapter, verse, ease_factor, interval in entries:
+            self._buffer.append(ReviewCard(verse_id, book, chapter, verse,
+                                           texts.get(verse_id, ""), ease_factor, interval))
+
+    def _background_fill(self):
+        try:
+            self._fill()
+        finally:
+            self._refilling = False
+
+    def next_card(self):
+        """Return the next ReviewCard, or None when the session is finished"""
+        if not self._buffer and self._next_index < len(self.queue):
+            # Only happens if cards are taken faster than the prefetch runs
+            self._executor.submit(self._fill).result()
+        if not self._buffer:
+            return None
+        card = self._buffer.popleft()
+        self.position += 1
+        if len(self._buffer) < self.refill_at and not self._refilling and self._next_index < len(self.queue):
+            self._refilling = True
+            self._executor.submit(self._background_fill)
+        return card
+
+    def record(self, card, quality):
+        """Record a graded review (quality 0-5) and save it in the background"""
+        self.results.append((card, quality))
+        if self.journal is not None:
+            self.journal.record_review(card.book, card.chapter, card.verse, quality)
+            return
+        self._executor.submit(self.store.update_spaced_repetition,
+                              card.book, card.chapter, card.verse, quality)
+
+    def close(self):
+        """Wait for pending writes to finish and release the thread's connection"""
+        self._executor.submit(self.store.close)
+        self._executor.shutdown(wait=True)
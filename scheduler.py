@@ -0,0 +1,118 @@
+# scheduler.py
+from collections import namedtuple
+
+import numpy as np
+
+# Parameters of the SM-2 variant used by database.sm2; changing them here
+# lets the whole collection be re-simulated under a different schedule
+SM2Params = namedtuple("SM2Params", ["min_ease", "lapse_interval", "graduating_interval", "interval_modifier"])
+DEFAULT_PARAMS = SM2Params(min_ease=1.3, lapse_interval=1, graduating_interval=6, interval_modifier=1.0)
+
+def sm2_batch(ease_factor, interval, quality, params=DEFAULT_PARAMS):
+    """Vectorised database.sm2: return new (ease_factor, interval) arrays"""
+    ease_factor = np.asarray(ease_factor, dtype=np.float64)
+    interval = np.asarray(interval, dtype=np.int64)
+    quality = np.asarray(quality, dtype=np.float64)
+
+    miss = 5 - quality
+    new_ease = np.maximum(params.min_ease, ease_factor + (0.1 - miss * (0.08 + miss * 0.02)))
+
+    grown = (interval * new_ease * params.interval_modifier).astype(np.int64)
+    new_interval = np.where(quality < 3, params.lapse_interval,
+                            np.where(interval == 1, params.graduating_interval, grown))
+    # Never schedule a card for the same day it was reviewed
+    return new_ease, np.maximum(new_interval, 1)
+
+class BatchScheduler:
+    """The scheduling state of every memorized verse, held in NumPy arrays"""
+
+    def __init__(self, ids, ease_factor, interval, due_in):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.ease_factor = np.asarray(ease_factor, dtype=np.float64)
+        self.interval = np.asarray(interval, dtype=np.int64)
+        # Days from now until each card is due; negative means overdue
+        self.due_in = np.asarray(due_in, dtype=np.float64)
+        self._index = None
+
+    @classmethod
+    def load(cls, store):
+        """Load all memorized_verses scheduling state in one query"""
+        rows = store.connection().execute("""
+            SELECT id, ease_factor, interval, julianday(next_due) - julianday('now')
+            FROM memorized_verses
+            ORDER BY id""").fetchall()
+        if not rows:
+            return cls([], [], [], [])
+        ids, ease_factor, interval, due_in = zip(*rows)
+        return cls(ids, ease_factor, interval, [d if d is not None else 0.0 for d in due_in])
+
+    def __len__(self):
+        return len(self.ids)
+
+    def positions(self, ids):
+        """Array positions of memorized_verses ids"""
+        if self._index is None:
+            self._index = {row_id: i for i, row_id in enumerate(self.ids.tolist())}
+        return np.fromiter((self._index[row_id] for row_id in ids), dtype=np.int64)
+
+    def apply_reviews(self, ids, qualities, params=DEFAULT_PARAMS):
+        """Grade many reviews done now at once; returns their new (ease, interval)"""
+        pos = self.positions(ids)
+        ease_factor, interval = sm2_batch(self.ease_factor[pos], self.interval[pos], qualities, params)
+        self.ease_factor[pos] = ease_factor
+        self.interval[pos] = interval
+        self.due_in[pos] = interval
+        return ease_factor, interval
+
+    def save(self, store, ids):
+        """Write the state of the given ids back to memorized_verses in one transaction"""
+        pos = self.positions(ids)
+        conn = store.connection()
+        rows = zip(self.ease_factor[pos].tolist(), self.interval[pos].tolist(),
+                   self.due_in[pos].tolist(), self.ids[pos].tolist())
+        try:
+            conn.execute("BEGIN")
+            conn.executemany("""
+                UPDATE memorized_verses
+                SET ease_factor=?, interval=?, last_reviewed=CURRENT_TIMESTAMP,
+                    next_due=datetime('now', '+' || ? || ' days')
+                WHERE id=?""", rows)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    def due_counts(self, days):
+        """Reviews currently scheduled for each of the next days (overdue count as today)"""
+        day = np.maximum(np.floor(self.due_in), 0).astype(np.int64)
+        return np.bincount(day[day < days], minlength=days)
+
+    def forecast(self, days=30, params=DEFAULT_PARAMS, quality=4, pass_rate=None, seed=0):
+        """Simulate the next days of reviews and return the number due each day
+
+        Every review is graded quality, or, with pass_rate, graded quality
+        with that probability and 2 (a lapse) otherwise. Cards overdue now
+        are reviewed today. Nothing is written back.
+        """
+        counts = np.zeros(days, dtype=np.int64)
+        if not len(self):
+            return counts
+        rng = np.random.default_rng(seed)
+        day = np.maximum(np.floor(self.due_in), 0).astype(np.int64)
+        ease_factor = self.ease_factor.copy()
+        interval = self.interval.copy()
+
+        # Each round reviews every card once more; intervals are at least a
+        # day, so there are at most `days` rounds
+        active = np.flatnonzero(day < days)
+        while active.size:
+            counts += np.bincount(day[active], minlength=days)
+            if pass_rate is None:
+                grades = np.full(active.size, quality)
+            else:
+                grades = np.where(rng.random(active.size) < pass_rate, quality, 2)
+            ease_factor[active], interval[active] = sm2_batch(ease_factor[active], interval[active],
+                                                              grades, params)
+            day[active] += interval[active]
+            active = active[day[active] < days]
+        return counts
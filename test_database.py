@@ -0,0 +1,74 @@
+# test_database.py
+import sqlite3
+
+import pytest
+
+from database import MIGRATIONS, TRANSLATION_SHIFT, VerseStore, profile_path, verse_ref
+
+@pytest.fixture
+def legacy_db(tmp_path):
+    """A database as the first releases left it: no schema version, sequential ids"""
+    path = str(tmp_path / "bible.db")
+    conn = sqlite3.connect(path)
+    conn.execute("""CREATE TABLE verses (id INTEGER PRIMARY KEY, book TEXT, chapter INTEGER, verse INTEGER,
+                                         text TEXT, progress INTEGER DEFAULT 0)""")
+    conn.execute("""CREATE TABLE memorized_verses (id INTEGER PRIMARY KEY AUTOINCREMENT, book TEXT,
+                                                   chapter INTEGER, verse INTEGER,
+                                                   last_reviewed TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                                                   ease_factor REAL DEFAULT 2.5, interval INTEGER DEFAULT 1)""")
+    conn.executemany("INSERT INTO verses (book, chapter, verse, text) VALUES (?, ?, ?, ?)",
+                     [("Genesis", 1, 1, "In the beginning God created"), ("Genesis", 1, 2, "And the earth"),
+                      ("Genesis", 1, 2, "A repeated reference"), ("John", 3, 16, "For God so loved the world")])
+    conn.executemany("""INSERT INTO memorized_verses (book, chapter, verse, last_reviewed, interval)
+                        VALUES (?, ?, ?, ?, ?)""",
+                     [("John", 3, 16, "2024-01-01 00:00:00", 1), ("John", 3, 16, "2024-02-01 00:00:00", 6),
+                      ("Genesis", 1, 1, "2024-03-01 00:00:00", 15)])
+    conn.commit()
+    conn.close()
+    return path
+
+def test_migrates_legacy_database(legacy_db):
+    store = VerseStore(legacy_db)
+    store.init_db()
+    conn = store.connection()
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == len(MIGRATIONS)
+    assert store.get_translations() == ["Default"]
+
+    # Verses are renumbered by reference, keeping the first of a repeated reference
+    first = 1 << TRANSLATION_SHIFT
+    rows = conn.execute("SELECT id, book, chapter, verse, text FROM verses ORDER BY id").fetchall()
+    assert [row[1:4] for row in rows] == [("Genesis", 1, 1), ("Genesis", 1, 2), ("John", 3, 16)]
+    assert rows[1][4] == "And the earth"
+    assert all(row[0] == first + store.reference(*row[1:4]) for row in rows)
+    assert rows[0][0] == first + verse_ref(1, 1, 1)
+
+    # A verse memorized twice keeps its latest review, linked to the renumbered verse
+    memorized = conn.execute("""SELECT book, verse_id, interval, next_due IS NOT NULL
+                                FROM memorized_verses ORDER BY ref""").fetchall()
+    assert memorized == [("Genesis", rows[0][0], 15, 1), ("John", rows[2][0], 6, 1)]
+
+    assert store.get_outline().chapters("John") == [3]
+    if store.has_fts():
+        assert store.word_count("god") == (2, 2)
+    store.close_all()
+
+def test_migrations_run_once(legacy_db):
+    store = VerseStore(legacy_db)
+    store.init_db()
+    ids = store.connection().execute("SELECT id FROM verses ORDER BY id").fetchall()
+    store.close_all()
+    store = VerseStore(legacy_db)
+    store.init_db()
+    assert store.connection().execute("SELECT id FROM verses ORDER BY id").fetchall() == ids
+    store.close_all()
+
+def test_new_profile_adopts_legacy_progress(legacy_db):
+    store = VerseStore(legacy_db, progress_path=profile_path("reader", legacy_db))
+    assert store.init_db() == 2
+    assert len(store.get_memorized_verses()) == 2
+    store.close_all()
+    # The progress moved, so a second profile starts empty
+    store = VerseStore(legacy_db, progress_path=profile_path("other", legacy_db))
+    assert store.init_db() == 0
+    assert store.get_memorized_verses() == []
+    store.close_all()
@@ -0,0 +1,47 @@
+# test_grading.py
+from grading import EQUAL, EXTRA, MISSING, MISSPELLED, WRONG, AnswerGrader, edit_distance, quality_for
+
+VERSE = "For God so loved the world, that he gave his only begotten Son"
+
+def ops(grade):
+    return [(op, expected, typed) for op, expected, typed in grade.ops]
+
+def test_exact_answer_ignores_case_and_punctuation():
+    grader = AnswerGrader(VERSE)
+    grade = grader.grade("for god so loved the world that he gave his only begotten son!")
+    assert grader.is_exact(grade)
+    assert (grade.accuracy, grade.quality) == (1.0, 5)
+
+def test_alignment_ops():
+    grader = AnswerGrader("For God so loved the world")
+    assert ops(grader.grade("For Gd so loved the world"))[1] == (MISSPELLED, "God", "Gd")
+    assert ops(grader.grade("For Dog so loved the world"))[1] == (WRONG, "God", "Dog")
+    assert ops(grader.grade("For God so loved world")) == [
+        (EQUAL, "For", "For"), (EQUAL, "God", "God"), (EQUAL, "so", "so"), (EQUAL, "loved", "loved"),
+        (MISSING, "the", None), (EQUAL, "world", "world")]
+    grade = grader.grade("For God so very loved the world")
+    assert ops(grade)[3] == (EXTRA, None, "very")
+    assert not grader.is_exact(grade)
+
+def test_incremental_grading_matches_fresh_grader():
+    grader = AnswerGrader(VERSE)
+    for answer in ("For God", "For God so lvoed", "For Gods so", "For God so loved the world that he"):
+        fresh = AnswerGrader(VERSE)
+        assert grader.grade(answer, partial=True) == fresh.grade(answer, partial=True), answer
+        assert grader.grade(answer) == fresh.grade(answer), answer
+
+def test_partial_grades_the_start_of_the_verse():
+    grade = AnswerGrader(VERSE).grade("For God so loved", partial=True)
+    assert grade.accuracy == 1.0
+    assert all(op == EQUAL for op, _, _ in grade.ops)
+
+def test_empty_verse_and_answer():
+    assert AnswerGrader("").grade("").accuracy == 1.0
+    assert AnswerGrader(VERSE).grade("").quality == 0
+
+def test_edit_distance_limit():
+    assert edit_distance("kitten", "sitting", 3) == 3
+    assert edit_distance("kitten", "sitting", 1) == 2
+
+def test_quality_thresholds():
+    assert [quality_for(a) for a in (1.0, 0.95, 0.8, 0.6, 0.3, 0.0)] == [5, 4, 3, 2, 1, 0]
@@ -0,0 +1,67 @@
+# test_importers.py
+import sqlite3
+
+import pytest
+
+from database import VerseStore
+from importers import SqliteImporter, TextImporter, importer_for
+
+@pytest.fixture
+def store(tmp_path):
+    store = VerseStore(str(tmp_path / "bible.db"))
+    store.init_db()
+    yield store
+    store.close_all()
+
+def verses(store):
+    return store.connection().execute("SELECT book, chapter, verse, text FROM verses ORDER BY id").fetchall()
+
+def make_db(path, *statements):
+    conn = sqlite3.connect(path)
+    for sql in statements:
+        conn.execute(sql)
+    conn.commit()
+    conn.close()
+    return str(path)
+
+def test_importer_for_extension(tmp_path):
+    assert isinstance(importer_for("kjv.TXT"), TextImporter)
+    assert isinstance(importer_for("kjv.sqlite3"), SqliteImporter)
+    with pytest.raises(ValueError):
+        importer_for("kjv.docx")
+
+def test_text_import(store, tmp_path):
+    path = tmp_path / "web.txt"
+    path.write_text("Genesis 1:1 In the beginning\nnot a verse\nGenesis 1:2 And the earth\n", encoding="utf-8")
+    assert store.import_bible_file(str(path))
+    assert verses(store) == [("Genesis", 1, 1, "In the beginning"), ("Genesis", 1, 2, "And the earth")]
+    assert store.get_translations() == ["WEB"]
+
+def test_sqlite_verse_table_with_book_numbers(store, tmp_path):
+    source = make_db(tmp_path / "source.db",
+                     "CREATE TABLE verses (book INTEGER, chapter INTEGER, verse INTEGER, text TEXT)",
+                     "INSERT INTO verses VALUES (43, 3, 16, 'For God so loved'), (1, 1, 1, 'In the beginning'),"
+                     " (1, 0, 1, 'Heading'), (1, 1, 2, NULL)")
+    assert store.import_bible_file(source, translation="Numbered")
+    # Canon order, whatever the source order; zero chapters and missing text are left out
+    assert verses(store) == [("Genesis", 1, 1, "In the beginning"), ("John", 3, 16, "For God so loved")]
+
+def test_sqlite_bible_databases_layout(store, tmp_path):
+    source = make_db(tmp_path / "t_kjv.sqlite",
+                     "CREATE TABLE key_english (b INTEGER, n TEXT)",
+                     "INSERT INTO key_english VALUES (1, 'Genesis'), (19, 'Psalms')",
+                     "CREATE TABLE t_kjv (id INTEGER, b INTEGER, c INTEGER, v INTEGER, t TEXT)",
+                     "INSERT INTO t_kjv VALUES (19023001, 19, 23, 1, 'The LORD is my shepherd'),"
+                     " (1001001, 1, 1, 1, 'In the beginning')")
+    assert store.import_bible_file(source)
+    assert verses(store) == [("Genesis", 1, 1, "In the beginning"), ("Psalms", 23, 1, "The LORD is my shepherd")]
+
+def test_sqlite_without_verses(store, tmp_path):
+    source = make_db(tmp_path / "empty.db", "CREATE TABLE notes (text TEXT)")
+    with pytest.raises(ValueError):
+        SqliteImporter(source).selects()
+    assert not store.import_bible_file(source)
+
+def test_sqlite_refuses_own_database(store):
+    with pytest.raises(ValueError):
+        SqliteImporter(store.db_path).load(store)
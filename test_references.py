@@ -0,0 +1,59 @@
+# test_references.py
+import pytest
+
+from database import VerseStore
+from references import Passage, book_key, format_passage, parse_references, passage_ids
+
+CHAPTERS = {("Genesis", 1): 5, ("Psalms", 23): 6, ("Psalms", 24): 10, ("John", 3): 20, ("John", 4): 5,
+            ("Philippians", 4): 23, ("1 John", 1): 10, ("Jude", 1): 25}
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory):
+    path = tmp_path_factory.mktemp("references") / "bible.txt"
+    path.write_text("".join(f"{book} {chapter}:{verse} Verse {verse}.\n"
+                            for (book, chapter), count in CHAPTERS.items()
+                            for verse in range(1, count + 1)), encoding="utf-8")
+    store = VerseStore(str(path.with_suffix(".db")))
+    store.init_db()
+    assert store.import_bible_file(str(path))
+    yield store
+    store.close_all()
+
+def parse(store, text):
+    return parse_references(text, store.get_book_index())
+
+def test_book_key():
+    assert book_key("1 Jn.") == book_key("1Jn") == book_key("First Jn") == "1jn"
+
+def test_abbreviations_and_lists(store):
+    assert parse(store, "Jn 3:16-18, 20; 4") == [
+        Passage("John", 3, 16, 3, 18), Passage("John", 3, 20, 3, 20), Passage("John", 4, None, 4, None)]
+    assert parse(store, "Ps 23–24") == [Passage("Psalms", 23, None, 24, None)]
+    assert parse(store, "1Jn 1:9") == [Passage("1 John", 1, 9, 1, 9)]
+
+def test_chapter_spans_and_single_chapter_books(store):
+    assert parse(store, "John 3:16-4:2") == [Passage("John", 3, 16, 4, 2)]
+    assert parse(store, "Jude 3") == [Passage("Jude", 1, 3, 1, 3)]
+
+def test_misspelled_book(store):
+    assert parse(store, "Philipians 4:13") == [Passage("Philippians", 4, 13, 4, 13)]
+
+@pytest.mark.parametrize("text", ["", "love", "Xyz 1:1", "John 3:18-16", "3:16"])
+def test_not_a_reference(store, text):
+    with pytest.raises(ValueError):
+        parse(store, text)
+
+def test_passage_ids_clamp_to_the_book(store):
+    outline = store.get_outline()
+    first, last = passage_ids(outline, Passage("Psalms", 24, 9, 30, None))
+    assert last - first == 1
+    assert passage_ids(outline, Passage("Psalms", 30, None, 40, None)) is None
+
+def test_lookup_reads_the_passage(store):
+    [(passage, rows)] = store.lookup_references("Gen 1:2-4")
+    assert format_passage(passage) == "Genesis 1:2-4"
+    assert [row[2] for row in rows] == [2, 3, 4]
+
+def test_format_passage():
+    assert format_passage(Passage("Romans", 8, None, 8, None)) == "Romans 8"
+    assert format_passage(Passage("John", 3, 16, 4, 2)) == "John 3:16-4:2"
@@ -0,0 +1,31 @@
+# test_scheduler.py
+import itertools
+
+import numpy as np
+
+from database import sm2
+from scheduler import BatchScheduler, sm2_batch
+
+def test_sm2_batch_matches_sm2():
+    cases = list(itertools.product([1.3, 1.7, 2.5, 2.9], [1, 2, 6, 15, 100], range(6)))
+    ease_factor, interval, quality = zip(*cases)
+    batch_ease, batch_interval = sm2_batch(ease_factor, interval, quality)
+    for i, case in enumerate(cases):
+        expected_ease, expected_interval = sm2(*case)
+        assert batch_ease[i] == expected_ease, case
+        assert batch_interval[i] == expected_interval, case
+
+def test_apply_reviews_updates_only_given_ids():
+    scheduler = BatchScheduler([10, 20, 30], [2.5, 2.5, 2.5], [1, 6, 15], [0.0, 1.0, -2.0])
+    ease_factor, interval = scheduler.apply_reviews([30, 10], [5, 2])
+    assert list(interval) == [sm2(2.5, 15, 5)[1], 1]
+    assert scheduler.interval.tolist() == [1, 6, interval[0]]
+    assert scheduler.due_in.tolist() == [1.0, 1.0, float(interval[0])]
+    assert scheduler.ease_factor[1] == 2.5
+
+def test_forecast_counts_overdue_as_today():
+    scheduler = BatchScheduler([1, 2], [2.5, 2.5], [1, 1], [-3.0, 40.0])
+    counts = scheduler.forecast(days=10)
+    # Reviewed today, then graduates to 6 days
+    assert counts.tolist() == [1, 0, 0, 0, 0, 0, 1, 0, 0, 0]
+    assert np.array_equal(scheduler.due_counts(10), [1] + [0] * 9)
@@ -0,0 +1,52 @@
+# test_verse_parser.py
+import io
+
+from verse_parser import ParseStats, VerseRecord, normalize_book, parse_file, parse_lines, parse_wrapped_lines
+
+def test_book_name_forms():
+    lines = ["Genesis 1:1 In the beginning",
+             "1 John 3:16 For God",
+             "1John 1:1 That which was",
+             "Song of Solomon 2:1 I am the rose",
+             "Genesis1:2 And the earth"]
+    assert [record[:3] for record in parse_lines(lines)] == [
+        ("Genesis", 1, 1), ("1 John", 3, 16), ("1 John", 1, 1), ("Song of Solomon", 2, 1), ("Genesis", 1, 2)]
+
+def test_normalize_book():
+    assert normalize_book("  1   John ") == "1 John"
+    assert normalize_book("Song  of\tSolomon") == "Song of Solomon"
+
+def test_skipped_lines_are_counted():
+    stats = ParseStats()
+    lines = ["\ufeffGenesis 1:1 In the beginning", "", "# comment", "no reference here",
+             "Genesis 0:1 Zero chapter", "Genesis 1:0 Zero verse", "Genesis 1:2   And the earth  "]
+    records = list(parse_lines(lines, stats))
+    assert records == [VerseRecord("Genesis", 1, 1, "In the beginning"),
+                       VerseRecord("Genesis", 1, 2, "And the earth")]
+    assert (stats.lines, stats.processed, stats.skipped, stats.errors) == (7, 2, 1, 2)
+    assert [line_no for line_no, _, _ in stats.samples] == [4, 5, 6]
+
+def test_stats_filled_when_closed_early():
+    stats = ParseStats()
+    records = parse_lines(["Genesis 1:1 a", "Genesis 1:2 b", "Genesis 1:3 c"], stats)
+    next(records)
+    records.close()
+    assert stats.processed == 1
+
+def test_reference_without_text_is_skipped():
+    stats = ParseStats()
+    assert list(parse_lines(["Genesis 1:1", "Genesis 1:1 "], stats)) == []
+    assert stats.skipped == 2
+
+def test_wrapped_lines():
+    leading, records, dropped = parse_wrapped_lines(
+        ["of the previous page", "John 3:16 For God so loved", "the world,", "12", "John 3:17 For God sent"])
+    assert leading == "of the previous page"
+    assert records == [VerseRecord("John", 3, 16, "For God so loved the world,"),
+                       VerseRecord("John", 3, 17, "For God sent")]
+    assert dropped == 1
+
+def test_parse_file_stream_and_path(tmp_path):
+    path = tmp_path / "bible.txt"
+    path.write_text("Ruth 1:1 Now it came to pass\n", encoding="utf-8")
+    assert list(parse_file(str(path))) == list(parse_file(io.StringIO("Ruth 1:1 Now it came to pass\n")))
@@ -1,7 +1,96 @@
-import pyttsx3
+import queue
+import threading
 
-engine = pyttsx3.init()
+class SpeechWorker:
+    """Speaks queued text on a dedicated thread so callers never block
+
+    The pyttsx3 engine is created lazily on the worker thread the first
+    time something is spoken, and is only ever used from that thread.
+    """
+
+    def __init__(self, rate=150):
+        self.rate = rate
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._interrupt = threading.Event()
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="speech", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        import pyttsx3
+
+        try:
+            engine = pyttsx3.init()
+            engine.setProperty('rate', self.rate)
+        except Exception as e:
+            print(f"TTS Error: {e}")
+            return
+
+        def on_word(name, location, length):
+            # stop() is only safe from inside the engine's own loop
+            if self._interrupt.is_set():
+                engine.stop()
+
+        engine.connect('started-word', on_word)
+
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            generation, text = item
+            if generation != self._generation:
+                continue  # Dropped by stop() or a newer request
+            self._interrupt.clear()
+            try:
+                engine.say(text)
+                engine.runAndWait()
+            except Exception as e:
+                print(f"TTS Error: {e}")
+
+    def speak(self, text, interrupt=True):
+        """Queue text; by default whatever is being read is stopped first"""
+        self.speak_many([text], interrupt)
+
+    def speak_many(self, texts, interrupt=True):
+        """Queue several texts to be read one after another (e.g. a chapter)"""
+        if interrupt:
+            self.stop()
+        self._ensure_thread()
+        generation = self._generation
+        for text in texts:
+            if text:
+                self._queue.put((generation, text))
+
+    def skip(self):
+        """Stop the current text and continue with the next queued one"""
+        self._interrupt.set()
+
+    def stop(self):
+        """Stop the current text and drop everything queued"""
+        with self._lock:
+            self._generation += 1
+        self._interrupt.set()
+
+    def shutdown(self):
+        """Stop speaking and end the worker thread"""
+        self.stop()
+        if self._thread is not None:
+            self._queue.put(None)
+
+_worker = None
+
+def get_speech_worker():
+    """Return the shared SpeechWorker, creating it on first use"""
+    global _worker
+    if _worker is None:
+        _worker = SpeechWorker()
+    return _worker
 
 def speak(text):
-    engine.say(text)
-    engine.runAndWait()
+    get_speech_worker().speak(text)
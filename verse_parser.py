@@ -0,0 +1,131 @@
+# verse_parser.py
+import re
+from collections import namedtuple
+
+VerseRecord = namedtuple("VerseRecord", ["book", "chapter", "verse", "text"])
+
+# "Genesis 1:1 Text", "1 John 3:16 Text", "Song of Solomon 2:1 Text",
+# "Genesis1:1 Text" and "1John 1:1 Text" are all accepted
+LINE_PATTERN = re.compile(
+    r"(?P<book>(?:[1-3]\s*)?[^\d\s:][^\d:]*)(?P<chapter>\d+):(?P<verse>\d+)\s+(?P<text>\S.*)")
+NUMBERED_BOOK = re.compile(r"([1-3])\s*(?=\S)")
+WHITESPACE = re.compile(r"\s+")
+
+MAX_SAMPLES = 20
+
+class ParseStats:
+    """Counters gathered while parsing, with a few sample lines for diagnostics"""
+
+    def __init__(self):
+        self.lines = 0
+        self.processed = 0
+        self.skipped = 0
+        self.errors = 0
+        self.samples = []
+
+    def reject(self, line_no, line, reason):
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append((line_no, reason, line))
+
+    def __repr__(self):
+        return (f"ParseStats(lines={self.lines}, processed={self.processed}, "
+                f"skipped={self.skipped}, errors={self.errors})")
+
+def normalize_book(book):
+    """Collapse whitespace and write numbered books as "1 John" """
+    book = WHITESPACE.sub(" ", book.strip())
+    return NUMBERED_BOOK.sub(r"\1 ", book, count=1) if book[:1] in "123" else book
+
+def parse_lines(lines, stats=None):
+    """Yield a VerseRecord for every "Book Chapter:Verse Text" line
+
+    Blank lines and lines starting with '#' are ignored. Lines that do not
+    match are counted in stats.skipped; references with a zero chapter or
+    verse are counted in stats.errors. Counts are filled in once the
+    generator is exhausted or closed.
+    """
+    if stats is None:
+        stats = ParseStats()
+    match_line = LINE_PATTERN.match
+    # Only a few dozen distinct book strings occur, so normalize each once
+    books = {}
+    # Counters are kept in locals and written to stats when parsing ends
+    line_no = processed = skipped = errors = 0
+    try:
+        for line_no, line in enumerate(lines, 1):
+            line = line.strip()
+            if line_no == 1:
+                # Drop a byte-order mark left by editors that save UTF-8 with BOM
+                line = line.lstrip('\ufeff')
+            if not line or line[0] == '#':
+                continue
+
+            match = match_line(line)
+            if match is None:
+                skipped += 1
+                stats.reject(line_no, line, "unrecognized format")
+                continue
+
+            book, chapter, verse, text = match.groups()
+            chapter = int(chapter)
+            verse = int(verse)
+            if not chapter or not verse:
+                errors += 1
+                stats.reject(line_no, line, "chapter and verse must start at 1")
+                continue
+
+            normalized = books.get(book)
+            if normalized is None:
+                normalized = books[book] = normalize_book(book)
+            processed += 1
+            yield VerseRecord(normalized, chapter, verse, text)
+    finally:
+        stats.lines += line_no
+        stats.processed += processed
+        stats.skipped += skipped
+        stats.errors += errors
+
+def parse_wrapped_lines(lines):
+    """Parse "Book Chapter:Verse Text" verses that may run over several lines
+
+    Text extracted from a PDF breaks verses wherever the printed line ended.
+    Lines that do not start a verse are joined to the verse before them, and
+    lines that are only a number (page numbers) are dropped. Returns
+    (leading, records, dropped): the text before the first verse, which
+    continues a verse begun on an earlier page, the VerseRecords, and the
+    number of dropped lines.
+    """
+    match_line = LINE_PATTERN.match
+    books = {}
+    leading = []
+    current = leading
+    records = []
+    dropped = 0
+    for line in lines:
+        line = line.strip().lstrip('\ufeff')
+        if not line:
+            continue
+        if line.isdigit():
+            dropped += 1
+            continue
+        match = match_line(line)
+        if match is None or not int(match.group("chapter")) or not int(match.group("verse")):
+            current.append(line)
+            continue
+        book, chapter, verse, text = match.groups()
+        normalized = books.get(book)
+        if normalized is None:
+            normalized = books[book] = normalize_book(book)
+        current = [text]
+        records.append((normalized, int(chapter), int(verse), current))
+    return (" ".join(leading),
+            [VerseRecord(book, chapter, verse, " ".join(parts)) for book, chapter, verse, parts in records],
+            dropped)
+
+def parse_file(source, stats=None, encoding='utf-8'):
+    """Yield VerseRecords from a file path or an open text stream"""
+    if hasattr(source, "read"):
+        yield from parse_lines(source, stats)
+        return
+    with open(source, 'r', encoding=encoding) as file:
+        yield from parse_lines(file, stats)
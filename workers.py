@@ -0,0 +1,201 @@
+# workers.py
+import itertools
+import json
+import os
+import time
+from PyQt6.QtCore import QCoreApplication, QEvent, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+class _Job(QRunnable):
+    def __init__(self, worker, channel, request_id, fn, args, kwargs):
+        super().__init__()
+        self.worker = worker
+        self.channel = channel
+        self.request_id = request_id
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        if self.worker.is_stale(self.channel, self.request_id):
+            return
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.worker.failed.emit(self.channel, self.request_id, str(e))
+        else:
+            self.worker.finished.emit(self.channel, self.request_id, result)
+        finally:
+            if self.worker.release:
+                self.worker.release()
+
+class DatabaseWorker(QObject):
+    """Runs database calls on a thread pool and delivers results by signal
+
+    Requests are grouped into channels ("search", "import", ...). Submitting
+    a new request on a channel makes the previous one stale: it is dropped
+    if it has not started yet, and its result is discarded otherwise.
+
+    release() is called on the pool thread after each job. PyQt gives every
+    run a fresh Python thread state, so thread-local connections do not
+    carry over to the next job and must be closed by release.
+    """
+
+    finished = pyqtSignal(str, int, object)
+    failed = pyqtSignal(str, int, str)
+    progress = pyqtSignal(str, int, int)
+
+    def __init__(self, parent=None, max_threads=2, release=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self.release = release
+        self._ids = itertools.count(1)
+        self._latest = {}
+        self._pending = {}
+        self._callbacks = {}
+        self.finished.connect(self._deliver_result)
+        self.failed.connect(self._deliver_error)
+
+    def submit(self, channel, fn, *args, on_result=None, on_error=None, report_progress=False, **kwargs):
+        """Run fn(*args, **kwargs) in the pool and return the request id
+
+        A channel of None runs the request on its own, never cancelled by
+        others; use it for writes. on_result(result) and on_error(message) are called on the GUI
+        thread. With report_progress, fn receives a progress(done, total)
+        keyword argument whose calls are re-emitted as the progress signal.
+        """
+        request_id = next(self._ids)
+        if channel is None:
+            channel = f"#{request_id}"
+        self.cancel(channel)
+        self._latest[channel] = request_id
+        self._callbacks[request_id] = (on_result, on_error)
+
+        if report_progress:
+            kwargs["progress"] = lambda done, total: self.progress.emit(channel, done, total or 0)
+
+        job = _Job(self, channel, request_id, fn, args, kwargs)
+        job.setAutoDelete(False)
+        self._pending[channel] = job
+        self.pool.start(job)
+        return request_id
+
+    def cancel(self, channel):
+        """Make the current request on a channel stale"""
+        job = self._pending.pop(channel, None)
+        if job is not None:
+            self.pool.tryTake(job)
+            self._callbacks.pop(job.request_id, None)
+        self._latest.pop(channel, None)
+
+    def is_stale(self, channel, request_id):
+        return self._latest.get(channel) != request_id
+
+    def is_busy(self, channel):
+        return channel in self._latest
+
+    def _finish(self, channel, request_id):
+        """Return the callbacks for a finished request, or None if it is stale"""
+        callbacks = self._callbacks.pop(request_id, (None, None))
+        if self.is_stale(channel, request_id):
+            return None
+        del self._latest[channel]
+        self._pending.pop(channel, None)
+        return callbacks
+
+    def _deliver_result(self, channel, request_id, result):
+        callbacks = self._finish(channel, request_id)
+        if callbacks and callbacks[0]:
+            callbacks[0](result)
+
+    def _deliver_error(self, channel, request_id, message):
+        callbacks = self._finish(channel, request_id)
+        if callbacks is None:
+            return
+        if callbacks[1]:
+            callbacks[1](message)
+        else:
+            print(f"Database error ({channel}): {message}")
+
+    def shutdown(self):
+        """Drop queued work and wait for running jobs (call on exit)"""
+        self.pool.clear()
+        self.pool.waitForDone()
+
+class StallMonitor(QObject):
+    """Measures how long the GUI thread is blocked
+
+    A short timer should fire every interval_ms; any extra delay is time
+    the event loop spent stalled. Enable with BMA_STALL_MONITOR=1 to print
+    a summary on exit.
+    """
+
+    def __init__(self, parent=None, interval_ms=10, threshold_ms=50):
+        super().__init__(parent)
+        self.interval_ms = interval_ms
+        self.threshold_ms = threshold_ms
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self._tick)
+        self.reset()
+
+    @staticmethod
+    def enabled():
+        return os.environ.get("BMA_STALL_MONITOR", "") not in ("", "0")
+
+    def reset(self):
+        self.last_tick = None
+        self.stalls = 0
+        self.stalled_ms = 0.0
+        self.max_stall_ms = 0.0
+
+    def start(self):
+        self.reset()
+        self.last_tick = time.perf_counter()
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def _tick(self):
+        now = time.perf_counter()
+        late_ms = (now - self.last_tick) * 1000 - self.interval_ms
+        self.last_tick = now
+        if late_ms >= self.threshold_ms:
+            self.stalls += 1
+            self.stalled_ms += late_ms
+            self.max_stall_ms = max(self.max_stall_ms, late_ms)
+
+    def summary(self):
+        return (f"UI stalls over {self.threshold_ms} ms: {self.stalls}, "
+                f"total {self.stalled_ms:.0f} ms, longest {self.max_stall_ms:.0f} ms")
+
+class StartupTimer(QObject):
+    """Records how long startup takes, for benchmarks/bench_startup.py
+
+    Marks are seconds since started (the benchmark passes its own launch
+    time, so interpreter start-up is included). The window's first paint is
+    marked automatically; finish() prints the marks as JSON and quits.
+    """
+
+    def __init__(self, started=None, parent=None):
+        super().__init__(parent)
+        self.started = started or time.time()
+        self.marks = {}
+
+    def mark(self, name):
+        self.marks.setdefault(name, round(time.time() - self.started, 4))
+
+    def watch(self, window):
+        self.mark("window_created")
+        window.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            self.mark("first_paint")
+        return False
+
+    def finish(self, name):
+        self.mark(name)
+        print(json.dumps(self.marks), flush=True)
+        QTimer.singleShot(0, QCoreApplication.instance().quit)